@@ -0,0 +1,133 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Helpers shared by the benchmarks: an offscreen application, timing, generated documents and JSON results.
+"""
+
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def createApplication():
+    """
+    Returns an application whose settings and caches are kept apart from those of the user.
+    """
+    from PySide2.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    app.setOrganizationName('NotNypical')
+    app.setOrganizationDomain('https://notnypical.github.io')
+    app.setApplicationName('Tabulator-QtPy-Benchmark')
+
+    return app
+
+
+def measure(function, *args):
+
+    start = time.perf_counter()
+    result = function(*args)
+
+    return time.perf_counter() - start, result
+
+
+def waitUntil(predicate, timeout=600):
+    """
+    Processes events until the predicate is true; returns False on timeout.
+    """
+    from PySide2.QtCore import QCoreApplication, QThread
+
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+
+        QCoreApplication.processEvents()
+        QThread.msleep(1)
+
+    return True
+
+
+def percentile(values, fraction):
+
+    values = sorted(values)
+
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def createDocument(fileName, size, seed=0):
+    """
+    Writes a document of about the given size in bytes with numeric, date, repeated and free text columns.
+    """
+    generator = random.Random(seed)
+    words = ['alpha', 'beta', 'gamma', 'delta', 'quoted, text', 'multi\nline']
+
+    with open(fileName, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'value', 'category', 'amount', 'date', 'comment'])
+
+        row = 0
+        while file.tell() < size:
+            writer.writerows([row + index, generator.random(), generator.choice(words), generator.randint(0, 10**9), f'2021-{generator.randint(1, 12):02}-{generator.randint(1, 28):02}', f'comment {generator.randint(0, 10**6)}'] for index in range(10000))
+            row += 10000
+
+
+def environment():
+    """
+    Returns the versions and the machine the benchmarks run on.
+    """
+    import PySide2
+    from PySide2.QtCore import qVersion
+
+    return {
+        'python': platform.python_version(),
+        'pyside': PySide2.__version__,
+        'qt': qVersion(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processors': os.cpu_count(),
+        'qpa': os.environ.get('QT_QPA_PLATFORM'),
+    }
+
+
+def writeResults(fileName, name, results):
+    """
+    Writes results with the time and environment of the run as JSON; '-' writes them to the standard output.
+    """
+    document = {
+        'benchmark': name,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': environment(),
+        'results': results,
+    }
+
+    if fileName == '-':
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(fileName, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
@@ -0,0 +1,104 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Compares the per-item header label path of DocumentTable with the batch and cached paths.
+
+Usage: python benchmarks/benchmark_header_labels.py [--count N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide2.QtWidgets import QApplication
+
+from document_table import DocumentTable
+from document_table_header_labels import DocumentTableHeaderLabels
+from preferences import Preferences
+
+
+def perItemText(table, number, type, parameter):
+    """
+    Returns the header item text the way DocumentTable did before the batch engine.
+    """
+    if type == Preferences.HeaderLabel.Custom:
+        return table.numberToCustom(number, parameter)
+    elif type == Preferences.HeaderLabel.Binary:
+        return table.numberToBinary(number, parameter)
+    elif type == Preferences.HeaderLabel.Octal:
+        return table.numberToOctal(number, parameter)
+    elif type == Preferences.HeaderLabel.Decimal:
+        return table.numberToDecimal(number, parameter)
+    elif type == Preferences.HeaderLabel.Hexadecimal:
+        return table.numberToHexadecimal(number, parameter)
+    elif type == Preferences.HeaderLabel.Letter:
+        return table.numberToLetter(number, parameter)
+    else:
+        return ''
+
+
+def measure(function):
+
+    start = time.perf_counter()
+    result = function()
+
+    return time.perf_counter() - start, result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Header label generation benchmark')
+    parser.add_argument('--count', type=int, default=1000000, help='number of labels per type')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    table = DocumentTable()
+
+    labels = [
+        (Preferences.HeaderLabel.Letter, 'upper'),
+        (Preferences.HeaderLabel.Decimal, '1'),
+        (Preferences.HeaderLabel.Binary, '0b'),
+        (Preferences.HeaderLabel.Hexadecimal, '0x'),
+        (Preferences.HeaderLabel.Custom, 'Column #'),
+    ]
+
+    print(f'{"type":<12} {"per item":>10} {"batch":>10} {"cold cache":>11} {"warm cache":>11} {"speedup":>8}')
+
+    for type, parameter in labels:
+        perItemTime, perItemTexts = measure(lambda: [perItemText(table, number, type, parameter) for number in range(args.count)])
+        batchTime, batchTexts = measure(lambda: DocumentTableHeaderLabels.texts(0, args.count, type, parameter))
+
+        DocumentTableHeaderLabels.clear()
+        coldTime, cachedTexts = measure(lambda: [DocumentTableHeaderLabels.text(number, type, parameter) for number in range(args.count)])
+        warmTime, cachedTexts = measure(lambda: [DocumentTableHeaderLabels.text(number, type, parameter) for number in range(args.count)])
+
+        if batchTexts != perItemTexts or cachedTexts != perItemTexts:
+            sys.exit(f'Labels of type {type.name} differ between the paths')
+
+        print(f'{type.name:<12} {perItemTime:>9.3f}s {batchTime:>9.3f}s {coldTime:>10.3f}s {warmTime:>10.3f}s {perItemTime / batchTime:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Measures the memory of documents while they are loaded, edited and closed, and checks it against a budget.
+
+Usage: python benchmarks/benchmark_memory.py [--output FILE] [--size MB] [--documents N] [--budget BYTES]
+
+Python allocations are traced with tracemalloc; the resident set size, which includes the allocations of Qt,
+is sampled in the background. The benchmark fails if a document needs more bytes per cell than the budget
+or if the memory does not return to its baseline after the documents are closed.
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from benchmark import createApplication, createDocument, measure, waitUntil, writeResults
+
+from PySide2.QtCore import QCoreApplication, QEvent
+
+from main_window import MainWindow
+
+
+def residentSetSize():
+    """
+    Returns the current resident set size in bytes; where it is unknown, the peak size.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ResidentSetSampler(threading.Thread):
+    """
+    Samples the resident set size and keeps its peak since the last reset.
+    """
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+
+        self._interval = interval
+        self._peak = residentSetSize()
+        self._stopped = threading.Event()
+
+
+    def run(self):
+
+        while not self._stopped.wait(self._interval):
+            self._peak = max(self._peak, residentSetSize())
+
+
+    def resetPeak(self):
+
+        self._peak = residentSetSize()
+
+
+    def peak(self):
+
+        return max(self._peak, residentSetSize())
+
+
+    def stop(self):
+
+        self._stopped.set()
+        self.join()
+
+
+def collect():
+    """
+    Deletes closed widgets and unreachable objects.
+    """
+    for count in range(3):
+        QCoreApplication.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+
+def memory(sampler):
+    """
+    Returns the traced bytes, their peak and the resident set size with its peak since the last reset.
+    """
+    traced, tracedPeak = tracemalloc.get_traced_memory()
+
+    return {'traced': traced, 'tracedPeak': tracedPeak, 'resident': residentSetSize(), 'residentPeak': sampler.peak()}
+
+
+def resetPeaks(sampler):
+
+    tracemalloc.reset_peak()
+    sampler.resetPeak()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Memory benchmark and regression check')
+    parser.add_argument('--output', default='-', help='JSON file of the results; - writes them to the standard output')
+    parser.add_argument('--size', type=float, default=16, help='size of each generated document in MiB')
+    parser.add_argument('--file', action='append', default=[], help='existing document to load instead of the generated ones')
+    parser.add_argument('--documents', type=int, default=4, help='number of generated documents open at once')
+    parser.add_argument('--mapped', action='store_true', help='map the documents into memory instead of reading them')
+    parser.add_argument('--budget', type=float, default=64, help='maximum traced bytes per cell of a loaded document')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='fraction of the loaded memory which may remain after closing')
+    args = parser.parse_args()
+
+    app = createApplication()
+    window = MainWindow()
+    window._preferences.setMinimumMappedDocumentSize(1 if args.mapped else 1048576)
+
+    # Indexes of columns are measured by themselves; they would be built while the documents are edited
+    window._preferences.setIndexColumnsAfterLoading(False)
+
+    sampler = ResidentSetSampler()
+    sampler.start()
+    tracemalloc.start()
+
+    failures = []
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        fileNames = [os.path.realpath(fileName) for fileName in args.file]
+        if not fileNames:
+            for index in range(args.documents):
+                fileName = os.path.join(directory, f'memory-{index}.csv')
+                createDocument(fileName, args.size * 1024 * 1024, seed=index)
+                fileNames.append(os.path.realpath(fileName))
+
+        collect()
+        baseline = memory(sampler)
+        resetPeaks(sampler)
+
+        # Documents stay open together, as they do for the users
+        documents = []
+        totalCellCount = 0
+        for fileName in fileNames:
+            before = memory(sampler)
+            resetPeaks(sampler)
+
+            seconds, succeeded = measure(window.loadDocument, fileName)
+            document = window.activeDocument()
+            if not succeeded or not waitUntil(lambda: not document.isLoading()):
+                sys.exit(f'{fileName} could not be loaded')
+
+            collect()
+            loaded = memory(sampler)
+
+            table = document.table()
+            cellCount = table.rowCount() * table.columnCount()
+            totalCellCount += cellCount
+            bytesPerCell = (loaded['traced'] - before['traced']) / max(cellCount, 1)
+
+            # Editing fills a column; the old texts are kept for undoing
+            resetPeaks(sampler)
+            table.fillCells([(0, 0, table.rowCount(), 1)], 'edited')
+            collect()
+            edited = memory(sampler)
+
+            results.append({
+                'name': 'loadDocument',
+                'parameters': {'file': os.path.basename(fileName), 'megabytes': round(os.path.getsize(fileName) / (1024 * 1024), 3), 'mapped': args.mapped},
+                'rows': table.rowCount(),
+                'columns': table.columnCount(),
+                'bytesPerCell': bytesPerCell,
+                'loadedBytes': loaded['traced'] - before['traced'],
+                'loadPeakBytes': loaded['tracedPeak'] - before['traced'],
+                'loadResidentPeakBytes': loaded['residentPeak'] - before['resident'],
+                'editBytes': edited['traced'] - loaded['traced'],
+                'editPeakBytes': edited['tracedPeak'] - loaded['traced'],
+            })
+            print(f'{os.path.basename(fileName)}: {cellCount} cells, {bytesPerCell:.1f} bytes per cell', file=sys.stderr)
+
+            if bytesPerCell > args.budget:
+                failures.append(f'{os.path.basename(fileName)} needs {bytesPerCell:.1f} bytes per cell; the budget is {args.budget:g}')
+
+            documents.append(document)
+
+        opened = memory(sampler)
+
+        # Closing all documents frees their memory
+        resetPeaks(sampler)
+        for document in documents:
+            document.close()
+        documents.clear()
+        collect()
+        closed = memory(sampler)
+
+        loadedBytes = opened['traced'] - baseline['traced']
+        remainingBytes = closed['traced'] - baseline['traced']
+
+        results.append({
+            'name': 'closeDocuments',
+            'parameters': {'documents': len(fileNames), 'mapped': args.mapped},
+            'cells': totalCellCount,
+            'openBytes': loadedBytes,
+            'openResidentBytes': opened['resident'] - baseline['resident'],
+            'remainingBytes': remainingBytes,
+            'remainingResidentBytes': closed['resident'] - baseline['resident'],
+        })
+        print(f'closed {len(fileNames)} documents: {remainingBytes} of {loadedBytes} traced bytes remain', file=sys.stderr)
+
+        if remainingBytes > loadedBytes * args.tolerance:
+            failures.append(f'{remainingBytes} of {loadedBytes} bytes remain after closing the documents')
+
+    tracemalloc.stop()
+    sampler.stop()
+
+    writeResults(args.output, 'memory', {'budget': args.budget, 'tolerance': args.tolerance, 'measurements': results, 'failures': failures})
+
+    window.deleteLater()
+    collect()
+
+    if failures:
+        sys.exit('\n'.join(failures))
+
+
+if __name__ == '__main__':
+    main()
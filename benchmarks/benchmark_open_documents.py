@@ -0,0 +1,137 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Measures opening many documents at once as from the command line: how long the call blocks, when the
+first and the last tab appear, and whether adding a tab slows down with the number of open documents.
+
+Usage: python benchmarks/benchmark_open_documents.py [--output FILE] [--documents N] [--rows N] [--same-name] [--serial]
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmark import createApplication, measure, waitUntil, writeResults
+
+
+def createDocuments(directory, count, rowCount, sameName):
+    """
+    Writes small documents; with the same name each one is written into a directory of its own.
+    """
+    fileNames = []
+
+    for number in range(count):
+        if sameName:
+            fileName = os.path.join(directory, f'{number:04}', 'document.csv')
+            os.makedirs(os.path.dirname(fileName))
+        else:
+            fileName = os.path.join(directory, f'document-{number:04}.csv')
+
+        with open(fileName, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerows([number, row, f'text {row}'] for row in range(rowCount))
+
+        fileNames.append(fileName)
+
+    return fileNames
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmark of opening many documents')
+    parser.add_argument('--output', default='-', help='JSON file of the results; - writes them to the standard output')
+    parser.add_argument('--documents', type=int, default=500, help='number of opened documents')
+    parser.add_argument('--rows', type=int, default=10, help='number of rows of each document')
+    parser.add_argument('--same-name', action='store_true', help='give all documents the same file name in different directories')
+    parser.add_argument('--serial', action='store_true', help='open the documents one after another as before they were loaded concurrently')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds to wait for the documents to be opened')
+    args = parser.parse_args()
+
+    app = createApplication()
+
+    from main_window import MainWindow
+
+    # Each tab is timed from the moment it is added
+    tabs = []
+    addDocumentWindow = MainWindow.addDocumentWindow
+
+    def measuredAddDocumentWindow(window, document):
+        seconds, result = measure(addDocumentWindow, window, document)
+        tabs.append((time.perf_counter(), seconds))
+        return result
+
+    MainWindow.addDocumentWindow = measuredAddDocumentWindow
+
+    with tempfile.TemporaryDirectory() as directory:
+        fileNames = createDocuments(directory, args.documents, args.rows, args.same_name)
+
+        window = MainWindow()
+        window.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        if args.serial:
+            for fileName in fileNames:
+                window.openDocument(fileName)
+        else:
+            window.openDocuments(fileNames)
+        blocking = time.perf_counter() - start
+
+        if not waitUntil(lambda: len(tabs) >= args.documents and not any(document.isLoading() for document in window.documents()), args.timeout):
+            sys.exit(f'{len(tabs)} of {args.documents} documents were opened in time')
+        loaded = time.perf_counter() - start
+
+        window.close()
+
+    # Constant-time lookups add the last tabs as fast as the first ones
+    additions = [seconds for appeared, seconds in tabs]
+    sampleSize = max(len(additions) // 10, 1)
+    first = statistics.median(additions[:sampleSize])
+    last = statistics.median(additions[-sampleSize:])
+
+    firstTab = tabs[0][0] - start
+    lastTab = tabs[-1][0] - start
+
+    print(f'{args.documents} documents opened {"one after another" if args.serial else "concurrently"}', file=sys.stderr)
+    print(f'  blocked for {blocking:.2f} s, first tab after {firstTab * 1000:.0f} ms, last tab after {lastTab:.2f} s, all loaded after {loaded:.2f} s', file=sys.stderr)
+    print(f'  adding a tab: first {sampleSize} {first * 1000:.2f} ms, last {sampleSize} {last * 1000:.2f} ms (median)', file=sys.stderr)
+
+    writeResults(args.output, 'openDocuments', {
+        'documents': args.documents,
+        'rows': args.rows,
+        'sameName': args.same_name,
+        'serial': args.serial,
+        'blockingSeconds': blocking,
+        'firstTabSeconds': firstTab,
+        'lastTabSeconds': lastTab,
+        'loadedSeconds': loaded,
+        'addTabSeconds': additions,
+        'firstMedianSeconds': first,
+        'lastMedianSeconds': last,
+        'growth': last / first if first else None,
+    })
+
+
+if __name__ == '__main__':
+    main()
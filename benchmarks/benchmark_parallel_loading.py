@@ -0,0 +1,114 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Measures how parsing a document with DocumentParallelReader scales with the number of processes.
+
+Usage: python benchmarks/benchmark_parallel_loading.py [--size MB] [--file FILE]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_parallel_reader import DocumentParallelReader
+from document_reader import DocumentReader
+
+
+def createDocument(fileName, size):
+    """
+    Writes a document of about the given size in bytes with mixed numeric and text columns.
+    """
+    words = ['alpha', 'beta', 'gamma', 'delta', 'quoted, text', 'multi\nline']
+
+    with open(fileName, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        row = 0
+        while file.tell() < size:
+            writer.writerows([row + index, random.random(), random.choice(words), random.randint(0, 10**9), 'text'] for index in range(10000))
+            row += 10000
+
+
+def readSerial(fileName):
+
+    reader = DocumentReader(fileName)
+    reader.open()
+    rowCount = sum(len(rows) for rows, bytesRead in reader.batches())
+    reader.close()
+
+    return rowCount
+
+
+def readParallel(fileName, workerCount):
+
+    reader = DocumentParallelReader(fileName, workerCount)
+    reader.open()
+    rowCount = sum(count for columns, count, bytesRead in reader.batches())
+    reader.close()
+
+    return rowCount
+
+
+def measure(function, *args):
+
+    start = time.perf_counter()
+    result = function(*args)
+
+    return time.perf_counter() - start, result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Parallel parsing benchmark')
+    parser.add_argument('--size', type=int, default=256, help='size of the generated document in MiB')
+    parser.add_argument('--file', help='existing document to parse instead of a generated one')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        fileName = args.file
+        if not fileName:
+            fileName = os.path.join(directory, 'benchmark.csv')
+            createDocument(fileName, args.size * 1024 * 1024)
+
+        megabytes = os.path.getsize(fileName) / (1024 * 1024)
+        print(f'Document: {fileName} ({megabytes:.0f} MiB), {os.cpu_count()} processor cores')
+
+        serialTime, rowCount = measure(readSerial, fileName)
+        print(f'{"processes":>9} {"time":>9} {"MiB/s":>8} {"speedup":>8}')
+        print(f'{"thread":>9} {serialTime:>8.2f}s {megabytes / serialTime:>8.1f} {1:>7.2f}x')
+
+        workerCount = 1
+        while workerCount <= os.cpu_count():
+            parallelTime, parallelRowCount = measure(readParallel, fileName, workerCount)
+            if parallelRowCount != rowCount:
+                sys.exit(f'{parallelRowCount} rows parsed by {workerCount} processes instead of {rowCount}')
+
+            print(f'{workerCount:>9} {parallelTime:>8.2f}s {megabytes / parallelTime:>8.1f} {serialTime / parallelTime:>7.2f}x')
+            workerCount *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Measures the startup time of the application in fresh interpreters: the time until the first window
+has been shown, its phases, and the import time of each module as reported by python -X importtime.
+
+Usage: python benchmarks/benchmark_startup.py [--output FILE] [--runs N] [--top N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmark import writeResults
+
+
+RootDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules which are only needed when a dialog is opened
+DialogModules = ['about_dialog', 'colophon_dialog', 'keyboard_shortcuts_dialog', 'preferences_dialog', 'document_find_panel']
+
+# Started in a fresh interpreter; reports its phases once the event loop runs with the window shown
+StartupScript = f'''
+import json, sys, time
+start = time.perf_counter()
+
+from PySide2.QtCore import QTimer
+from PySide2.QtWidgets import QApplication
+
+app = QApplication(sys.argv[:1])
+app.setOrganizationName('NotNypical')
+app.setApplicationName('Tabulator-QtPy-Benchmark')
+application = time.perf_counter()
+
+from main_window import MainWindow
+imported = time.perf_counter()
+
+window = MainWindow()
+created = time.perf_counter()
+window.show()
+
+def report():
+    shown = time.perf_counter()
+    print(json.dumps({{
+        'application': application - start,
+        'import': imported - application,
+        'construction': created - imported,
+        'show': shown - created,
+        'dialogModules': sorted(name for name in {DialogModules!r} if name in sys.modules),
+    }}), flush=True)
+    app.quit()
+
+QTimer.singleShot(0, report)
+app.exec_()
+'''
+
+
+def environment():
+
+    variables = dict(os.environ)
+    variables.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    variables['PYTHONPATH'] = os.pathsep.join(filter(None, [RootDirectory, variables.get('PYTHONPATH')]))
+
+    return variables
+
+
+def measureStartup():
+    """
+    Starts the application; returns the seconds until the first window has been shown and the phases reported by it.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', StartupScript], cwd=RootDirectory, env=environment(), stdout=subprocess.PIPE, text=True)
+
+    line = process.stdout.readline()
+    firstWindow = time.perf_counter() - start
+
+    process.communicate()
+    if process.returncode or not line:
+        sys.exit('The application could not be started')
+
+    return firstWindow, json.loads(line)
+
+
+def measureImports():
+    """
+    Returns the self and cumulative import time in seconds of each module imported by the main window.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main_window'], cwd=RootDirectory, env=environment(), capture_output=True, text=True)
+    if process.returncode:
+        sys.exit(process.stderr)
+
+    imports = []
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        fields = line[len('import time:'):].split('|')
+        name = fields[2].rstrip()
+
+        imports.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self': int(fields[0]) / 1e6,
+            'cumulative': int(fields[1]) / 1e6,
+        })
+
+    return imports
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Startup time benchmark')
+    parser.add_argument('--output', default='-', help='JSON file of the results; - writes them to the standard output')
+    parser.add_argument('--runs', type=int, default=10, help='number of started applications')
+    parser.add_argument('--top', type=int, default=25, help='number of modules with the longest cumulative import time to keep')
+    args = parser.parse_args()
+
+    runs = [measureStartup() for run in range(args.runs)]
+    firstWindows = [firstWindow for firstWindow, phases in runs]
+
+    phases = {name: statistics.median(phases[name] for firstWindow, phases in runs) for name in ('application', 'import', 'construction', 'show')}
+    dialogModules = runs[0][1]['dialogModules']
+
+    imports = measureImports()
+    topImports = sorted(imports, key=lambda module: module['cumulative'], reverse=True)[:args.top]
+
+    print(f'first window after {statistics.median(firstWindows) * 1000:.0f} ms (median of {args.runs} runs)', file=sys.stderr)
+    for name, seconds in phases.items():
+        print(f'  {name:<14} {seconds * 1000:>8.1f} ms', file=sys.stderr)
+    print(f'{"cumulative":>12} {"self":>10}  module', file=sys.stderr)
+    for module in topImports:
+        print(f'{module["cumulative"] * 1000:>10.1f}ms {module["self"] * 1000:>8.1f}ms  {"  " * module["depth"]}{module["module"]}', file=sys.stderr)
+    if dialogModules:
+        print(f'dialog modules imported at startup: {", ".join(dialogModules)}', file=sys.stderr)
+
+    writeResults(args.output, 'startup', {
+        'firstWindowSeconds': firstWindows,
+        'firstWindowMedianSeconds': statistics.median(firstWindows),
+        'phaseMedianSeconds': phases,
+        'dialogModulesAtStartup': dialogModules,
+        'imports': topImports,
+        'importSeconds': sum(module['self'] for module in imports),
+    })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""
+Measures loading documents, creating tables, labeling headers, scrolling and painting under the offscreen platform.
+
+Usage: python benchmarks/benchmark_suite.py [--output FILE] [--sizes MB,...] [--max-rows N] [--frames N]
+
+The results are written as JSON, by default to the standard output; progress is reported on the standard error.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+from benchmark import createApplication, createDocument, measure, percentile, waitUntil, writeResults
+
+from PySide2.QtWidgets import QApplication
+
+from document_table import DocumentTable
+from main_window import MainWindow
+from preferences import Preferences
+
+
+def report(text):
+
+    print(text, file=sys.stderr)
+
+
+def benchmarkLoading(window, fileName, mapped, repeat):
+    """
+    Opens and closes a document through the main window; returns the seconds of each opening until it is loaded.
+    """
+    # Mapped documents are indexed instead of read; the index cache is used from the second opening on
+    window._preferences.setMinimumMappedDocumentSize(1 if mapped else 1048576)
+
+    times = []
+    for run in range(repeat):
+        seconds, document = measure(lambda: window.openDocument(fileName) and window.activeDocument())
+        if not document:
+            sys.exit(f'{fileName} could not be opened')
+
+        loadTime, loaded = measure(waitUntil, lambda: not document.isLoading())
+        if not loaded:
+            sys.exit(f'{fileName} has not been loaded in time')
+
+        times.append(seconds + loadTime)
+
+        document.close()
+        QApplication.processEvents()
+
+    return times
+
+
+def benchmarkScrolling(table, frameCount, pattern):
+    """
+    Scrolls the table and repaints the viewport and headers synchronously; returns the seconds of each frame.
+    """
+    scrollBar = table.verticalScrollBar()
+    generator = random.Random(0)
+
+    times = []
+    for frame in range(frameCount):
+        if pattern == 'page':
+            value = (frame * scrollBar.pageStep()) % (scrollBar.maximum() + 1)
+        elif pattern == 'random':
+            value = generator.randint(0, scrollBar.maximum())
+        else:
+            value = scrollBar.value()
+
+        def paint():
+            scrollBar.setValue(value)
+            table.viewport().repaint()
+            table.verticalHeader().viewport().repaint()
+
+        times.append(measure(paint)[0])
+
+    return times
+
+
+def frameResult(name, parameters, times):
+
+    return {
+        'name': name,
+        'parameters': parameters,
+        'frames': len(times),
+        'meanMilliseconds': sum(times) / len(times) * 1000,
+        'p95Milliseconds': percentile(times, 0.95) * 1000,
+        'maximumMilliseconds': max(times) * 1000,
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Headless benchmark suite')
+    parser.add_argument('--output', default='-', help='JSON file of the results; - writes them to the standard output')
+    parser.add_argument('--sizes', default='1,16,64', help='comma-separated sizes of the loaded documents in MiB')
+    parser.add_argument('--file', action='append', default=[], help='existing document to load in addition to the generated ones')
+    parser.add_argument('--repeat', type=int, default=3, help='number of loadings of each document')
+    parser.add_argument('--columns', type=int, default=25, help='number of columns of the created tables')
+    parser.add_argument('--max-rows', type=int, default=10000000, help='largest number of rows of the created tables, from 1000 on in steps of ten')
+    parser.add_argument('--frames', type=int, default=200, help='number of frames of each scrolling pattern')
+    args = parser.parse_args()
+
+    app = createApplication()
+    results = []
+
+    window = MainWindow()
+    window.resize(1280, 800)
+    window.show()
+
+    # Loading
+    with tempfile.TemporaryDirectory() as directory:
+        fileNames = list(args.file)
+        for size in filter(None, args.sizes.split(',')):
+            fileName = os.path.join(directory, f'benchmark-{size}.csv')
+            createDocument(fileName, float(size) * 1024 * 1024)
+            fileNames.append(fileName)
+
+        for fileName in fileNames:
+            megabytes = os.path.getsize(fileName) / (1024 * 1024)
+
+            for mapped in (False, True):
+                times = benchmarkLoading(window, fileName, mapped, args.repeat)
+                mode = 'mapped' if mapped else 'read'
+
+                results.append({
+                    'name': 'loadDocument',
+                    'parameters': {'megabytes': round(megabytes, 3), 'mode': mode, 'file': os.path.basename(fileName)},
+                    'seconds': times,
+                    'megabytesPerSecond': megabytes / min(times),
+                })
+                report(f'load {os.path.basename(fileName)} ({megabytes:.1f} MiB, {mode}): {megabytes / min(times):.1f} MiB/s')
+
+    # Tables, header labels and scrolling
+    rowCount = 1000
+    while rowCount <= args.max_rows:
+        parameters = {'rows': rowCount, 'columns': args.columns}
+
+        def createTable():
+            table = DocumentTable()
+            table.setColumnCount(args.columns)
+            table.setRowCount(rowCount)
+            return table
+
+        seconds, table = measure(createTable)
+        results.append({'name': 'tableConstruction', 'parameters': parameters, 'seconds': seconds})
+
+        table.resize(1280, 800)
+        table.show()
+        QApplication.processEvents()
+
+        for name, function, argument in [
+                ('setHorizontalHeaderItems', table.setHorizontalHeaderItems, Preferences.HeaderLabel.Letter),
+                ('setVerticalHeaderItems', table.setVerticalHeaderItems, Preferences.HeaderLabel.Decimal),
+                ('relabelAllHorizontal', table.onActionLabelAllHorizontalTriggered, Preferences.HeaderLabel.Decimal),
+                ('relabelAllVertical', table.onActionLabelAllVerticalTriggered, Preferences.HeaderLabel.Letter),
+                ]:
+            results.append({'name': name, 'parameters': parameters, 'seconds': measure(function, argument)[0]})
+
+        # Repainting at one position is the paint cost alone
+        for pattern in ('page', 'random', 'none'):
+            times = benchmarkScrolling(table, args.frames, pattern)
+            results.append(frameResult('scrollPaint' if pattern != 'none' else 'paint', dict(parameters, pattern=pattern), times))
+
+        report(f'table {rowCount} rows: created in {seconds:.3f}s, {results[-3]["meanMilliseconds"]:.2f} ms per scrolled frame')
+
+        # Tables are deleted when they are closed
+        table.close()
+        QApplication.processEvents()
+
+        rowCount *= 10
+
+    writeResults(args.output, 'suite', results)
+
+    window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,17 +18,37 @@
 # along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
 #
 
-from PySide2.QtCore import QFileInfo, Qt, Signal
-from PySide2.QtWidgets import QWidget
+import csv
+import time
 
+from PySide2.QtCore import QFileInfo, Qt, Signal
+from PySide2.QtWidgets import QVBoxLayout, QWidget
+
+from document_indexer import DocumentIndexer
+from document_loader import DocumentLoader
+from document_mapped_store import DocumentMappedStore
+from document_parallel_loader import DocumentParallelLoader
+from document_parallel_reader import DocumentParallelReader
+from document_table import DocumentTable
+from document_writer import DocumentWriter
+from performance_metrics import PerformanceMetricsScope
 from preferences import Preferences
 
 
 class Document(QWidget):
 
     _preferences = Preferences()
+    _metrics = PerformanceMetricsScope()
 
     aboutToClose = Signal(str)
+    progressChanged = Signal(int)
+    loaded = Signal()
+    firstRowsLoaded = Signal()
+    loadFailed = Signal(str)
+    modificationChanged = Signal(bool)
+    saved = Signal(str)
+    saveFailed = Signal(str)
+    filterFailed = Signal(str)
 
 
     def __init__(self, parent=None):
@@ -37,12 +57,70 @@ class Document(QWidget):
         self._canonicalName = None
         self._canonicalIndex = 0
 
+        self._indexCache = None
+        self._prefetch = None
+        self._loader = None
+        self._writer = None
+        self._progress = 100
+
+        # Loading is measured until all rows have arrived
+        self._loadStartTime = 0
+        self._loadSize = 0
+        self._saveStartTime = 0
+
+        # The first rows of a loading document are announced once; the document can be shown then
+        self._isFirstRowsPending = False
+
+        # Format of the file, kept when the document is saved
+        self._encoding = 'utf-8'
+        self._dialect = csv.excel
+
+        # Edits made while a save is running belong to the next save; the undo stack is only marked clean without them
+        self._modificationCount = 0
+        self._savedModificationCount = 0
+
         self.setAttribute(Qt.WA_DeleteOnClose)
 
+        # Content
+        self._table = DocumentTable(self)
+
+        # Main layout
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._table)
+
+        self._table.undoStack().indexChanged.connect(self.onContentsChanged)
+        self._table.undoStack().cleanChanged.connect(self.onCleanChanged)
+        self._table.proxyModel().sortProgressChanged.connect(self.onLoaderProgressChanged)
+        self._table.filterFailed.connect(self.filterFailed)
+        self._table.proxyModel().sourceModel().rowsInserted.connect(self.onTableRowsInserted)
+
 
     def setPreferences(self, preferences):
 
         self._preferences = preferences
+        self._table.setPreferences(preferences)
+
+
+    def setMetrics(self, metrics):
+
+        self._metrics = metrics
+        self._table.setMetrics(metrics)
+
+
+    def metrics(self):
+
+        return self._metrics
+
+
+    def setIndexCache(self, indexCache):
+
+        self._indexCache = indexCache
+
+
+    def setPrefetch(self, prefetch):
+
+        self._prefetch = prefetch
 
 
     def setCanonicalName(self, canonicalName):
@@ -65,9 +143,20 @@ class Document(QWidget):
         return self._canonicalIndex
 
 
+    def table(self):
+
+        return self._table
+
+
+    def undoStack(self):
+
+        return self._table.undoStack()
+
+
     def documentTitle(self):
 
-        return self.windowTitle()
+        # The title holds a placeholder for the modification mark
+        return self.windowTitle().replace('[*]', '')
 
 
     def updateDocumentTitle(self):
@@ -75,15 +164,70 @@ class Document(QWidget):
         fileName = QFileInfo(self._canonicalName).fileName() if self._canonicalName else self.tr('Untitled')
 
         if self._canonicalIndex > 1:
-            self.setWindowTitle(self.tr(f'{fileName} ({self._canonicalIndex})'))
+            self.setWindowTitle(self.tr(f'{fileName} ({self._canonicalIndex})') + '[*]')
         else:
-            self.setWindowTitle(fileName)
+            self.setWindowTitle(fileName + '[*]')
+
+        self._metrics.setName(self.documentTitle())
+
+
+    def setModified(self, modified):
+
+        if modified != self.isWindowModified():
+            self.setWindowModified(modified)
+            self.modificationChanged.emit(modified)
+
+
+    def isModified(self):
+
+        return self.isWindowModified()
+
+
+    def memorySize(self):
+
+        # Estimated bytes of the cells and of the edits kept for undoing
+        return self._table.store().memorySize() + self.undoStack().memoryUsage()
+
+
+    def isUnloaded(self):
+
+        return self._table.store().isUnloaded()
+
+
+    def unload(self):
+
+        # Cells are read by the threads of running tasks
+        if self.isLoading() or self.isSaving() or self.isSorting() or self._table.isIndexing():
+            return False
+
+        try:
+            self._table.unloadCells()
+        except OSError:
+            return False
+
+        return True
+
+
+    def restore(self):
+
+        if not self.isUnloaded():
+            self._table.restoreCells()
+            return
+
+        with self._metrics.measure('restoreTime'):
+            self._table.restoreCells()
 
 
     def closeEvent(self, event):
 
         if True:
-            # Document will be closed
+            # Document will be closed; stop loading it and finish saving it
+            self.cancelLoad()
+            self._table.cancelSort()
+            self._table.cancelIndexing()
+            self.waitForSave()
+            self._table.store().close()
+
             self.aboutToClose.emit(self._canonicalName)
 
             event.accept()
@@ -91,9 +235,261 @@ class Document(QWidget):
             event.ignore()
 
 
+    def isLoading(self):
+
+        return self._loader is not None
+
+
+    def isSaving(self):
+
+        return self._writer is not None
+
+
+    def isSorting(self):
+
+        return self._table.isSorting()
+
+
+    def progress(self):
+
+        return self._progress
+
+
     def load(self, canonicalName):
 
         self.setCanonicalName(canonicalName)
 
+        self._table.setHorizontalHeaderItems(self._preferences.defaultHeaderLabelHorizontal())
+        self._table.setVerticalHeaderItems(self._preferences.defaultHeaderLabelVertical())
+
+        if not canonicalName:
+            # New document
+            self._table.setColumnCount(self._preferences.defaultCellCountColumn())
+            self._table.setRowCount(self._preferences.defaultCellCountRow())
+            return True
+
+        fileInfo = QFileInfo(canonicalName)
+        if not fileInfo.isFile() or not fileInfo.isReadable():
+            return False
+
+        # Existing document
+        self._table.setColumnCount(0)
+        self._table.setRowCount(0)
+
+        # What has been read ahead is used unless the file has changed since
+        prefetch = self._prefetch if self._prefetch and self._prefetch.canonicalName() == canonicalName and self._prefetch.isCurrent() else None
+        self._prefetch = None
+
+        # Large documents are mapped into memory, otherwise they are read completely
+        isMapped = fileInfo.size() >= self._preferences.minimumMappedDocumentSize() * 1024 * 1024 and self.createIndexer(canonicalName, prefetch)
+        if not isMapped:
+            isParallel = fileInfo.size() >= DocumentParallelReader.MinimumSize and self._preferences.parserProcessCount() != 1 and self.createParallelLoader(canonicalName)
+            if not isParallel:
+                self.createLoader(canonicalName, prefetch)
+
+        if self._loader:
+            self._loader.progressChanged.connect(self.onLoaderProgressChanged)
+            self._loader.loadFailed.connect(self.loadFailed)
+            self._loader.finished.connect(self.onLoaderFinished)
+
+            # Columns are indexed once all rows have arrived
+            self._table.setIndexingDeferred(True)
+
+            self._progress = 0
+            self._loadStartTime = time.perf_counter()
+            self._loadSize = fileInfo.size()
+            self._isFirstRowsPending = True
+            self._loader.start()
 
         return True
+
+
+    def createLoader(self, canonicalName, prefetch=None):
+
+        # Rows are appended while the file is being read
+        self._loader = DocumentLoader(canonicalName, self)
+        self._loader.formatDetected.connect(self.onLoaderFormatDetected)
+        self._loader.rowsLoaded.connect(self._table.appendRows)
+
+        if prefetch and prefetch.rows():
+            # The leading rows read ahead are shown at once
+            self._table.appendRows(prefetch.rows())
+            self._loader.setSkipRowCount(len(prefetch.rows()))
+
+
+    def createParallelLoader(self, canonicalName):
+
+        # Documents whose encoding cannot be split are read by a single thread
+        try:
+            if not DocumentParallelReader.canSplit(canonicalName):
+                return False
+        except OSError:
+            return False
+
+        # Ranges of rows are parsed by several processes and appended in order
+        self._loader = DocumentParallelLoader(canonicalName, self._preferences.parserProcessCount(), self)
+        self._loader.formatDetected.connect(self.onLoaderFormatDetected)
+        self._loader.columnsLoaded.connect(self._table.appendRowsFromColumns)
+
+        return True
+
+
+    def createIndexer(self, canonicalName, prefetch=None):
+
+        store = DocumentMappedStore(canonicalName)
+        try:
+            store.open()
+        except (OSError, ValueError):
+            return False
+
+        # Rows are decoded when they are accessed; only their offsets are read in advance
+        self._table.setStore(store)
+        self.onLoaderFormatDetected(store.encoding(), store.dialect())
+
+        cached = prefetch.index() if prefetch else None
+        if not cached and self._indexCache:
+            cached = self._indexCache.load(canonicalName)
+        if cached:
+            # The document has been indexed before; skip the scan
+            store.restoreIndex(*cached)
+            self.onLoaderFormatDetected(store.encoding(), store.dialect())
+            self.onIndexerRowsIndexed(store.rowIndex().rowCount())
+            return True
+
+        self._loader = DocumentIndexer(store, self)
+        self._loader.setIndexCache(self._indexCache)
+        self._loader.rowsIndexed.connect(self.onIndexerRowsIndexed)
+
+        return True
+
+
+    def cancelLoad(self):
+
+        if self._loader:
+            self._loader.cancel()
+            self.onLoaderFinished()
+
+
+    def onLoaderProgressChanged(self, progress):
+
+        self._progress = progress
+        self.progressChanged.emit(progress)
+
+
+    def onLoaderFormatDetected(self, encoding, dialect):
+
+        self._encoding = encoding
+        self._dialect = dialect
+
+
+    def onIndexerRowsIndexed(self, count):
+
+        if not self._table.columnCount():
+            self._table.setColumnCount(self._table.store().sampleColumnCount())
+
+        if count > self._table.rowCount():
+            self._table.setRowCount(count)
+
+
+    def onTableRowsInserted(self, parent, first, last):
+
+        if self._isFirstRowsPending:
+            self._isFirstRowsPending = False
+            self.firstRowsLoaded.emit()
+
+
+    def onLoaderFinished(self):
+
+        if not self._loader:
+            return
+
+        loader = self._loader
+        loader.deleteLater()
+        self._loader = None
+
+        self._progress = 100
+        self.progressChanged.emit(self._progress)
+
+        if loader.isInterruptionRequested():
+            return
+
+        loadTime = time.perf_counter() - self._loadStartTime
+        self._metrics.record('loadTime', loadTime)
+        self._metrics.record('parseTime', loader.parseTime())
+        if loadTime > 0:
+            self._metrics.record('loadThroughput', self._loadSize / (1024 * 1024) / loadTime, 'MiB/s')
+        self._metrics.record('memory', self.memorySize(), 'bytes')
+
+        self.loaded.emit()
+
+        # Filters of loaded documents are answered by the indexes of their columns
+        self._table.setIndexingDeferred(False)
+        if self._preferences.indexColumnsAfterLoading():
+            self._table.indexColumns()
+
+
+    def save(self, canonicalName):
+
+        if self.isLoading() or self.isSaving():
+            return False
+
+        store = self._table.store()
+
+        # The rows are written from a copy of the contents while the document can still be edited
+        self._writer = DocumentWriter(store.snapshot(), canonicalName, self._encoding, self._dialect, self)
+
+        # Mapped documents saved to their own file only rewrite the edited rows
+        self._writer.setPatched(isinstance(store, DocumentMappedStore) and canonicalName == store.fileName())
+        self._writer.progressChanged.connect(self.onLoaderProgressChanged)
+        self._writer.saveFailed.connect(self.saveFailed)
+        self._writer.finished.connect(self.onWriterFinished)
+
+        self._savedModificationCount = self._modificationCount
+
+        self._progress = 0
+        self._saveStartTime = time.perf_counter()
+        self._writer.start()
+
+        return True
+
+
+    def waitForSave(self):
+
+        if self._writer:
+            self._writer.wait()
+            self.onWriterFinished()
+
+
+    def onWriterFinished(self):
+
+        if not self._writer:
+            return
+
+        writer = self._writer
+        writer.deleteLater()
+        self._writer = None
+
+        self._progress = 100
+        self.progressChanged.emit(self._progress)
+
+        if not writer.isSaved():
+            return
+
+        self._metrics.record('saveTime', time.perf_counter() - self._saveStartTime)
+
+        if self._modificationCount == self._savedModificationCount:
+            self.undoStack().setClean()
+        else:
+            self.undoStack().resetClean()
+
+        self.saved.emit(QFileInfo(writer.fileName()).canonicalFilePath())
+
+
+    def onContentsChanged(self):
+
+        self._modificationCount += 1
+
+
+    def onCleanChanged(self, clean):
+
+        self.setModified(not clean)
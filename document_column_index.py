@@ -0,0 +1,240 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import math
+import re
+from array import array
+from bisect import bisect_left, insort
+from itertools import compress
+
+
+WordPattern = re.compile(r'\w+')
+
+
+def words(text):
+    """
+    Returns the distinct lowercase words of a text.
+    """
+    return set(WordPattern.findall(text.lower()))
+
+
+def bisectRows(rows, key, keyOf, first=0, last=None, right=False):
+    """
+    Returns the position of a key among rows sorted by their keys, before or after the rows with an equal key.
+    """
+    last = len(rows) if last is None else last
+
+    # Keys of bisect functions need Python 3.10
+    while first < last:
+        middle = (first + last) // 2
+        if keyOf(rows[middle]) < key or right and not key < keyOf(rows[middle]):
+            first = middle + 1
+        else:
+            last = middle
+
+    return first
+
+
+class DocumentColumnIndex:
+    """
+    Indexes the cells of a column: the rows sorted by their keys answer equality and range lookups
+    and, for columns of texts, the rows of each word answer prefix lookups.
+
+    Lookups return arrays of rows in no particular order.
+    """
+    TextTypes = ('text', 'dictionary')
+    NumberTypes = ('int', 'float')
+
+    # Each update moves the rows behind it; beyond this many moved rows the index is built again instead
+    MaximumUpdateCost = 32 * 1024 * 1024
+
+
+    def __init__(self, store, column):
+
+        self._store = store
+        self._column = column
+        self._type = None
+
+        # Key of each row and the rows in the order of their keys, equal keys in the order of the rows
+        self._keys = []
+        self._order = array('q')
+
+        # Rows of each word in ascending order and the words in alphabetical order
+        self._words = None
+        self._sortedWords = []
+
+
+    def column(self):
+
+        return self._column
+
+
+    def type(self):
+
+        return self._type
+
+
+    def build(self):
+        """
+        Reads the keys of all rows and sorts them.
+        """
+        self._type = self._store.columnType(self._column)
+        self._keys = self._store.indexKeys(self._column)
+        self._order = array('q', sorted(range(len(self._keys)), key=self._keys.__getitem__))
+
+        if self._type in self.TextTypes:
+            self._words = {}
+            textWords = {}
+
+            for row, text in enumerate(self._keys):
+                # Repeated texts are split once
+                rowWords = textWords.get(text)
+                if rowWords is None:
+                    rowWords = textWords[text] = words(text)
+
+                for word in rowWords:
+                    rows = self._words.get(word)
+                    if rows is None:
+                        rows = self._words[word] = array('q')
+                    rows.append(row)
+
+            self._sortedWords = sorted(self._words)
+
+
+    def key(self, text):
+
+        return self._store.indexKey(self._column, text)
+
+
+    def boundKey(self, text):
+        """
+        Returns the key of a bound of a lookup; numbers are compared by their values. Raises ValueError if the text does not fit the column.
+        """
+        if self._type not in self.NumberTypes or not text:
+            return self.key(text)
+
+        try:
+            return int(text)
+        except ValueError:
+            pass
+
+        try:
+            number = float(text)
+        except ValueError:
+            raise ValueError(f'{text!r} is not a number') from None
+
+        if math.isnan(number):
+            raise ValueError(f'{text!r} is not a number')
+
+        return number
+
+
+    def equalRows(self, text):
+        """
+        Returns the rows of the cells with the given text.
+        """
+        return self.rangeRows(text, text)
+
+
+    def rangeRows(self, low=None, high=None):
+        """
+        Returns the rows of the cells between two texts, both included; None leaves a side open.
+
+        Raises ValueError if a text does not fit the column.
+        """
+        keyOf = self._keys.__getitem__
+
+        lowKey = self.boundKey(low) if low is not None else None
+        highKey = self.boundKey(high) if high is not None else None
+
+        try:
+            first = bisectRows(self._order, lowKey, keyOf) if low is not None else 0
+            last = bisectRows(self._order, highKey, keyOf, right=True) if high is not None else len(self._order)
+        except TypeError:
+            # The type of the column has changed since it has been indexed
+            return array('q')
+
+        return self._order[first:last] if first < last else array('q')
+
+
+    def prefixRows(self, prefix):
+        """
+        Returns the rows of the cells with a word starting with the given text; cells of numbers are compared as a whole.
+        """
+        prefix = prefix.lower()
+
+        if self._words is None:
+            texts = self._store.columnValues(self._column, 0, len(self._keys))
+            return array('q', compress(range(len(texts)), (text.lower().startswith(prefix) for text in texts)))
+
+        rows = set()
+
+        index = bisect_left(self._sortedWords, prefix)
+        while index < len(self._sortedWords) and self._sortedWords[index].startswith(prefix):
+            rows.update(self._words[self._sortedWords[index]])
+            index += 1
+
+        return array('q', rows)
+
+
+    def position(self, key, row):
+        """
+        Returns the position of a row with the given key in the order of the keys.
+        """
+        keyOf = self._keys.__getitem__
+
+        first = bisectRows(self._order, key, keyOf)
+        last = bisectRows(self._order, key, keyOf, first, right=True)
+
+        return bisect_left(self._order, row, first, last)
+
+
+    def isUpdatable(self, count):
+        """
+        Returns whether updating the given number of rows is cheaper than building the index again.
+        """
+        return count * len(self._order) <= self.MaximumUpdateCost
+
+
+    def update(self, row, text):
+        """
+        Moves a row whose cell has changed; raises ValueError if the text does not fit the keys anymore.
+        """
+        key = self.key(text)
+        previousKey = self._keys[row]
+
+        del self._order[self.position(previousKey, row)]
+        self._keys[row] = key
+        self._order.insert(self.position(key, row), row)
+
+        if self._words is not None:
+            for word in words(previousKey) - words(key):
+                rows = self._words[word]
+                del rows[bisect_left(rows, row)]
+                if not rows:
+                    del self._words[word]
+                    del self._sortedWords[bisect_left(self._sortedWords, word)]
+
+            for word in words(key) - words(previousKey):
+                rows = self._words.get(word)
+                if rows is None:
+                    rows = self._words[word] = array('q')
+                    insort(self._sortedWords, word)
+                insort(rows, row)
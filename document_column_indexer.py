@@ -0,0 +1,62 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from PySide2.QtCore import QThread, Signal
+
+from document_column_index import DocumentColumnIndex
+
+
+class DocumentColumnIndexer(QThread):
+
+    columnIndexed = Signal(int, object)
+    progressChanged = Signal(int)
+
+
+    def __init__(self, store, columns, parent=None):
+        super().__init__(parent)
+
+        self._store = store
+        self._columns = list(columns)
+
+
+    def columns(self):
+
+        return self._columns
+
+
+    def cancel(self):
+        """
+        Stops the indexing after the current column and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        for count, column in enumerate(self._columns, 1):
+            if self.isInterruptionRequested():
+                return
+
+            index = DocumentColumnIndex(self._store, column)
+            index.build()
+
+            self.columnIndexed.emit(column, index)
+            self.progressChanged.emit(count * 100 // len(self._columns))
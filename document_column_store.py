@@ -0,0 +1,349 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import pickle
+import tempfile
+import threading
+from itertools import chain, repeat, zip_longest
+
+from document_columns import DocumentTextColumn, createColumn
+
+
+class DocumentColumnStore:
+    """
+    Keeps the cells column by column; the type of each column is inferred from its first values.
+    """
+
+    def __init__(self):
+
+        self._columnList = []
+        self._rowCount = 0
+
+        # Columns shared with snapshots, by their ids; they are copied before they are changed
+        self._sharedColumns = set()
+
+        # Cells of unloaded stores are kept in a spill file until they are accessed again
+        self._spillFile = None
+        self._spillColumnCount = 0
+        self._spillLock = threading.Lock()
+
+
+    @property
+    def _columns(self):
+
+        if self._spillFile is not None:
+            self.restore()
+
+        return self._columnList
+
+
+    @_columns.setter
+    def _columns(self, columns):
+
+        self._columnList = columns
+
+
+    def close(self):
+        """
+        Releases the cells.
+        """
+        with self._spillLock:
+            if self._spillFile is not None:
+                self._spillFile.close()
+                self._spillFile = None
+
+        self._columns = []
+        self._rowCount = 0
+
+
+    def unload(self):
+        """
+        Moves the cells to a temporary spill file; they are restored when they are accessed again.
+        """
+        with self._spillLock:
+            if self._spillFile is not None or not self._columnList:
+                return
+
+            spillFile = tempfile.TemporaryFile()
+            try:
+                pickle.dump(self._columnList, spillFile, pickle.HIGHEST_PROTOCOL)
+            except OSError:
+                spillFile.close()
+                raise
+
+            self._spillColumnCount = len(self._columnList)
+            self._spillFile = spillFile
+            self._columnList = []
+            self._sharedColumns.clear()
+
+
+    def restore(self):
+        """
+        Reads the cells back from the spill file of an unloaded store.
+        """
+        with self._spillLock:
+            if self._spillFile is None:
+                return
+
+            self._spillFile.seek(0)
+            self._columnList = pickle.load(self._spillFile)
+
+            self._spillFile.close()
+            self._spillFile = None
+
+
+    def spilledColumns(self):
+        """
+        Returns the columns of the store; those of an unloaded store are read from the spill file without restoring them.
+        """
+        with self._spillLock:
+            if self._spillFile is None:
+                return self._columnList
+
+            self._spillFile.seek(0)
+            return pickle.load(self._spillFile)
+
+
+    def isUnloaded(self):
+
+        return self._spillFile is not None
+
+
+    def snapshot(self):
+        """
+        Returns a copy of the store which is not affected by later changes; the columns are copied when either store changes them.
+        """
+        columns = self._columns
+        self._sharedColumns.update(map(id, columns))
+
+        snapshot = DocumentColumnStore()
+        snapshot._columns = list(columns)
+        snapshot._sharedColumns = set(map(id, columns))
+        snapshot._rowCount = self._rowCount
+
+        return snapshot
+
+
+    def rowCount(self):
+
+        return self._rowCount
+
+
+    def columnCount(self):
+
+        return len(self._columnList) if self._spillFile is None else self._spillColumnCount
+
+
+    def columnType(self, column):
+        """
+        Returns the name of the type of a column.
+        """
+        return self._columns[column].Type
+
+
+    def column(self, column):
+
+        return self._columns[column]
+
+
+    def writableColumn(self, column):
+        """
+        Returns a column which can be changed; a column shared with a snapshot is replaced by a copy.
+        """
+        values = self._columns[column]
+        if id(values) in self._sharedColumns:
+            self._sharedColumns.discard(id(values))
+            values = self._columns[column] = values.copy()
+
+        return values
+
+
+    def setRowCount(self, count):
+        """
+        Sets the number of rows; new rows are empty.
+        """
+        for column in range(len(self._columns)):
+            self.writableColumn(column).resize(count)
+
+        self._rowCount = count
+
+
+    def setColumnCount(self, count):
+        """
+        Sets the number of columns; new columns are empty.
+        """
+        while len(self._columns) < count:
+            self._columns.append(DocumentTextColumn(repeat('', self._rowCount)))
+
+        del self._columns[count:]
+
+
+    def value(self, row, column):
+        """
+        Returns the text of a cell.
+        """
+        return self._columns[column].value(row)
+
+
+    def setValue(self, row, column, value):
+        """
+        Sets the text of a cell.
+        """
+        try:
+            self.writableColumn(column).setValue(row, value)
+        except ValueError:
+            self.convertToText(column).setValue(row, value)
+
+
+    def columnValues(self, column, first, count):
+        """
+        Returns the texts of a range of cells of a column.
+        """
+        return self._columns[column].values(first, count)
+
+
+    def setColumnValues(self, column, first, values):
+        """
+        Sets the texts of a range of cells of a column from a list.
+        """
+        try:
+            self.writableColumn(column).setValues(first, values)
+        except ValueError:
+            self.convertToText(column).setValues(first, values)
+
+
+    def convertToText(self, column):
+        """
+        Converts a column to texts because a value does not fit its type anymore; returns the new column.
+        """
+        self._columns[column] = DocumentTextColumn(self._columns[column].texts())
+
+        return self._columns[column]
+
+
+    def extendColumn(self, column, values):
+        """
+        Appends texts to a column; the type of an empty column is inferred from them.
+        """
+        if not len(self._columns[column]):
+            self._columns[column] = createColumn(values)
+            return
+
+        try:
+            self.writableColumn(column).extend(values)
+        except ValueError:
+            self._columns[column] = DocumentTextColumn(chain(self._columns[column].texts(), values))
+
+
+    def insertColumns(self, position, columns):
+        """
+        Inserts columns given as lists of texts of all rows or as columns removed before.
+        """
+        self._columns[position:position] = [column if hasattr(column, 'texts') else createColumn(column) for column in columns]
+
+
+    def removeColumns(self, position, count):
+        """
+        Removes columns; returns them.
+        """
+        columns = self._columns[position:position + count]
+        del self._columns[position:position + count]
+
+        return columns
+
+
+    def sortKeys(self, column):
+        """
+        Returns a sequence of keys of the rows which sort a column.
+        """
+        return self._columns[column].sortKeys()
+
+
+    def indexKeys(self, column):
+        """
+        Returns a copy of the keys of the rows of a column for an index.
+        """
+        return self._columns[column].indexKeys()
+
+
+    def indexKey(self, column, value):
+        """
+        Returns the key of a text comparable to the keys of the rows of a column; raises ValueError if it does not fit.
+        """
+        return self._columns[column].indexKey(value)
+
+
+    def findRows(self, column, value):
+        """
+        Returns the rows of the cells of a column with the given text.
+        """
+        return self._columns[column].findRows(value)
+
+
+    def valueCounts(self, column):
+        """
+        Returns the number of cells of a column for each text.
+        """
+        return self._columns[column].valueCounts()
+
+
+    def memorySize(self):
+        """
+        Returns an estimate of the bytes of the cells; cells of unloaded stores do not count.
+        """
+        return sum(column.memorySize() for column in self._columnList)
+
+
+    def rows(self):
+        """
+        Returns an iterator over the rows as sequences of texts; the cells of an unloaded store are not restored.
+        """
+        columns = self.spilledColumns()
+        if not columns:
+            return repeat((), self._rowCount)
+
+        return zip(*(column.texts() for column in columns))
+
+
+    def appendRows(self, rows):
+        """
+        Appends rows given as sequences of texts; short rows are padded with empty cells.
+        """
+        if not rows:
+            return
+
+        columns = list(zip_longest(*rows, fillvalue=''))
+        self.appendRowsFromColumns(columns, len(rows))
+
+
+    def appendRowsFromColumns(self, columns, count=None):
+        """
+        Appends rows given column by column; all given columns have the same length.
+        """
+        if not columns:
+            return
+
+        count = len(columns[0]) if count is None else count
+        self.setColumnCount(max(self.columnCount(), len(columns)))
+
+        for index in range(len(self._columns)):
+            self.extendColumn(index, columns[index] if index < len(columns) else [''] * count)
+
+        self._rowCount += count
@@ -0,0 +1,711 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import copy
+import math
+import sys
+from array import array
+from collections import Counter
+from datetime import date
+from itertools import compress, islice, repeat
+
+
+class DocumentTextColumn:
+    """
+    A column of texts.
+    """
+    Type = 'text'
+
+
+    def __init__(self, texts=()):
+
+        self._values = list(texts)
+
+
+    def __len__(self):
+
+        return len(self._values)
+
+
+    def copy(self):
+
+        return DocumentTextColumn(self._values)
+
+
+    def value(self, row):
+
+        return self._values[row]
+
+
+    def setValue(self, row, text):
+
+        self._values[row] = text
+
+
+    def values(self, first, count):
+
+        return self._values[first:first + count]
+
+
+    def setValues(self, first, texts):
+
+        self._values[first:first + len(texts)] = texts
+
+
+    def extend(self, texts):
+
+        self._values.extend(texts)
+
+
+    def resize(self, count):
+
+        if count > len(self._values):
+            self._values.extend(repeat('', count - len(self._values)))
+        else:
+            del self._values[count:]
+
+
+    def texts(self):
+
+        return iter(self._values)
+
+
+    def findRows(self, text):
+        """
+        Returns the rows of the cells with the given text.
+        """
+        return list(compress(range(len(self._values)), map(text.__eq__, self._values)))
+
+
+    def sortKeys(self):
+        """
+        Returns a sequence of keys of the rows which sort the column.
+        """
+        return self._values
+
+
+    def indexKeys(self):
+        """
+        Returns a copy of the keys of the rows which sort the column by their texts.
+        """
+        return list(self._values)
+
+
+    def indexKey(self, text):
+        """
+        Returns the key of a text comparable to the keys of the rows; raises ValueError if the text does not fit the column.
+        """
+        return text
+
+
+    def valueCounts(self):
+        """
+        Returns the number of cells of each text.
+        """
+        return Counter(self._values)
+
+
+    def memorySize(self):
+        """
+        Returns an estimate of the bytes of the column; the size of the texts is estimated from a sample.
+        """
+        sample = self._values[::max(len(self._values) // SampleSize, 1)]
+        textSize = sum(map(sys.getsizeof, sample)) * len(self._values) // len(sample) if sample else 0
+
+        return sys.getsizeof(self._values) + textSize
+
+
+class DocumentArrayColumn:
+    """
+    A column of numbers in an array which subclasses convert from and to texts with encode() and decode(); empty cells
+    are stored as a reserved number.
+
+    Texts which their numbers do not reproduce, like a header in the first row, are kept aside by their rows; those which
+    cannot be converted at all sort as empty cells. Keeping more than a few texts aside raises ValueError and leaves the
+    column unchanged.
+    """
+    Type = None
+    TypeCode = 'q'
+    Empty = 0
+
+    # Texts kept aside are limited to a few ones and a small share of the rows
+    MaximumKeptTextCount = 16
+    KeptTextRatio = 0.01
+
+
+    def __init__(self, texts=()):
+
+        self._values = array(self.TypeCode)
+        self._keptTexts = {}
+        self.extend(texts)
+
+
+    def __len__(self):
+
+        return len(self._values)
+
+
+    def copy(self):
+
+        column = copy.copy(self)
+        column._values = array(self.TypeCode, self._values)
+        column._keptTexts = dict(self._keptTexts)
+
+        return column
+
+
+    def isEmpty(self, number):
+
+        return number == self.Empty
+
+
+    def parse(self, text):
+        """
+        Returns the number of a text, or None if the text cannot be converted.
+        """
+        try:
+            return self.encodeCell(text)
+        except (ValueError, OverflowError):
+            return None
+
+
+    def encodeTexts(self, texts, first=0):
+        """
+        Returns an array of the numbers of texts starting at the given row, and the texts which the numbers do not reproduce by their rows.
+        """
+        texts = texts if isinstance(texts, list) else list(texts)
+        maximumCount = self.MaximumKeptTextCount + max(len(self._values), first + len(texts)) * self.KeptTextRatio
+
+        numbers = array(self.TypeCode)
+        keptTexts = {}
+
+        for row, text in enumerate(texts, first):
+            number = self.parse(text)
+            if number is None:
+                number = self.Empty
+                keptTexts[row] = text
+            elif self.decodeCell(number) != text:
+                keptTexts[row] = text
+
+            # Texts of another type are recognized before they have all been converted
+            if len(keptTexts) > maximumCount:
+                raise ValueError(f'Texts are not stored as {self.Type} values')
+
+            numbers.append(number)
+
+        return numbers, keptTexts
+
+
+    def storeNumbers(self, first, count, numbers, keptTexts):
+        """
+        Replaces the numbers of a range of rows and the texts kept aside for them; raises ValueError if too many texts would be kept aside.
+        """
+        staleRows = [row for row in self._keptTexts if first <= row < first + count]
+
+        maximumCount = self.MaximumKeptTextCount + max(len(self._values), first + len(numbers)) * self.KeptTextRatio
+        if len(self._keptTexts) - len(staleRows) + len(keptTexts) > maximumCount:
+            raise ValueError(f'Texts are not stored as {self.Type} values')
+
+        self._values[first:first + count] = numbers
+
+        for row in staleRows:
+            del self._keptTexts[row]
+        self._keptTexts.update(keptTexts)
+
+
+    def encodeCell(self, text):
+
+        return self.encode(text) if text else self.Empty
+
+
+    def decodeCell(self, number):
+
+        return self.decode(number) if not self.isEmpty(number) else ''
+
+
+    def value(self, row):
+
+        text = self._keptTexts.get(row)
+
+        return text if text is not None else self.decodeCell(self._values[row])
+
+
+    def setValue(self, row, text):
+
+        self.storeNumbers(row, 1, *self.encodeTexts([text], row))
+
+
+    def values(self, first, count):
+
+        texts = list(map(self.decodeCell, self._values[first:first + count]))
+
+        if self._keptTexts:
+            for row in range(first, first + len(texts)):
+                text = self._keptTexts.get(row)
+                if text is not None:
+                    texts[row - first] = text
+
+        return texts
+
+
+    def setValues(self, first, texts):
+
+        self.storeNumbers(first, len(texts), *self.encodeTexts(texts, first))
+
+
+    def extend(self, texts):
+
+        first = len(self._values)
+        self.storeNumbers(first, 0, *self.encodeTexts(texts, first))
+
+
+    def resize(self, count):
+
+        if count > len(self._values):
+            self._values.extend(repeat(self.Empty, count - len(self._values)))
+        else:
+            del self._values[count:]
+
+            for row in [row for row in self._keptTexts if row >= count]:
+                del self._keptTexts[row]
+
+
+    def texts(self):
+
+        texts = map(self.decodeCell, self._values)
+        if not self._keptTexts:
+            return texts
+
+        keptTexts = self._keptTexts
+
+        return (keptTexts.get(row, text) for row, text in enumerate(texts))
+
+
+    def findRows(self, text):
+        """
+        Returns the rows of the cells with the given text.
+        """
+        rows = []
+
+        number = self.parse(text)
+        if number is not None and self.decodeCell(number) == text:
+            matches = map(self.isEmpty, self._values) if self.isEmpty(number) else map(number.__eq__, self._values)
+            rows = list(compress(range(len(self._values)), matches))
+
+        if not self._keptTexts:
+            return rows
+
+        # Cells with texts kept aside are compared by their texts
+        keptRows = {row for row, keptText in self._keptTexts.items() if keptText == text}
+
+        return sorted(keptRows.union(row for row in rows if row not in self._keptTexts))
+
+
+    def valueCounts(self):
+        """
+        Returns the number of cells of each text; the numbers are counted.
+        """
+        counts = Counter(self._values)
+
+        # Empty floats are not equal to each other
+        empty = sum(count for number, count in counts.items() if self.isEmpty(number))
+
+        texts = Counter()
+        for number, count in counts.items():
+            if not self.isEmpty(number):
+                texts[self.decode(number)] += count
+        if empty:
+            texts[''] = empty
+
+        # Cells with texts kept aside are counted by their texts
+        for row, text in self._keptTexts.items():
+            texts[self.decodeCell(self._values[row])] -= 1
+            texts[text] += 1
+
+        return +texts
+
+
+    def memorySize(self):
+        """
+        Returns the bytes of the column.
+        """
+        return sys.getsizeof(self._values) + sys.getsizeof(self._keptTexts) + sum(map(sys.getsizeof, self._keptTexts.values()))
+
+
+    def numbers(self):
+        """
+        Returns the array of numbers, including the empty ones.
+        """
+        return self._values
+
+
+    def sortKeys(self):
+
+        # Empty numbers are the smallest ones
+        return self._values
+
+
+    def indexKeys(self):
+
+        return array(self.TypeCode, self.sortKeys())
+
+
+    def indexKey(self, text):
+
+        return self.encodeCell(text)
+
+
+class DocumentIntegerColumn(DocumentArrayColumn):
+
+    Type = 'int'
+    TypeCode = 'q'
+    Empty = -2**63
+
+
+    def encodeTexts(self, texts, first=0):
+
+        texts = list(texts)
+
+        # Columns without empty cells are converted in a few passes over the texts
+        if texts and '' not in texts:
+            try:
+                numbers = list(map(int, texts))
+                if list(map(str, numbers)) == texts and min(numbers) > self.Empty and max(numbers) < 2**63:
+                    return array(self.TypeCode, numbers), {}
+            except ValueError:
+                pass
+
+        return super().encodeTexts(texts, first)
+
+
+    def encode(self, text):
+
+        number = int(text)
+        if not self.Empty < number < 2**63:
+            raise ValueError(f'{text!r} is not stored as an integer')
+
+        return number
+
+
+    def decode(self, number):
+
+        return str(number)
+
+
+class DocumentFloatColumn(DocumentArrayColumn):
+
+    Type = 'float'
+    TypeCode = 'd'
+    Empty = math.nan
+
+
+    def __init__(self, texts=()):
+
+        # Numbers are written with as many decimals as the first one; None writes them as short as possible
+        self._decimals = None
+        self._isFormatKnown = False
+
+        super().__init__(texts)
+
+
+    def isEmpty(self, number):
+
+        return number != number
+
+
+    def encodeTexts(self, texts, first=0):
+
+        texts = list(texts)
+
+        # Columns without empty cells are converted in a few passes over the texts
+        if texts and '' not in texts:
+            try:
+                numbers = [self.encode(texts[0]), *map(float, texts[1:])]
+                if list(map(self.decode, numbers)) == texts and all(map(math.isfinite, numbers)):
+                    return array(self.TypeCode, numbers), {}
+            except ValueError:
+                pass
+
+        return super().encodeTexts(texts, first)
+
+
+    def encode(self, text):
+
+        number = float(text)
+        if not math.isfinite(number):
+            raise ValueError(f'{text!r} is not stored as a float')
+
+        if not self._isFormatKnown:
+            self._decimals = decimalCount(text)
+            self._isFormatKnown = True
+
+        return number
+
+
+    def decode(self, number):
+
+        return repr(number) if self._decimals is None else f'{number:.{self._decimals}f}'
+
+
+    def sortKeys(self):
+
+        # Empty cells are not comparable; they sort before all numbers
+        return array(self.TypeCode, (number if number == number else -math.inf for number in self._values))
+
+
+    def indexKey(self, text):
+
+        number = self.encodeCell(text)
+
+        return number if number == number else -math.inf
+
+
+class DocumentBooleanColumn(DocumentArrayColumn):
+
+    Type = 'bool'
+    TypeCode = 'b'
+    Empty = -1
+
+    Spellings = (('false', 'true'), ('False', 'True'), ('FALSE', 'TRUE'))
+
+
+    def __init__(self, texts=()):
+
+        # The spelling of the first value is kept for all cells
+        self._spelling = None
+
+        super().__init__(texts)
+
+
+    def encode(self, text):
+
+        if self._spelling is None:
+            self._spelling = next((spelling for spelling in self.Spellings if text in spelling), None)
+            if self._spelling is None:
+                raise ValueError(f'{text!r} is not stored as a boolean')
+
+        return self._spelling.index(text)
+
+
+    def decode(self, number):
+
+        return self._spelling[number]
+
+
+class DocumentDateColumn(DocumentArrayColumn):
+
+    Type = 'date'
+    TypeCode = 'i'
+    Empty = 0
+
+
+    def encode(self, text):
+
+        return date.fromisoformat(text).toordinal()
+
+
+    def decode(self, number):
+
+        return date.fromordinal(number).isoformat()
+
+
+class DocumentDictionaryColumn(DocumentArrayColumn):
+    """
+    A column of texts stored as codes of a table of their distinct texts.
+
+    Texts are compared and counted by their codes; adding more distinct texts than the table holds raises ValueError.
+    """
+    Type = 'dictionary'
+    TypeCode = 'H'
+    MaximumTextCount = 65536
+
+
+    def __init__(self, texts=()):
+
+        self._texts = []
+        self._codes = {}
+
+        super().__init__(texts)
+
+
+    def copy(self):
+
+        column = super().copy()
+        column._texts = list(self._texts)
+        column._codes = dict(self._codes)
+
+        return column
+
+
+    def isEmpty(self, number):
+
+        return False
+
+
+    def encodeTexts(self, texts, first=0):
+
+        texts = list(texts)
+        codes = self._codes
+
+        # Known texts are looked up in one pass
+        numbers = list(map(codes.get, texts))
+        if None in numbers:
+            numbers = list(map(self.encode, texts))
+
+        # All texts are reproduced by their codes
+        return array(self.TypeCode, numbers), {}
+
+
+    def encodeCell(self, text):
+
+        return self.encode(text)
+
+
+    def encode(self, text):
+
+        code = self._codes.get(text)
+        if code is None:
+            if len(self._texts) >= self.MaximumTextCount:
+                raise ValueError(f'Column has more than {self.MaximumTextCount} distinct texts')
+
+            code = len(self._texts)
+            self._texts.append(text)
+            self._codes[text] = code
+
+        return code
+
+
+    def decode(self, number):
+
+        return self._texts[number]
+
+
+    def resize(self, count):
+
+        if count > len(self._values):
+            self._values.extend(repeat(self.encode(''), count - len(self._values)))
+        else:
+            del self._values[count:]
+
+
+    def texts(self):
+
+        return map(self._texts.__getitem__, self._values)
+
+
+    def dictionary(self):
+        """
+        Returns the distinct texts in the order of their codes.
+        """
+        return self._texts
+
+
+    def code(self, text):
+        """
+        Returns the code of a text, or None if no cell has had the text.
+        """
+        return self._codes.get(text)
+
+
+    def sortKeys(self):
+
+        # Codes are replaced by the ranks of their texts
+        ranks = array(self.TypeCode, bytes(len(self._texts) * array(self.TypeCode).itemsize))
+        for rank, code in enumerate(sorted(range(len(self._texts)), key=self._texts.__getitem__)):
+            ranks[code] = rank
+
+        return array(self.TypeCode, map(ranks.__getitem__, self._values))
+
+
+    def indexKeys(self):
+
+        # Keys are the texts; ranks of codes change when texts are added
+        return list(self.texts())
+
+
+    def indexKey(self, text):
+
+        return text
+
+
+    def findRows(self, text):
+
+        code = self._codes.get(text)
+        if code is None:
+            return []
+
+        return list(compress(range(len(self._values)), map(code.__eq__, self._values)))
+
+
+    def valueCounts(self):
+
+        return Counter({self._texts[code]: count for code, count in Counter(self._values).items()})
+
+
+    def memorySize(self):
+
+        return sys.getsizeof(self._values) + sys.getsizeof(self._codes) + sum(map(sys.getsizeof, self._texts))
+
+
+ColumnTypes = (DocumentIntegerColumn, DocumentFloatColumn, DocumentBooleanColumn, DocumentDateColumn)
+
+# Number of cells whose texts estimate the size of a column of texts
+SampleSize = 1000
+
+# Text columns with at most this ratio of distinct texts among their first values are dictionary encoded
+DictionaryRatio = 0.05
+DictionaryMinimumCount = 1000
+
+
+def decimalCount(text):
+    """
+    Returns the number of decimals of a number written without an exponent, or None.
+    """
+    integer, point, fraction = text.lstrip('+-').partition('.')
+    if (integer or fraction) and all(not part or part.isascii() and part.isdigit() for part in (integer, fraction)):
+        return len(fraction)
+
+    return None
+
+
+def createColumn(texts, sampleSize=1000):
+    """
+    Returns a column of the first type which stores all texts exactly, inferred from a sample of non-empty texts.
+
+    A few texts which do not fit the type, like a header in the first row, are kept aside by the typed columns.
+    """
+    texts = texts if isinstance(texts, list) else list(texts)
+    sample = list(islice(filter(None, texts), sampleSize))
+
+    if sample:
+        for columnType in ColumnTypes:
+            try:
+                columnType(sample)
+                return columnType(texts)
+            except (ValueError, OverflowError):
+                continue
+
+        if len(texts) >= DictionaryMinimumCount and len(set(texts)) <= len(texts) * DictionaryRatio:
+            try:
+                return DocumentDictionaryColumn(texts)
+            except ValueError:
+                pass
+
+    return DocumentTextColumn(texts)
@@ -0,0 +1,265 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+from PySide2.QtCore import Qt, Signal
+from PySide2.QtWidgets import QCheckBox, QDockWidget, QGridLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget
+
+from document_finder import DocumentFinder, DocumentSearch
+
+
+class DocumentFindPanel(QDockWidget):
+
+    # Found cells listed for each document; all of them are replaced
+    MaximumItemCount = 1000
+
+    findAllRequested = Signal()
+    replaceAllRequested = Signal()
+    cellActivated = Signal(object, int, int)
+
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.setObjectName('findPanel')
+        self.setWindowTitle(self.tr('Find in Documents'))
+
+        self._finder = None
+        self._replacement = None
+
+        # Found cells and the result item of each searched document
+        self._documentCells = {}
+        self._documentItems = {}
+        self._replacedCount = 0
+
+        # Search
+        self.txtFind = QLineEdit()
+        self.txtFind.setPlaceholderText(self.tr('Find'))
+        self.txtFind.textChanged.connect(self.updateButtons)
+        self.txtFind.returnPressed.connect(self.findAllRequested)
+
+        self.txtReplace = QLineEdit()
+        self.txtReplace.setPlaceholderText(self.tr('Replace with'))
+
+        self.chkMatchCase = QCheckBox(self.tr('Match case'))
+        self.chkMatchEntireCell = QCheckBox(self.tr('Match entire cell'))
+
+        self.btnFindAll = QPushButton(self.tr('Find All'))
+        self.btnFindAll.setToolTip(self.tr('Find the text in all open documents'))
+        self.btnFindAll.clicked.connect(self.findAllRequested)
+
+        self.btnReplaceAll = QPushButton(self.tr('Replace All'))
+        self.btnReplaceAll.setToolTip(self.tr('Replace the text in all open documents; each document is changed by one edit'))
+        self.btnReplaceAll.clicked.connect(self.replaceAllRequested)
+
+        self.btnStop = QPushButton(self.tr('Stop'))
+        self.btnStop.setToolTip(self.tr('Stop the search'))
+        self.btnStop.clicked.connect(self.cancelSearch)
+
+        optionsLayout = QHBoxLayout()
+        optionsLayout.addWidget(self.chkMatchCase)
+        optionsLayout.addWidget(self.chkMatchEntireCell)
+        optionsLayout.addStretch()
+
+        searchLayout = QGridLayout()
+        searchLayout.addWidget(self.txtFind, 0, 0)
+        searchLayout.addWidget(self.btnFindAll, 0, 1)
+        searchLayout.addWidget(self.txtReplace, 1, 0)
+        searchLayout.addWidget(self.btnReplaceAll, 1, 1)
+        searchLayout.addLayout(optionsLayout, 2, 0)
+        searchLayout.addWidget(self.btnStop, 2, 1)
+
+        # Results
+        self.treeResults = QTreeWidget()
+        self.treeResults.setHeaderLabels([self.tr('Cell'), self.tr('Text')])
+        self.treeResults.itemActivated.connect(self.onResultItemActivated)
+
+        self.lblStatus = QLabel()
+
+        # Main layout
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.addLayout(searchLayout)
+        layout.addWidget(self.treeResults)
+        layout.addWidget(self.lblStatus)
+        self.setWidget(widget)
+
+        self.updateButtons()
+
+
+    def setFindText(self, text):
+
+        if text:
+            self.txtFind.setText(text)
+
+        self.txtFind.selectAll()
+        self.txtFind.setFocus()
+
+
+    def updateButtons(self):
+
+        hasText = bool(self.txtFind.text())
+
+        self.btnFindAll.setEnabled(hasText)
+        self.btnReplaceAll.setEnabled(hasText)
+        self.btnStop.setEnabled(self.isSearching())
+
+
+    def isSearching(self):
+
+        return self._finder is not None
+
+
+    def findInDocuments(self, documents, replace=False):
+
+        self.cancelSearch()
+        self.clearResults()
+
+        search = DocumentSearch(self.txtFind.text(), self.chkMatchCase.isChecked(), self.chkMatchEntireCell.isChecked())
+        if not search.text():
+            return
+
+        self._replacement = self.txtReplace.text() if replace else None
+        self._replacedCount = 0
+
+        # Documents are searched read-only while they can still be edited; found cells are only replaced if they still match.
+        # Replacing searches copy-on-write snapshots. Loading documents are skipped, unloaded ones are searched in their spill files
+        stores = []
+        for document in documents:
+            if not document.isLoading():
+                store = document.table().store()
+                self._documentCells[document] = []
+                stores.append((document, store.snapshot() if replace else store))
+
+        self._finder = DocumentFinder(search, stores, parent=self)
+        self._finder.cellsFound.connect(self.onFinderCellsFound)
+        self._finder.storeSearched.connect(self.onFinderStoreSearched)
+        self._finder.progressChanged.connect(self.onFinderProgressChanged)
+        self._finder.finished.connect(self.onFinderFinished)
+        self._finder.start()
+
+        self.updateButtons()
+
+
+    def cancelSearch(self):
+
+        if self._finder:
+            self._finder.cancel()
+            self.releaseFinder()
+
+
+    def releaseFinder(self):
+
+        self._finder.deleteLater()
+        self._finder = None
+
+        cellCount = sum(map(len, self._documentCells.values()))
+        documentCount = sum(1 for cells in self._documentCells.values() if cells)
+
+        if self._replacement is not None:
+            self.lblStatus.setText(self.tr(f'Replaced {self._replacedCount} of {cellCount} found cells in {documentCount} documents'))
+        else:
+            self.lblStatus.setText(self.tr(f'Found {cellCount} cells in {documentCount} documents'))
+
+        self.updateButtons()
+
+
+    def clearResults(self):
+
+        self._documentCells.clear()
+        self._documentItems.clear()
+        self.treeResults.clear()
+        self.lblStatus.clear()
+
+
+    def removeDocument(self, document):
+
+        # Document is about to close; its results are discarded
+        self._documentCells.pop(document, None)
+
+        item = self._documentItems.pop(document, None)
+        if item:
+            self.treeResults.takeTopLevelItem(self.treeResults.indexOfTopLevelItem(item))
+
+
+    def onFinderCellsFound(self, document, cells):
+
+        # Results of cancelled searches may arrive later
+        if self.sender() is not self._finder:
+            return
+
+        documentCells = self._documentCells.get(document)
+        if documentCells is None:
+            return
+
+        item = self._documentItems.get(document)
+        if item is None:
+            item = self._documentItems[document] = QTreeWidgetItem(self.treeResults)
+            item.setExpanded(True)
+
+        # Items are only created for the first cells of a document
+        table = document.table()
+        for row, column, value in cells[:max(self.MaximumItemCount - len(documentCells), 0)]:
+            cellItem = QTreeWidgetItem(item, [table.cellLabel(row, column), value])
+            cellItem.setData(0, Qt.UserRole, (row, column))
+
+        documentCells.extend(cells)
+
+        item.setText(0, self.tr(f'{document.documentTitle()} ({len(documentCells)})'))
+
+
+    def onFinderStoreSearched(self, document):
+
+        if self.sender() is not self._finder:
+            return
+
+        if self._replacement is None or not self._documentCells.get(document):
+            return
+
+        # All cells of a document are replaced by one edit
+        cells = [(row, column) for row, column, value in self._documentCells[document]]
+        self._replacedCount += document.table().replaceCells(cells, self._finder.search(), self._replacement)
+
+
+    def onFinderProgressChanged(self, progress):
+
+        if self.sender() is not self._finder:
+            return
+
+        self.lblStatus.setText(self.tr(f'Searching… {progress}%'))
+
+
+    def onFinderFinished(self):
+
+        # Cancelled finders have been released already; their signal may arrive while the next finder runs
+        if self.sender() is not self._finder:
+            return
+
+        self.releaseFinder()
+
+
+    def onResultItemActivated(self, item, column):
+
+        cell = item.data(0, Qt.UserRole)
+        if not cell or not item.parent():
+            return
+
+        for document, documentItem in self._documentItems.items():
+            if documentItem is item.parent():
+                self.cellActivated.emit(document, *cell)
+                return
@@ -0,0 +1,161 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from queue import Empty, Queue
+from threading import Event
+
+from PySide2.QtCore import QThread, Signal
+
+
+class DocumentSearch:
+    """
+    A text to find in cells and how the cells are compared with it.
+    """
+
+    def __init__(self, text, matchCase=False, matchEntireCell=False):
+
+        self._text = text
+        self._matchCase = matchCase
+        self._matchEntireCell = matchEntireCell
+
+        # Texts are compared without case by a pattern, which also replaces them
+        self._pattern = re.compile(re.escape(text), re.IGNORECASE) if not matchCase else None
+
+
+    def text(self):
+
+        return self._text
+
+
+    def matches(self, value):
+        """
+        Returns True if a cell with the given text is found.
+        """
+        if self._pattern is None:
+            return value == self._text if self._matchEntireCell else self._text in value
+        elif self._matchEntireCell:
+            return self._pattern.fullmatch(value) is not None
+        else:
+            return self._pattern.search(value) is not None
+
+
+    def replace(self, value, replacement):
+        """
+        Returns the text of a cell with the found text replaced.
+        """
+        if self._matchEntireCell:
+            return replacement
+        elif self._pattern is None:
+            return value.replace(self._text, replacement)
+        else:
+            return self._pattern.sub(lambda match: replacement, value)
+
+
+    def findCells(self, store, blockRowCount):
+        """
+        Yields the found cells of a store as lists of row, column and text, block by block of rows.
+        """
+        rows = store.rows()
+        matches = self.matches
+
+        for first in count(0, blockRowCount):
+            block = list(islice(rows, blockRowCount))
+            if not block:
+                return
+
+            yield [(row, column, value) for row, values in enumerate(block, first) for column, value in enumerate(values) if matches(value)]
+
+
+class DocumentFinder(QThread):
+    """
+    Searches several stores at once; the found cells of each store arrive block by block.
+    """
+    BlockRowCount = 10000
+
+    cellsFound = Signal(object, object)
+    storeSearched = Signal(object)
+    progressChanged = Signal(int)
+
+
+    def __init__(self, search, stores, workerCount=0, parent=None):
+        super().__init__(parent)
+
+        self._search = search
+        self._stores = list(stores)
+        self._workerCount = workerCount if workerCount > 0 else os.cpu_count() or 1
+
+
+    def search(self):
+
+        return self._search
+
+
+    def cancel(self):
+        """
+        Stops the search and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        if not self._stores:
+            return
+
+        results = Queue()
+        stopped = Event()
+
+        def searchStore(key, store):
+            try:
+                for cells in self._search.findCells(store, self.BlockRowCount):
+                    if stopped.is_set():
+                        return
+                    if cells:
+                        results.put((key, cells))
+            finally:
+                # The store is done, even if it has been closed meanwhile
+                results.put((key, None))
+
+        # Each store is searched by a thread of the pool; the found cells are passed on as they arrive
+        with ThreadPoolExecutor(max_workers=min(self._workerCount, len(self._stores))) as executor:
+            for key, store in self._stores:
+                executor.submit(searchStore, key, store)
+
+            remaining = len(self._stores)
+            while remaining:
+                if self.isInterruptionRequested():
+                    stopped.set()
+                    return
+
+                try:
+                    key, cells = results.get(timeout=0.1)
+                except Empty:
+                    continue
+
+                if cells is None:
+                    remaining -= 1
+                    self.storeSearched.emit(key)
+                    self.progressChanged.emit((len(self._stores) - remaining) * 100 // len(self._stores))
+                else:
+                    self.cellsFound.emit(key, cells)
@@ -0,0 +1,193 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+
+class DocumentIndexCache:
+
+    Magic = b'TBIX'
+    Version = 1
+    Suffix = '.idx'
+
+
+    def __init__(self, directory, maximumSize=1024 * 1024 * 1024):
+
+        self._directory = directory
+        self._maximumSize = maximumSize
+
+
+    def directory(self):
+
+        return self._directory
+
+
+    def setMaximumSize(self, size):
+        """
+        Sets the maximum size of the cache in bytes; zero disables the cache.
+        """
+        self._maximumSize = size
+
+
+    def maximumSize(self):
+
+        return self._maximumSize
+
+
+    def isEnabled(self):
+
+        return self._maximumSize > 0
+
+
+    def cacheFileName(self, canonicalName, status):
+        """
+        Returns the name of the cache file of a document in the given state.
+        """
+        key = f'{canonicalName}\0{status.st_size}\0{status.st_mtime_ns}'
+
+        return os.path.join(self._directory, hashlib.sha1(key.encode('utf-8', errors='surrogateescape')).hexdigest() + self.Suffix)
+
+
+    def load(self, canonicalName):
+        """
+        Returns the properties and row offsets of a document, or None if no valid entry exists.
+        """
+        if not self.isEnabled():
+            return None
+
+        try:
+            status = os.stat(canonicalName)
+            cacheFileName = self.cacheFileName(canonicalName, status)
+
+            with open(cacheFileName, 'rb') as file:
+                if file.read(len(self.Magic)) != self.Magic:
+                    return None
+
+                headerSize, = struct.unpack('<I', file.read(4))
+                header = json.loads(file.read(headerSize))
+
+                if (header.get('version') != self.Version or header.get('path') != canonicalName
+                        or header.get('size') != status.st_size or header.get('mtime') != status.st_mtime_ns
+                        or header.get('byteorder') != sys.byteorder):
+                    return None
+
+                offsets = array(header['typecode'])
+                offsets.fromfile(file, header['count'])
+
+            # Mark the entry as recently used
+            os.utime(cacheFileName)
+
+        except (OSError, ValueError, KeyError, EOFError, struct.error):
+            return None
+
+        return header['properties'], offsets
+
+
+    def store(self, canonicalName, properties, offsets):
+        """
+        Writes the properties and row offsets of a document, then evicts the least recently used entries.
+        """
+        if not self.isEnabled():
+            return False
+
+        try:
+            status = os.stat(canonicalName)
+            cacheFileName = self.cacheFileName(canonicalName, status)
+
+            header = json.dumps({
+                'version': self.Version,
+                'path': canonicalName,
+                'size': status.st_size,
+                'mtime': status.st_mtime_ns,
+                'byteorder': sys.byteorder,
+                'typecode': offsets.typecode,
+                'count': len(offsets),
+                'properties': properties,
+            }).encode('utf-8')
+
+            os.makedirs(self._directory, exist_ok=True)
+
+            # Readers never see a partially written entry
+            fd, temporaryName = tempfile.mkstemp(suffix='.tmp', dir=self._directory)
+            try:
+                with open(fd, 'wb') as file:
+                    file.write(self.Magic)
+                    file.write(struct.pack('<I', len(header)))
+                    file.write(header)
+                    offsets.tofile(file)
+                os.replace(temporaryName, cacheFileName)
+            except BaseException:
+                os.unlink(temporaryName)
+                raise
+
+        except OSError:
+            return False
+
+        self.evict()
+
+        return True
+
+
+    def evict(self, maximumSize=None):
+        """
+        Removes the least recently used entries until the cache fits its maximum size.
+        """
+        if maximumSize is None:
+            maximumSize = self._maximumSize
+
+        entries = []
+
+        try:
+            with os.scandir(self._directory) as iterator:
+                for entry in iterator:
+                    if entry.name.endswith(self.Suffix):
+                        try:
+                            status = entry.stat()
+                            entries.append((status.st_mtime_ns, status.st_size, entry.path))
+                        except FileNotFoundError:
+                            pass
+        except OSError:
+            return
+
+        totalSize = sum(size for time, size, path in entries)
+
+        for time, size, path in sorted(entries):
+            if totalSize <= maximumSize:
+                break
+
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+            totalSize -= size
+
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        self.evict(0)
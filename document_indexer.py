@@ -0,0 +1,84 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import time
+
+from PySide2.QtCore import QThread, Signal
+
+
+class DocumentIndexer(QThread):
+
+    rowsIndexed = Signal(int)
+    progressChanged = Signal(int)
+    loadFailed = Signal(str)
+
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+
+        self._store = store
+        self._indexCache = None
+        self._parseTime = 0
+
+
+    def setIndexCache(self, indexCache):
+
+        self._indexCache = indexCache
+
+
+    def cancel(self):
+        """
+        Stops the indexing and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def parseTime(self):
+        """
+        Returns the seconds the thread has spent reading the document.
+        """
+        return self._parseTime
+
+
+    def run(self):
+
+        size = len(self._store.buffer())
+        start = time.perf_counter()
+
+        try:
+            for position in self._store.buildRowIndex():
+                if self.isInterruptionRequested():
+                    return
+
+                self.rowsIndexed.emit(self._store.rowIndex().rowCount())
+                self.progressChanged.emit(position * 100 // size if size else 100)
+
+            self.rowsIndexed.emit(self._store.rowIndex().rowCount())
+
+            # Reopening the document will skip the scan
+            if self._indexCache:
+                self._indexCache.store(self._store.fileName(), self._store.indexProperties(), self._store.rowIndex().offsets())
+
+        except (OSError, ValueError) as error:
+            self.loadFailed.emit(str(error))
+
+        finally:
+            self._parseTime = time.perf_counter() - start
@@ -0,0 +1,112 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import csv
+import time
+
+from PySide2.QtCore import QThread, Signal
+
+from document_reader import DocumentReader
+
+
+class DocumentLoader(QThread):
+
+    rowsLoaded = Signal(object)
+    formatDetected = Signal(str, object)
+    progressChanged = Signal(int)
+    loadFailed = Signal(str)
+
+
+    def __init__(self, canonicalName, parent=None):
+        super().__init__(parent)
+
+        self._canonicalName = canonicalName
+        self._chunkSize = DocumentReader.ChunkSize
+        self._skipRowCount = 0
+        self._parseTime = 0
+
+
+    def setChunkSize(self, chunkSize):
+
+        self._chunkSize = chunkSize
+
+
+    def chunkSize(self):
+
+        return self._chunkSize
+
+
+    def setSkipRowCount(self, count):
+        """
+        Sets the number of leading rows which are not emitted because they have been shown already.
+        """
+        self._skipRowCount = count
+
+
+    def skipRowCount(self):
+
+        return self._skipRowCount
+
+
+    def parseTime(self):
+        """
+        Returns the seconds the thread has spent reading the document.
+        """
+        return self._parseTime
+
+
+    def cancel(self):
+        """
+        Stops the loading and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        reader = DocumentReader(self._canonicalName, self._chunkSize)
+        start = time.perf_counter()
+
+        try:
+            reader.open()
+            self.formatDetected.emit(reader.encoding(), reader.dialect())
+
+            skipRowCount = self._skipRowCount
+
+            for rows, bytesRead in reader.batches():
+                if self.isInterruptionRequested():
+                    return
+
+                if skipRowCount:
+                    skipped = min(skipRowCount, len(rows))
+                    rows = rows[skipped:]
+                    skipRowCount -= skipped
+
+                if rows:
+                    self.rowsLoaded.emit(rows)
+                self.progressChanged.emit(bytesRead * 100 // reader.fileSize() if reader.fileSize() else 100)
+
+        except (OSError, csv.Error) as error:
+            self.loadFailed.emit(str(error))
+
+        finally:
+            reader.close()
+            self._parseTime = time.perf_counter() - start
@@ -0,0 +1,386 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import codecs
+import copy
+import csv
+import mmap
+import os
+import sys
+from collections import Counter, OrderedDict
+from itertools import chain, islice
+
+from document_reader import createDialect, detectDialect, detectEncoding, dialectParameters, encodeQuoteChar
+from document_row_index import DocumentRowIndex
+
+
+class DocumentMappedStore:
+
+    RowCacheSize = 4096
+    SampleSize = 16 * 1024
+    SampleRowCount = 1000
+
+
+    def __init__(self, fileName):
+
+        self._fileName = fileName
+        self._file = None
+        self._buffer = b''
+        self._start = 0
+
+        self._encoding = 'utf-8'
+        self._dialect = csv.excel
+
+        self._rowIndex = DocumentRowIndex()
+        self._rowCount = 0
+        self._columnCount = 0
+
+        self._rowCache = OrderedDict()
+        self._edits = {}
+
+
+    def fileName(self):
+
+        return self._fileName
+
+
+    def fileDescriptor(self):
+        """
+        Returns the descriptor of the mapped file, which remains valid if the file is replaced.
+        """
+        return self._file.fileno() if self._file else -1
+
+
+    def encoding(self):
+
+        return self._encoding
+
+
+    def dialect(self):
+
+        return self._dialect
+
+
+    def buffer(self):
+
+        return self._buffer
+
+
+    def rowIndex(self):
+
+        return self._rowIndex
+
+
+    def open(self):
+        """
+        Maps the file into memory and detects its encoding and dialect.
+        """
+        self._file = open(self._fileName, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+
+        # Empty files cannot be mapped
+        if size > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        head = self._buffer[:self.SampleSize]
+
+        self._encoding = detectEncoding(head)
+        if self._encoding == 'utf-16':
+            self.close()
+            raise ValueError(f'Encoding {self._encoding} cannot be mapped')
+
+        self._dialect = detectDialect(head.decode(self._encoding, errors='ignore'))
+
+        self._start = len(codecs.BOM_UTF8) if self._encoding == 'utf-8-sig' else 0
+        self._rowIndex = DocumentRowIndex(size)
+
+
+    def close(self):
+        """
+        Unmaps and closes the file.
+        """
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+    def indexProperties(self):
+        """
+        Returns the properties detected while opening and indexing the file.
+        """
+        return {
+            'encoding': self._encoding,
+            'dialect': dialectParameters(self._dialect),
+            'columnCount': self.sampleColumnCount(),
+        }
+
+
+    def restoreIndex(self, properties, offsets):
+        """
+        Restores the properties and row offsets of a previously indexed file.
+        """
+        self._encoding = properties['encoding']
+        self._dialect = createDialect(properties['dialect'])
+
+        self._rowIndex.setOffsets(offsets)
+
+
+    def snapshot(self):
+        """
+        Returns a copy of the store which is not affected by later edits; it shares the mapped file.
+        """
+        snapshot = copy.copy(self)
+        snapshot._rowCache = OrderedDict()
+        snapshot._edits = dict(self._edits)
+
+        return snapshot
+
+
+    def buildRowIndex(self):
+        """
+        Builds the row index, yielding the number of bytes scanned so far.
+        """
+        return self._rowIndex.build(self._buffer, self._start, encodeQuoteChar(self._dialect, self._encoding))
+
+
+    def rowCount(self):
+
+        return self._rowCount
+
+
+    def setRowCount(self, count):
+        """
+        Sets the number of rows; it is limited by the number of indexed rows.
+        """
+        self._rowCount = min(count, self._rowIndex.rowCount())
+
+
+    def columnCount(self):
+
+        return self._columnCount
+
+
+    def setColumnCount(self, count):
+
+        self._columnCount = count
+
+
+    def sampleColumnCount(self):
+        """
+        Returns the largest number of cells within the first indexed rows.
+        """
+        rowCount = min(self._rowIndex.rowCount(), self.SampleRowCount)
+
+        # The row cache is bypassed; the indexer samples the rows while the table reads them
+        return max((len(self.decodeRow(row)) for row in range(rowCount)), default=0)
+
+
+    def row(self, row):
+        """
+        Returns the cells of a row, decoding it on first access.
+        """
+        values = self._edits.get(row)
+        if values is not None:
+            return values
+
+        values = self._rowCache.get(row)
+        if values is not None:
+            self._rowCache.move_to_end(row)
+            return values
+
+        values = self.decodeRow(row)
+
+        self._rowCache[row] = values
+        if len(self._rowCache) > self.RowCacheSize:
+            self._rowCache.popitem(last=False)
+
+        return values
+
+
+    def decodeRow(self, row):
+        """
+        Returns the cells of a row as stored in the file.
+        """
+        start, end = self._rowIndex.rowRange(row)
+        text = self._buffer[start:end].decode(self._encoding, errors='replace')
+
+        return next(csv.reader((text,), self._dialect), [])
+
+
+    def rows(self):
+        """
+        Yields the rows as sequences of texts; the row cache is bypassed.
+        """
+        edits = self._edits
+
+        for row in range(self._rowCount):
+            values = edits.get(row)
+            yield values if values is not None else self.decodeRow(row)
+
+
+    def dirtyRowRanges(self):
+        """
+        Returns the ranges of edited rows as sorted pairs of the first row and the row after the last.
+        """
+        ranges = []
+
+        for row in sorted(row for row in self._edits if row < self._rowCount):
+            if ranges and ranges[-1][1] == row:
+                ranges[-1][1] = row + 1
+            else:
+                ranges.append([row, row + 1])
+
+        return [(first, last) for first, last in ranges]
+
+
+    def patchSegments(self):
+        """
+        Yields the parts of the file with its edits applied, in order, as triples of a byte range of the
+        mapped file and either None if the bytes are unchanged or the rows which replace them.
+        """
+        if not self._rowCount:
+            return
+
+        position = 0
+
+        for first, last in self.dirtyRowRanges():
+            start = self._rowIndex.rowRange(first)[0]
+            end = self._rowIndex.rowRange(last - 1)[1]
+
+            if start > position:
+                yield position, start, None
+            yield start, end, [self._edits[row] for row in range(first, last)]
+
+            position = end
+
+        end = self._rowIndex.rowRange(self._rowCount - 1)[1]
+        if end > position:
+            yield position, end, None
+
+
+    def value(self, row, column):
+        """
+        Returns the text of a cell.
+        """
+        values = self.row(row)
+
+        return values[column] if column < len(values) else ''
+
+
+    def columnValues(self, column, first, count):
+        """
+        Returns the texts of a range of cells of a column.
+        """
+        return [self.value(row, column) for row in range(first, first + count)]
+
+
+    def setColumnValues(self, column, first, values):
+        """
+        Sets the texts of a range of cells of a column from a list.
+        """
+        for row, value in enumerate(values, first):
+            self.setValue(row, column, value)
+
+
+    def sortKeys(self, column):
+        """
+        Returns the texts of a column as keys which sort it; the row cache is bypassed.
+        """
+        return [values[column] if column < len(values) else '' for values in self.rows()]
+
+
+    def columnType(self, column):
+        """
+        Returns the name of the type of a column; cells of mapped files are texts.
+        """
+        return 'text'
+
+
+    def indexKeys(self, column):
+        """
+        Returns the texts of a column as keys of the rows for an index.
+        """
+        return self.sortKeys(column)
+
+
+    def indexKey(self, column, value):
+
+        return value
+
+
+    def findRows(self, column, value):
+        """
+        Returns the rows of the cells of a column with the given text.
+        """
+        return [row for row in range(self._rowCount) if self.value(row, column) == value]
+
+
+    def valueCounts(self, column):
+        """
+        Returns the number of cells of a column for each text.
+        """
+        return Counter(self.value(row, column) for row in range(self._rowCount))
+
+
+    def memorySize(self):
+        """
+        Returns an estimate of the bytes of the row index, the cached rows and the edited rows; the mapped file is not counted.
+        """
+        rowCount = len(self._rowCache) + len(self._edits)
+        sample = list(islice(chain(self._rowCache.values(), self._edits.values()), self.SampleRowCount))
+        rowSize = sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in sample) * rowCount // len(sample) if sample else 0
+
+        return sys.getsizeof(self._rowIndex.offsets()) + rowSize
+
+
+    def unload(self):
+        """
+        Releases the cached rows; the row index and the edited rows are kept.
+        """
+        self._rowCache.clear()
+
+
+    def restore(self):
+        """
+        Does nothing; released rows are decoded again when they are accessed.
+        """
+        pass
+
+
+    def isUnloaded(self):
+
+        return False
+
+
+    def setValue(self, row, column, value):
+        """
+        Sets the text of a cell; edited rows are kept in memory.
+        """
+        values = list(self.row(row))
+        if column >= len(values):
+            values.extend([''] * (column - len(values) + 1))
+        values[column] = value
+
+        self._edits[row] = values
+        self._rowCache.pop(row, None)
@@ -0,0 +1,84 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import csv
+import time
+
+from PySide2.QtCore import QThread, Signal
+
+from document_parallel_reader import DocumentParallelReader
+
+
+class DocumentParallelLoader(QThread):
+
+    columnsLoaded = Signal(object)
+    formatDetected = Signal(str, object)
+    progressChanged = Signal(int)
+    loadFailed = Signal(str)
+
+
+    def __init__(self, canonicalName, workerCount=0, parent=None):
+        super().__init__(parent)
+
+        self._canonicalName = canonicalName
+        self._workerCount = workerCount
+        self._parseTime = 0
+
+
+    def cancel(self):
+        """
+        Stops the loading and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def parseTime(self):
+        """
+        Returns the seconds the thread has spent reading the document.
+        """
+        return self._parseTime
+
+
+    def run(self):
+
+        reader = DocumentParallelReader(self._canonicalName, self._workerCount)
+        start = time.perf_counter()
+
+        try:
+            reader.open()
+            self.formatDetected.emit(reader.encoding(), reader.dialect())
+
+            # Ranges are parsed by a pool of processes; their cells arrive in the order of the file
+            batches = reader.batches()
+            for columns, rowCount, bytesRead in batches:
+                if self.isInterruptionRequested():
+                    batches.close()
+                    return
+
+                self.columnsLoaded.emit(columns)
+                self.progressChanged.emit(bytesRead * 100 // reader.fileSize() if reader.fileSize() else 100)
+
+        except (OSError, ValueError, csv.Error) as error:
+            self.loadFailed.emit(str(error))
+
+        finally:
+            reader.close()
+            self._parseTime = time.perf_counter() - start
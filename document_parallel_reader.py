@@ -0,0 +1,221 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import codecs
+import csv
+import io
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
+
+from document_reader import createDialect, detectDialect, detectEncoding, dialectParameters, encodeQuoteChar
+
+
+def countQuotes(buffer, start, end, quote, chunkSize=16 * 1024 * 1024):
+    """
+    Returns the number of quote characters within a range of the buffer.
+    """
+    count = 0
+
+    for position in range(start, end, chunkSize):
+        count += buffer[position:min(position + chunkSize, end)].count(quote)
+
+    return count
+
+
+def findRowBoundaries(buffer, start, rangeCount, quote=b'"'):
+    """
+    Returns the offsets which split the buffer into about the given number of ranges of whole rows.
+
+    A line break ends a row if it is preceded by an even number of quote characters.
+    """
+    size = len(buffer)
+    boundaries = [start]
+
+    position = start
+    inQuote = False
+
+    for index in range(1, rangeCount):
+        target = start + (size - start) * index // rangeCount
+        if target > position:
+            inQuote ^= countQuotes(buffer, position, target, quote) & 1
+            position = target
+
+        # Move behind the next line break outside of quoted fields
+        while position < size:
+            lineEnd = buffer.find(b'\n', position)
+            if lineEnd < 0:
+                position = size
+                break
+
+            inQuote ^= countQuotes(buffer, position, lineEnd, quote) & 1
+            position = lineEnd + 1
+            if not inQuote:
+                break
+
+        if position >= size:
+            break
+
+        boundaries.append(position)
+
+    boundaries.append(size)
+
+    return boundaries
+
+
+def parseRange(fileName, start, end, encoding, parameters):
+    """
+    Parses a range of whole rows of a file; returns the number of rows and the cells column by column.
+
+    The function runs in a worker process.
+    """
+    with open(fileName, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    text = data.decode(encoding, errors='replace')
+    rows = list(csv.reader(io.StringIO(text, newline=''), createDialect(parameters)))
+
+    return len(rows), [list(column) for column in zip_longest(*rows, fillvalue='')]
+
+
+class DocumentParallelReader:
+
+    MinimumSize = 32 * 1024 * 1024
+    RangeSize = 16 * 1024 * 1024
+    SampleSize = 16 * 1024
+
+
+    def __init__(self, fileName, workerCount=0):
+
+        self._fileName = fileName
+        self._workerCount = workerCount if workerCount > 0 else os.cpu_count() or 1
+
+        self._file = None
+        self._buffer = b''
+        self._start = 0
+        self._boundaries = []
+
+        self._encoding = 'utf-8'
+        self._dialect = csv.excel
+
+
+    def fileName(self):
+
+        return self._fileName
+
+
+    def fileSize(self):
+
+        return len(self._buffer)
+
+
+    def workerCount(self):
+
+        return self._workerCount
+
+
+    def encoding(self):
+
+        return self._encoding
+
+
+    def dialect(self):
+
+        return self._dialect
+
+
+    @classmethod
+    def canSplit(cls, fileName):
+        """
+        Returns whether the encoding of a file allows splitting it into ranges of rows.
+        """
+        with open(fileName, 'rb') as file:
+            head = file.read(cls.SampleSize)
+
+        return detectEncoding(head) != 'utf-16'
+
+
+    def open(self):
+        """
+        Opens the file, detects its encoding and dialect and splits it into ranges of whole rows.
+        """
+        self._file = open(self._fileName, 'rb')
+        if os.fstat(self._file.fileno()).st_size > 0:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        head = self._buffer[:self.SampleSize]
+
+        self._encoding = detectEncoding(head)
+        if self._encoding == 'utf-16':
+            self.close()
+            raise ValueError(f'Encoding {self._encoding} cannot be split')
+
+        self._dialect = detectDialect(head.decode(self._encoding, errors='ignore'))
+
+        # The byte order mark only precedes the first range; the encoding is kept for saving
+        if self._encoding == 'utf-8-sig':
+            self._start = len(codecs.BOM_UTF8)
+
+        # Several ranges per worker balance the load and let the first rows arrive early
+        rangeCount = max(self._workerCount * 4, len(self._buffer) // self.RangeSize, 1)
+        self._boundaries = findRowBoundaries(self._buffer, self._start, rangeCount, encodeQuoteChar(self._dialect, self._encoding))
+
+
+    def close(self):
+        """
+        Unmaps and closes the file.
+        """
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+    def ranges(self):
+
+        return list(zip(self._boundaries, self._boundaries[1:]))
+
+
+    def batches(self):
+        """
+        Yields the cells of each range column by column in the order of the file, together with the
+        number of rows and the number of bytes read so far.
+        """
+        ranges = self.ranges()
+        parameters = dialectParameters(self._dialect)
+
+        # Worker processes are started fresh; forking a process running Qt threads is unsafe
+        executor = ProcessPoolExecutor(max_workers=min(self._workerCount, max(len(ranges), 1)), mp_context=multiprocessing.get_context('spawn'))
+
+        try:
+            futures = [executor.submit(parseRange, self._fileName, start, end, self._encoding, parameters) for start, end in ranges]
+
+            for (start, end), future in zip(ranges, futures):
+                rowCount, columns = future.result()
+                yield columns, rowCount, end
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,219 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+import csv
+import glob
+import os
+import sys
+
+from PySide2.QtCore import QThread, Signal
+
+from document_mapped_store import DocumentMappedStore
+from document_reader import DocumentReader
+
+
+def isOnBattery():
+    """
+    Returns whether the machine runs on battery power; False if it cannot be determined.
+    """
+    if sys.platform == 'win32':
+        import ctypes
+
+        class SystemPowerStatus(ctypes.Structure):
+            _fields_ = [('ACLineStatus', ctypes.c_ubyte), ('BatteryFlag', ctypes.c_ubyte), ('BatteryLifePercent', ctypes.c_ubyte),
+                        ('SystemStatusFlag', ctypes.c_ubyte), ('BatteryLifeTime', ctypes.c_ulong), ('BatteryFullLifeTime', ctypes.c_ulong)]
+
+        status = SystemPowerStatus()
+        if not ctypes.windll.kernel32.GetSystemPowerStatus(ctypes.byref(status)):
+            return False
+
+        return status.ACLineStatus == 0
+
+    # Linux reports each power supply in the sysfs
+    discharging = False
+    for directory in glob.glob('/sys/class/power_supply/*'):
+        try:
+            with open(os.path.join(directory, 'type')) as file:
+                supplyType = file.read().strip()
+
+            if supplyType == 'Mains':
+                with open(os.path.join(directory, 'online')) as file:
+                    if file.read().strip() == '1':
+                        return False
+            elif supplyType == 'Battery':
+                with open(os.path.join(directory, 'status')) as file:
+                    discharging = discharging or file.read().strip() == 'Discharging'
+        except OSError:
+            continue
+
+    return discharging
+
+
+class DocumentPrefetch:
+    """
+    What has been read ahead of a document: its format, its leading rows and its row index.
+    """
+
+    def __init__(self, canonicalName, status):
+
+        self._canonicalName = canonicalName
+        self._size = status.st_size
+        self._mtime = status.st_mtime_ns
+
+        self._encoding = 'utf-8'
+        self._dialect = csv.excel
+        self._rows = []
+        self._index = None
+
+
+    def canonicalName(self):
+
+        return self._canonicalName
+
+
+    def isCurrent(self):
+        """
+        Returns whether the file is still as it was read ahead.
+        """
+        try:
+            status = os.stat(self._canonicalName)
+        except OSError:
+            return False
+
+        return status.st_size == self._size and status.st_mtime_ns == self._mtime
+
+
+    def setFormat(self, encoding, dialect):
+
+        self._encoding = encoding
+        self._dialect = dialect
+
+
+    def encoding(self):
+
+        return self._encoding
+
+
+    def dialect(self):
+
+        return self._dialect
+
+
+    def setRows(self, rows):
+
+        self._rows = rows
+
+
+    def rows(self):
+        """
+        Returns the leading rows of the document.
+        """
+        return self._rows
+
+
+    def setIndex(self, properties, offsets):
+
+        self._index = (properties, offsets)
+
+
+    def index(self):
+        """
+        Returns the properties and row offsets of a large document, or None.
+        """
+        return self._index
+
+
+class DocumentPrefetcher(QThread):
+    """
+    Reads ahead documents which are likely opened next, one after another; stops when the machine runs on battery.
+    """
+
+    documentPrefetched = Signal(str, object)
+
+
+    def __init__(self, canonicalNames, indexCache, minimumMappedSize, parent=None):
+        super().__init__(parent)
+
+        self._canonicalNames = list(canonicalNames)
+        self._indexCache = indexCache
+        self._minimumMappedSize = minimumMappedSize
+
+
+    def cancel(self):
+        """
+        Stops the reading ahead and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        for canonicalName in self._canonicalNames:
+            if self.isInterruptionRequested() or isOnBattery():
+                return
+
+            try:
+                prefetch = self.prefetch(canonicalName)
+            except (OSError, ValueError, csv.Error):
+                continue
+
+            if prefetch and not self.isInterruptionRequested():
+                self.documentPrefetched.emit(canonicalName, prefetch)
+
+
+    def prefetch(self, canonicalName):
+
+        status = os.stat(canonicalName)
+        prefetch = DocumentPrefetch(canonicalName, status)
+
+        if status.st_size < self._minimumMappedSize:
+            # The leading rows are shown while the rest is loaded
+            reader = DocumentReader(canonicalName)
+            try:
+                reader.open()
+                prefetch.setFormat(reader.encoding(), reader.dialect())
+                prefetch.setRows(reader.previewRows())
+            finally:
+                reader.close()
+
+            return prefetch
+
+        # Large documents are shown as soon as their rows are indexed
+        cached = self._indexCache.load(canonicalName) if self._indexCache else None
+        if cached:
+            prefetch.setIndex(*cached)
+            return prefetch
+
+        store = DocumentMappedStore(canonicalName)
+        store.open()
+        try:
+            for position in store.buildRowIndex():
+                if self.isInterruptionRequested():
+                    return None
+
+            prefetch.setFormat(store.encoding(), store.dialect())
+            prefetch.setIndex(store.indexProperties(), store.rowIndex().offsets())
+        finally:
+            store.close()
+
+        if self._indexCache:
+            self._indexCache.store(canonicalName, *prefetch.index())
+
+        return prefetch
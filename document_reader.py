@@ -0,0 +1,238 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import codecs
+import csv
+import os
+
+
+def detectEncoding(head):
+    """
+    Returns the name of the encoding of the given leading bytes of a file.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as error:
+        # A multibyte sequence cut off at the end of the sample is not an error
+        if error.start < len(head) - 3:
+            return 'latin-1'
+
+    return 'utf-8'
+
+
+def detectDialect(sample):
+    """
+    Returns the dialect of the given leading text of a file.
+    """
+    lineTerminator = '\r\n' if '\r\n' in sample or '\n' not in sample else '\n'
+
+    # Only complete lines are taken into account
+    lineEnd = sample.rfind('\n')
+    if lineEnd > 0:
+        sample = sample[:lineEnd]
+
+    try:
+        sniffed = csv.Sniffer().sniff(sample, delimiters=',;\t|')
+    except csv.Error:
+        sniffed = csv.excel
+
+    # The sniffer is unreliable about the quoting details; keep them as in RFC 4180
+    parameters = dialectParameters(sniffed)
+    parameters['lineterminator'] = lineTerminator
+
+    return createDialect(parameters)
+
+
+def dialectParameters(dialect):
+    """
+    Returns the parameters of a dialect which differ between documents.
+    """
+    return {
+        'delimiter': dialect.delimiter,
+        'quotechar': dialect.quotechar or '"',
+        'skipinitialspace': bool(dialect.skipinitialspace),
+        'lineterminator': dialect.lineterminator,
+    }
+
+
+def createDialect(parameters):
+    """
+    Returns a dialect with the given parameters, otherwise as in RFC 4180.
+    """
+    return type('DocumentDialect', (csv.excel,), dict(parameters))
+
+
+def encodeQuoteChar(dialect, encoding):
+    """
+    Returns the quote character of a dialect as bytes of the given encoding, without a byte order mark.
+    """
+    return dialect.quotechar.encode('utf-8' if encoding == 'utf-8-sig' else encoding)
+
+
+class DocumentReader:
+
+    ChunkSize = 256 * 1024
+    SampleSize = 16 * 1024
+
+
+    def __init__(self, fileName, chunkSize=ChunkSize):
+
+        self._fileName = fileName
+        self._chunkSize = chunkSize
+
+        self._file = None
+        self._fileSize = 0
+        self._bytesRead = 0
+
+        self._encoding = 'utf-8'
+        self._dialect = csv.excel
+
+
+    def fileName(self):
+
+        return self._fileName
+
+
+    def fileSize(self):
+
+        return self._fileSize
+
+
+    def bytesRead(self):
+
+        return self._bytesRead
+
+
+    def encoding(self):
+
+        return self._encoding
+
+
+    def dialect(self):
+
+        return self._dialect
+
+
+    def open(self):
+        """
+        Opens the file and detects its encoding and dialect.
+        """
+        self._file = open(self._fileName, 'rb')
+        self._fileSize = os.fstat(self._file.fileno()).st_size
+        self._bytesRead = 0
+
+        head = self._file.read(self.SampleSize)
+        self._file.seek(0)
+
+        self._encoding = detectEncoding(head)
+        self._dialect = detectDialect(head.decode(self._encoding, errors='ignore'))
+
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+    def previewRows(self):
+        """
+        Returns the complete rows within the leading sample of the file, parsed as by the batches.
+        """
+        position = self._file.tell()
+        self._file.seek(0)
+        head = self._file.read(self.SampleSize)
+        self._file.seek(position)
+
+        isComplete = len(head) >= self._fileSize
+        text = codecs.getincrementaldecoder(self._encoding)(errors='replace').decode(head, final=isComplete)
+
+        # Lines are split as by the batches; an incomplete last line is left out
+        lines = text.split('\n')
+        remainder = lines.pop()
+        lines = [line + '\n' for line in lines]
+        if isComplete and remainder:
+            lines.append(remainder)
+
+        rows = []
+        try:
+            rows.extend(csv.reader(lines, self._dialect))
+        except csv.Error:
+            pass
+
+        # The last row may continue beyond the sample
+        if not isComplete and rows:
+            rows.pop()
+
+        return rows
+
+
+    def lines(self):
+        """
+        Yields the decoded lines of the file, reading it in fixed-size chunks.
+        """
+        decoder = codecs.getincrementaldecoder(self._encoding)(errors='replace')
+        remainder = ''
+
+        while True:
+            chunk = self._file.read(self._chunkSize)
+            self._bytesRead += len(chunk)
+
+            text = remainder + decoder.decode(chunk, final=not chunk)
+            if not chunk:
+                if text:
+                    yield text
+                return
+
+            # Keep the incomplete last line for the next chunk
+            lines = text.split('\n')
+            remainder = lines.pop()
+
+            for line in lines:
+                yield line + '\n'
+
+
+    def batches(self):
+        """
+        Yields the parsed rows of each chunk of the file, together with the number of bytes read so far.
+        """
+        rows = []
+        bytesRead = 0
+
+        # Quoted fields may span lines and chunks; the reader keeps its state across them
+        for row in csv.reader(self.lines(), self._dialect):
+
+            if self._bytesRead != bytesRead:
+                if rows:
+                    yield rows, bytesRead
+                    rows = []
+                bytesRead = self._bytesRead
+
+            rows.append(row)
+
+        if rows:
+            yield rows, self._bytesRead
@@ -0,0 +1,102 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+from PySide2.QtCore import QFileInfo
+
+
+class DocumentRegistry:
+    """
+    Finds open documents by their canonical name and numbers documents with the same file name in constant time.
+    """
+
+    def __init__(self):
+
+        self._names = {}
+        self._canonicalNames = {}
+        self._fileNames = {}
+        self._highestIndexes = {}
+
+
+    def __len__(self):
+
+        return len(self._names)
+
+
+    def __contains__(self, document):
+
+        return document in self._names
+
+
+    def addDocument(self, document):
+        """
+        Registers a document under its current canonical name and index.
+        """
+        self.removeDocument(document)
+
+        canonicalName = document.canonicalName() or ''
+        fileName = QFileInfo(canonicalName).fileName()
+        canonicalIndex = document.canonicalIndex()
+
+        self._names[document] = (canonicalName, fileName)
+
+        # Dictionaries keep the documents in the order they were registered
+        self._canonicalNames.setdefault(canonicalName, {})[document] = None
+        self._fileNames.setdefault(fileName, {})[document] = canonicalIndex
+        self._highestIndexes[fileName] = max(self._highestIndexes.get(fileName, 0), canonicalIndex)
+
+
+    def removeDocument(self, document):
+        """
+        Unregisters a document; unknown documents are ignored.
+        """
+        names = self._names.pop(document, None)
+        if names is None:
+            return
+
+        canonicalName, fileName = names
+
+        documents = self._canonicalNames[canonicalName]
+        del documents[document]
+        if not documents:
+            del self._canonicalNames[canonicalName]
+
+        indexes = self._fileNames[fileName]
+        canonicalIndex = indexes.pop(document)
+        if not indexes:
+            del self._fileNames[fileName]
+            del self._highestIndexes[fileName]
+        elif canonicalIndex == self._highestIndexes[fileName]:
+            # Only closing the document with the highest index looks at the others
+            self._highestIndexes[fileName] = max(indexes.values())
+
+
+    def findDocument(self, canonicalName):
+        """
+        Returns the first registered document with the given canonical name, or None.
+        """
+        documents = self._canonicalNames.get(canonicalName or '')
+
+        return next(iter(documents)) if documents else None
+
+
+    def nextCanonicalIndex(self, canonicalName):
+        """
+        Returns the index of a new document which follows the indexes of the documents with the same file name.
+        """
+        return self._highestIndexes.get(QFileInfo(canonicalName or '').fileName(), 0) + 1
@@ -0,0 +1,115 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from array import array
+from itertools import accumulate, islice
+
+
+class DocumentRowIndex:
+
+    ChunkSize = 16 * 1024 * 1024
+
+
+    def __init__(self, size=0):
+
+        # Four bytes per row are enough unless the file exceeds 4 GiB
+        self._offsets = array('I' if size < 2**32 else 'Q')
+        self._complete = False
+
+
+    def offsets(self):
+
+        return self._offsets
+
+
+    def setOffsets(self, offsets):
+        """
+        Sets the offsets of a completely scanned buffer.
+        """
+        self._offsets = offsets
+        self._complete = True
+
+
+    def isComplete(self):
+
+        return self._complete
+
+
+    def rowCount(self):
+        """
+        Returns the number of rows whose start and end offsets are known.
+        """
+        return max(len(self._offsets) - 1, 0)
+
+
+    def rowRange(self, row):
+        """
+        Returns the start and end offsets of a row, the end including the line break.
+        """
+        return self._offsets[row], self._offsets[row+1]
+
+
+    def build(self, buffer, start=0, quote=b'"', chunkSize=ChunkSize):
+        """
+        Scans the buffer for row boundaries chunk by chunk, yielding the number of bytes scanned so far.
+
+        Line breaks within quoted fields are skipped by tracking the parity of the quote characters.
+        """
+        offsets = self._offsets
+        offsets.append(start)
+
+        size = len(buffer)
+        position = start
+        inQuote = False
+
+        while position < size:
+
+            # Chunks end after a line break
+            end = min(position + chunkSize, size)
+            if end < size:
+                lineEnd = buffer.rfind(b'\n', position, end)
+                if lineEnd < 0:
+                    lineEnd = buffer.find(b'\n', end)
+                end = lineEnd + 1 if lineEnd >= 0 else size
+
+            chunk = buffer[position:end]
+            lines = chunk.split(b'\n')
+            del lines[-1]
+
+            if not inQuote and quote not in chunk:
+                # Every line break is a row boundary
+                offsets.extend(islice(accumulate(map((1).__add__, map(len, lines)), initial=position), 1, None))
+            else:
+                offset = position
+                for line in lines:
+                    if line.count(quote) & 1:
+                        inQuote = not inQuote
+                    offset += len(line) + 1
+                    if not inQuote:
+                        offsets.append(offset)
+
+            position = end
+            yield position
+
+        # The last row has no line break
+        if offsets[-1] < size:
+            offsets.append(size)
+
+        self._complete = True
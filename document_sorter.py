@@ -0,0 +1,88 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from array import array
+
+from PySide2.QtCore import QThread, Qt, Signal
+
+
+class DocumentSorter(QThread):
+
+    progressChanged = Signal(int)
+    rowsSorted = Signal(object, object, object)
+
+
+    def __init__(self, store, rowCount, sortOrder, sortKeys, parent=None):
+        super().__init__(parent)
+
+        self._store = store
+        self._rowCount = rowCount
+        self._sortOrder = sortOrder
+
+        # Keys of columns computed for earlier sorts
+        self._sortKeys = dict(sortKeys)
+
+
+    def sortOrder(self):
+
+        return self._sortOrder
+
+
+    def cancel(self):
+        """
+        Stops the sorting and waits until the thread has finished.
+
+        The interruption is checked between the keys; sorting the rows by one key or computing its sort keys is not interrupted.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        steps = len(self._sortOrder) * 2 + 1
+        keys = {}
+
+        for step, (column, order) in enumerate(self._sortOrder, 1):
+            if self.isInterruptionRequested():
+                return
+
+            if column not in self._sortKeys:
+                keys[column] = self._sortKeys[column] = self._store.sortKeys(column)
+
+            self.progressChanged.emit(step * 100 // steps)
+
+        # Stable sorts from the last key to the first one sort by all keys
+        permutation = list(range(self._rowCount))
+
+        for step, (column, order) in enumerate(reversed(self._sortOrder), len(self._sortOrder) + 1):
+            if self.isInterruptionRequested():
+                return
+
+            permutation.sort(key=self._sortKeys[column].__getitem__, reverse=order == Qt.DescendingOrder)
+
+            self.progressChanged.emit(step * 100 // steps)
+
+        if self.isInterruptionRequested():
+            return
+
+        inverse = array('q', sorted(range(self._rowCount), key=permutation.__getitem__))
+
+        self.rowsSorted.emit(array('q', permutation), inverse, keys)
@@ -18,19 +18,32 @@
 # along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
 #
 
-from PySide2.QtCore import QFileInfo, Qt
-from PySide2.QtGui import QIcon
-from PySide2.QtWidgets import QAction, QDialog, QMenu, QTableWidget, QTableWidgetItem
+import time
 
+from PySide2.QtCore import QFileInfo, Qt, Signal
+from PySide2.QtGui import QIcon, QKeySequence
+from PySide2.QtWidgets import QAbstractItemView, QAction, QDialog, QInputDialog, QMenu, QTableView
+
+from document_column_indexer import DocumentColumnIndexer
+from document_column_store import DocumentColumnStore
+from document_table_deltas import DocumentTableCellsDelta, DocumentTableGroupDelta, DocumentTableHeaderLabelDelta, DocumentTableHeaderLabelsDelta, DocumentTableInsertColumnsDelta, DocumentTableRemoveColumnsDelta
 from document_table_header_dialog import DocumentTableHeaderDialog
+from document_table_header_labels import DocumentTableHeaderLabels
+from document_table_model import DocumentTableModel
+from document_table_proxy_model import DocumentTableProxyModel
+from document_undo_stack import DocumentUndoStack
+from performance_metrics import PerformanceMetricsScope
 from preferences import Preferences
 
 
-class DocumentTable(QTableWidget):
+class DocumentTable(QTableView):
 
     _preferences = Preferences()
+    _metrics = PerformanceMetricsScope()
     sequenceNumber = 0
 
+    filterFailed = Signal(str)
+
 
     def __init__(self, parent=None):
         super(DocumentTable, self).__init__(parent)
@@ -40,10 +53,49 @@ class DocumentTable(QTableWidget):
         self.m_url = ""
         self.isUntitled = True
 
+        # The view only asks the model for the cells within the viewport
+        self._model = DocumentTableModel(self)
+        self._model.setHeaderLabelText(self.headerItemText)
+
+        # Sorted rows are shown through a permutation; the cells are not moved
+        self._proxyModel = DocumentTableProxyModel(self)
+        self._proxyModel.setSourceModel(self._model)
+        self._proxyModel.sortOrderChanged.connect(self.updateSortIndicator)
+        self._proxyModel.sortProgressChanged.connect(self.onProxySortProgressChanged)
+        self._sortStartTime = None
+        self.setModel(self._proxyModel)
+
+        # Edits are recorded as differences
+        self._undoStack = DocumentUndoStack(self)
+        self._model.setUndoStack(self._undoStack)
+
+        # Indexes of columns answer filters; they are built in the background and follow the edits of cells
+        self._columnIndexes = {}
+        self._columnIndexer = None
+        self._staleColumns = set()
+        self._pendingFilter = None
+        self._filterStartTime = None
+
+        # Columns whose indexes were released when the cells were unloaded
+        self._unloadedColumns = []
+
+        # Columns to index once the rows of the document have been loaded
+        self._deferredColumns = None
+
+        self._model.dataChanged.connect(self.onModelDataChanged)
+        self._model.rowsInserted.connect(self.onModelStructureChanged)
+        self._model.rowsRemoved.connect(self.onModelStructureChanged)
+        self._model.columnsInserted.connect(self.onModelStructureChanged)
+        self._model.columnsRemoved.connect(self.onModelStructureChanged)
+        self._model.modelReset.connect(self.onModelStructureChanged)
+
         # Creates a default document
         self.setColumnCount(self._preferences.defaultCellCountColumn())
         self.setRowCount(self._preferences.defaultCellCountRow())
 
+        self.setHorizontalHeaderItems(self._preferences.defaultHeaderLabelHorizontal())
+        self.setVerticalHeaderItems(self._preferences.defaultHeaderLabelVertical())
+
         # Enable context menus
         hHeaderView = self.horizontalHeader()
         hHeaderView.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -61,6 +113,13 @@ class DocumentTable(QTableWidget):
         self._preferences = preferences
 
 
+    def setMetrics(self, metrics):
+        """
+        Sets the metrics which record the timings of the document.
+        """
+        self._metrics = metrics
+
+
     def newDocument(self):
         """
         Creates a new document.
@@ -98,6 +157,62 @@ class DocumentTable(QTableWidget):
         return True
 
 
+    def setStore(self, store):
+        """
+        Sets the store which holds the cells of the document.
+        """
+        self._model.setStore(store)
+
+
+    def store(self):
+        """
+        Returns the store which holds the cells of the document.
+        """
+        return self._model.store()
+
+
+    def undoStack(self):
+        """
+        Returns the stack which records the edits of the document.
+        """
+        return self._undoStack
+
+
+    def proxyModel(self):
+        """
+        Returns the model which shows the rows in their sorted order.
+        """
+        return self._proxyModel
+
+
+    def rowCount(self):
+        """
+        Returns the number of rows.
+        """
+        return self._model.rowCount()
+
+
+    def setRowCount(self, count):
+        """
+        Sets the number of rows.
+        """
+        self._model.setRowCount(count)
+
+
+    def columnCount(self):
+        """
+        Returns the number of columns.
+        """
+        return self._model.columnCount()
+
+
+    def setColumnCount(self, count):
+        """
+        Sets the number of columns.
+        """
+        self._model.setColumnCount(count)
+
+
     def documentPath(self):
         """
         Returns the canonical path of the document.
@@ -112,21 +227,28 @@ class DocumentTable(QTableWidget):
         return QFileInfo(self.m_url).fileName()
 
 
-    def setHorizontalHeaderItems(self, type):
+    def appendRows(self, rows):
         """
-        Sets the horizontal header items.
+        Appends rows to the document.
         """
-        parameter = self.headerItemDefaultParameter(type)
+        self._model.appendRows(rows)
 
-        for column in range(0, self.columnCount()):
 
-            number = column
+    def appendRowsFromColumns(self, columns):
+        """
+        Appends rows given column by column to the document.
+        """
+        self._model.appendRowsFromColumns(columns)
 
-            item = QTableWidgetItem()
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setText(self.headerItemText(number, type, parameter))
 
-            self.setHorizontalHeaderItem(column, item)
+    def setHorizontalHeaderItems(self, type):
+        """
+        Sets the horizontal header items.
+        """
+        parameter = self.headerItemDefaultParameter(type)
+
+        # Default labels are not an edit of the document
+        self._model.setHeaderLabel(Qt.Horizontal, type, parameter)
 
 
     def setVerticalHeaderItems(self, type):
@@ -135,35 +257,23 @@ class DocumentTable(QTableWidget):
         """
         parameter = self.headerItemDefaultParameter(type)
 
-        for row in range(0, self.rowCount()):
-
-            number = row
-
-            item = QTableWidgetItem()
-            item.setTextAlignment(Qt.AlignCenter)
-            item.setText(self.headerItemText(number, type, parameter))
-
-            self.setVerticalHeaderItem(row, item)
+        # Default labels are not an edit of the document
+        self._model.setHeaderLabel(Qt.Vertical, type, parameter)
 
 
     def headerItemText(self, number, type, parameter):
         """
         Returns the header item text.
         """
-        if type == Preferences.HeaderLabel.Custom:
-            return self.numberToCustom(number, parameter)
-        elif type == Preferences.HeaderLabel.Binary:
-            return self.numberToBinary(number, parameter)
-        elif type == Preferences.HeaderLabel.Octal:
-            return self.numberToOctal(number, parameter)
-        elif type == Preferences.HeaderLabel.Decimal:
-            return self.numberToDecimal(number, parameter)
-        elif type == Preferences.HeaderLabel.Hexadecimal:
-            return self.numberToHexadecimal(number, parameter)
-        elif type == Preferences.HeaderLabel.Letter:
-            return self.numberToLetter(number, parameter)
-        else:
-            return ''
+        # Labels are generated block by block and shared by all documents
+        return DocumentTableHeaderLabels.text(number, type, parameter)
+
+
+    def headerItemTexts(self, first, count, type, parameter):
+        """
+        Returns the header item texts of a range of numbers.
+        """
+        return DocumentTableHeaderLabels.texts(first, count, type, parameter)
 
 
     def headerItemDefaultParameter(self, type):
@@ -284,8 +394,103 @@ class DocumentTable(QTableWidget):
         menuLabel.addAction(actionLabelNumbers)
         menuLabel.addAction(actionLabelCustoms)
 
+        # Sort
+        actionSortAscending = QAction('Ascending', self)
+        actionSortAscending.setStatusTip('Sort rows by this column in ascending order')
+        actionSortAscending.setToolTip('Sort rows by this column in ascending order')
+        actionSortAscending.triggered.connect( lambda: self.sortRows([(index.column(), Qt.AscendingOrder)]) )
+
+        actionSortDescending = QAction('Descending', self)
+        actionSortDescending.setStatusTip('Sort rows by this column in descending order')
+        actionSortDescending.setToolTip('Sort rows by this column in descending order')
+        actionSortDescending.triggered.connect( lambda: self.sortRows([(index.column(), Qt.DescendingOrder)]) )
+
+        actionSortThenAscending = QAction('Then Ascending', self)
+        actionSortThenAscending.setStatusTip('Sort rows with equal keys by this column in ascending order')
+        actionSortThenAscending.setToolTip('Sort rows with equal keys by this column in ascending order')
+        actionSortThenAscending.setEnabled(bool(self._proxyModel.sortOrder()))
+        actionSortThenAscending.triggered.connect( lambda: self.addSortKey(index.column(), Qt.AscendingOrder) )
+
+        actionSortThenDescending = QAction('Then Descending', self)
+        actionSortThenDescending.setStatusTip('Sort rows with equal keys by this column in descending order')
+        actionSortThenDescending.setToolTip('Sort rows with equal keys by this column in descending order')
+        actionSortThenDescending.setEnabled(bool(self._proxyModel.sortOrder()))
+        actionSortThenDescending.triggered.connect( lambda: self.addSortKey(index.column(), Qt.DescendingOrder) )
+
+        actionSortClear = QAction('Original Order', self)
+        actionSortClear.setStatusTip('Show rows in the order of the document')
+        actionSortClear.setToolTip('Show rows in the order of the document')
+        actionSortClear.setEnabled(self._proxyModel.isSorted() or self._proxyModel.isSorting())
+        actionSortClear.triggered.connect( lambda: self.sortRows([]) )
+
+        menuSort = QMenu('Sort', self)
+        menuSort.setIcon(QIcon.fromTheme('view-sort'))
+        menuSort.setStatusTip('Sort rows')
+        menuSort.setToolTip('Sort rows')
+        menuSort.setEnabled(index.isValid())
+        menuSort.addAction(actionSortAscending)
+        menuSort.addAction(actionSortDescending)
+        menuSort.addSeparator()
+        menuSort.addAction(actionSortThenAscending)
+        menuSort.addAction(actionSortThenDescending)
+        menuSort.addSeparator()
+        menuSort.addAction(actionSortClear)
+
+        # Column; mapped documents keep the columns of their file
+        isEditable = isinstance(self.store(), DocumentColumnStore) and index.isValid()
+
+        actionInsertColumn = QAction('Insert Column', self)
+        actionInsertColumn.setStatusTip('Insert an empty column before this column')
+        actionInsertColumn.setToolTip('Insert an empty column before this column')
+        actionInsertColumn.setEnabled(isEditable)
+        actionInsertColumn.triggered.connect( lambda: self.insertColumns(index.column(), 1) )
+
+        actionRemoveColumn = QAction('Remove Column', self)
+        actionRemoveColumn.setStatusTip('Remove this column')
+        actionRemoveColumn.setToolTip('Remove this column')
+        actionRemoveColumn.setEnabled(isEditable)
+        actionRemoveColumn.triggered.connect( lambda: self.removeColumns(index.column(), 1) )
+
+        # Filter
+        actionFilterEqual = QAction('Equal To…', self)
+        actionFilterEqual.setStatusTip('Show only rows whose cell in this column equals a text')
+        actionFilterEqual.setToolTip('Show only rows whose cell in this column equals a text')
+        actionFilterEqual.triggered.connect( lambda: self.onActionFilterEqualTriggered(index.column()) )
+
+        actionFilterPrefix = QAction('Words Starting With…', self)
+        actionFilterPrefix.setStatusTip('Show only rows whose cell in this column has a word starting with a text')
+        actionFilterPrefix.setToolTip('Show only rows whose cell in this column has a word starting with a text')
+        actionFilterPrefix.triggered.connect( lambda: self.onActionFilterPrefixTriggered(index.column()) )
+
+        actionFilterRange = QAction('Between…', self)
+        actionFilterRange.setStatusTip('Show only rows whose cell in this column lies between two values')
+        actionFilterRange.setToolTip('Show only rows whose cell in this column lies between two values')
+        actionFilterRange.triggered.connect( lambda: self.onActionFilterRangeTriggered(index.column()) )
+
+        actionFilterClear = QAction('Show All Rows', self)
+        actionFilterClear.setStatusTip('Show all rows of the document')
+        actionFilterClear.setToolTip('Show all rows of the document')
+        actionFilterClear.setEnabled(self._proxyModel.isFiltered() or self._pendingFilter is not None)
+        actionFilterClear.triggered.connect(self.clearFilter)
+
+        menuFilter = QMenu('Filter', self)
+        menuFilter.setIcon(QIcon.fromTheme('view-filter'))
+        menuFilter.setStatusTip('Filter rows')
+        menuFilter.setToolTip('Filter rows')
+        menuFilter.setEnabled(index.isValid())
+        menuFilter.addAction(actionFilterEqual)
+        menuFilter.addAction(actionFilterPrefix)
+        menuFilter.addAction(actionFilterRange)
+        menuFilter.addSeparator()
+        menuFilter.addAction(actionFilterClear)
+
         contextMenu = QMenu(self)
         contextMenu.addMenu(menuLabel)
+        contextMenu.addMenu(menuSort)
+        contextMenu.addMenu(menuFilter)
+        contextMenu.addSeparator()
+        contextMenu.addAction(actionInsertColumn)
+        contextMenu.addAction(actionRemoveColumn)
         contextMenu.exec_(self.mapToGlobal(pos))
 
 
@@ -326,25 +531,28 @@ class DocumentTable(QTableWidget):
             else:
                 return
 
-        for column in range(0, self.columnCount()):
-            self.updateHorizontalHeaderItem(column, type, parameter)
+        self.updateHorizontalHeaderItems(type, parameter)
 
 
     def updateHorizontalHeaderItem(self, column, type, parameter):
         """
         Updates a horizontal header item.
         """
-        number = column
+        self._undoStack.apply(DocumentTableHeaderLabelDelta(self._model, Qt.Horizontal, column, (type, parameter), 'Change Horizontal Label'))
+
 
-        item = self.horizontalHeaderItem(column)
-        item.setText(self.headerItemText(number, type, parameter))
+    def updateHorizontalHeaderItems(self, type, parameter):
+        """
+        Updates all horizontal header items at once.
+        """
+        self.updateHeaderItems(self.horizontalHeader(), DocumentTableHeaderLabelsDelta(self._model, Qt.Horizontal, (type, parameter), 'Change Horizontal Labels'))
 
 
     def contextMenuVerticalHeader(self, pos):
         """
         Creates a context menu for the vertical header.
         """
-        index = self.indexAt(pos)
+        index = self._proxyModel.mapToSource(self.indexAt(pos))
 
         # Label
         actionLabelLetter = QAction('Letter', self)
@@ -432,15 +640,434 @@ class DocumentTable(QTableWidget):
             else:
                 return
 
-        for row in range(0, self.rowCount()):
-            self.updateVerticalHeaderItem(row, type, parameter)
+        self.updateVerticalHeaderItems(type, parameter)
 
 
     def updateVerticalHeaderItem(self, row, type, parameter):
         """
         Updates a vertical header item.
         """
-        number = row
+        self._undoStack.apply(DocumentTableHeaderLabelDelta(self._model, Qt.Vertical, row, (type, parameter), 'Change Vertical Label'))
+
+
+    def updateVerticalHeaderItems(self, type, parameter):
+        """
+        Updates all vertical header items at once.
+        """
+        self.updateHeaderItems(self.verticalHeader(), DocumentTableHeaderLabelsDelta(self._model, Qt.Vertical, (type, parameter), 'Change Vertical Labels'))
+
+
+    def updateHeaderItems(self, headerView, delta):
+        """
+        Replaces the labels of all sections of a header with one notification and one repaint.
+        """
+        headerView.setUpdatesEnabled(False)
+
+        # Labels are generated when their sections are displayed; only labels of single sections are kept for undoing
+        with self._metrics.measure('relabelTime'):
+            self._undoStack.apply(delta)
+
+        headerView.setUpdatesEnabled(True)
+
+
+    def paintEvent(self, event):
+
+        with self._metrics.measure('paintTime'):
+            super().paintEvent(event)
+
+
+    def keyPressEvent(self, event):
+
+        if event.matches(QKeySequence.Delete) and self.state() != QAbstractItemView.EditingState:
+            self.clearSelectedCells()
+        else:
+            super().keyPressEvent(event)
+
+
+    def fillCells(self, ranges, value, text='Fill Cells'):
+        """
+        Sets the text of all cells within the given ranges of first row, first column, row count and column count.
+        """
+        deltas = []
+
+        for row, column, rowCount, columnCount in ranges:
+            # All columns of a range share one list of new texts
+            values = [value] * rowCount
+            deltas.append(DocumentTableCellsDelta(self._model, row, column, [values] * columnCount, text))
+
+        if len(deltas) == 1:
+            self._undoStack.apply(deltas[0])
+        elif deltas:
+            self._undoStack.apply(DocumentTableGroupDelta(self._model, deltas, text))
+
+
+    def clearSelectedCells(self):
+        """
+        Empties the selected cells.
+        """
+        ranges = []
+        for selection in self.selectionModel().selection():
+            # Selected rows of sorted documents are not contiguous in the document
+            for row, count in self._proxyModel.mapRowsToSource(selection.top(), selection.height()):
+                ranges.append((row, selection.left(), count, selection.width()))
+
+        self.fillCells(ranges, '', 'Clear Cells')
+
+
+    def replaceCells(self, cells, search, replacement):
+        """
+        Replaces the found text in cells given as pairs of row and column by one edit; returns the number of replaced cells.
+        """
+        store = self.store()
+        deltas = []
+        replacedCount = 0
+
+        # Consecutive rows of a column are replaced together
+        runColumn, runRow, runValues = None, None, []
+
+        for row, column in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+            if row >= store.rowCount() or column >= store.columnCount():
+                continue
+
+            # Cells edited since they have been found are kept
+            value = store.value(row, column)
+            if not search.matches(value):
+                continue
+
+            if column != runColumn or row != runRow + len(runValues):
+                if runValues:
+                    deltas.append(DocumentTableCellsDelta(self._model, runRow, runColumn, [runValues], 'Replace'))
+                runColumn, runRow, runValues = column, row, []
+
+            runValues.append(search.replace(value, replacement))
+            replacedCount += 1
+
+        if runValues:
+            deltas.append(DocumentTableCellsDelta(self._model, runRow, runColumn, [runValues], 'Replace'))
+
+        if len(deltas) == 1:
+            self._undoStack.apply(deltas[0])
+        elif deltas:
+            self._undoStack.apply(DocumentTableGroupDelta(self._model, deltas, 'Replace'))
+
+        return replacedCount
+
+
+    def cellLabel(self, row, column):
+        """
+        Returns the labels of the column and the row of a cell.
+        """
+        return f'{self._model.headerData(column, Qt.Horizontal)}, {self._model.headerData(row, Qt.Vertical)}'
+
+
+    def showCell(self, row, column):
+        """
+        Makes a cell the current cell and scrolls to it; a filter hiding its row is cleared.
+        """
+        index = self._proxyModel.mapFromSource(self._model.index(row, column))
+        if not index.isValid():
+            self.clearFilter()
+            index = self._proxyModel.mapFromSource(self._model.index(row, column))
+
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+
+
+    def insertColumns(self, position, count):
+        """
+        Inserts empty columns.
+        """
+        self._undoStack.apply(DocumentTableInsertColumnsDelta(self._model, position, count))
+
+
+    def removeColumns(self, position, count):
+        """
+        Removes columns.
+        """
+        self._undoStack.apply(DocumentTableRemoveColumnsDelta(self._model, position, count))
+
+
+    def sortRows(self, sortOrder):
+        """
+        Sorts the rows by columns given as pairs of column and order; an empty list restores the order of the document.
+        """
+        self._sortStartTime = time.perf_counter() if sortOrder else None
+        self._proxyModel.setSortOrder(sortOrder)
+
+
+    def addSortKey(self, column, order):
+        """
+        Sorts rows with equal keys by a further column.
+        """
+        sortOrder = [(section, sectionOrder) for section, sectionOrder in self._proxyModel.sortOrder() if section != column]
+
+        self._sortStartTime = time.perf_counter()
+        self._proxyModel.setSortOrder(sortOrder + [(column, order)])
+
+
+    def cancelSort(self):
+
+        self._proxyModel.cancelSort()
+
+
+    def isSorting(self):
+
+        return self._proxyModel.isSorting()
+
+
+    def onActionFilterEqualTriggered(self, column):
+        """
+        Asks for a text and shows only the rows with this text in the column.
+        """
+        text, ok = QInputDialog.getText(self, 'Filter Rows', 'Cells equal to:')
+        if ok:
+            self.filterRows(column, 'equal', text)
+
+
+    def onActionFilterPrefixTriggered(self, column):
+        """
+        Asks for a text and shows only the rows with a word starting with this text in the column.
+        """
+        text, ok = QInputDialog.getText(self, 'Filter Rows', 'Words starting with:')
+        if ok and text:
+            self.filterRows(column, 'prefix', text)
+
+
+    def onActionFilterRangeTriggered(self, column):
+        """
+        Asks for two values and shows only the rows between them in the column; an empty value leaves a side open.
+        """
+        low, ok = QInputDialog.getText(self, 'Filter Rows', 'Cells from:')
+        if not ok:
+            return
+
+        high, ok = QInputDialog.getText(self, 'Filter Rows', 'Cells to:')
+        if ok:
+            self.filterRows(column, 'range', low or None, high or None)
+
+
+    def filterRows(self, column, lookup, *arguments):
+        """
+        Shows only the rows found in the index of a column by a lookup: 'equal', 'range' or 'prefix'.
+        """
+        # Filters are measured from the request, including the indexing of the column
+        if self._filterStartTime is None:
+            self._filterStartTime = time.perf_counter()
+
+        index = self._columnIndexes.get(column)
+        if index is None:
+            # The filter is applied as soon as the column has been indexed
+            self._pendingFilter = (column, lookup, arguments)
+            self.indexColumns([column])
+            return
+
+        self._pendingFilter = None
+
+        try:
+            if lookup == 'equal':
+                rows = index.equalRows(*arguments)
+            elif lookup == 'range':
+                rows = index.rangeRows(*arguments)
+            else:
+                rows = index.prefixRows(*arguments)
+        except ValueError as error:
+            # Texts which do not fit the column keep the rows shown
+            self._filterStartTime = None
+            self.filterFailed.emit(str(error))
+            return
+
+        self._proxyModel.setFilterRows(rows)
+
+        self._metrics.record('filterTime', time.perf_counter() - self._filterStartTime)
+        self._filterStartTime = None
+
+
+    def clearFilter(self):
+        """
+        Shows all rows.
+        """
+        self._pendingFilter = None
+        self._filterStartTime = None
+
+        if self._proxyModel.isFiltered():
+            self._proxyModel.setFilterRows(None)
+
+
+    def indexColumns(self, columns=None):
+        """
+        Builds the indexes of columns in the background, the given columns first; None indexes all columns.
+        """
+        if columns is None:
+            columns = range(self.columnCount())
+
+        if self._deferredColumns is not None:
+            self._deferredColumns.update(columns)
+            return
+
+        # Columns still waiting for their index are indexed after the given columns
+        pending = self._columnIndexer.columns() if self._columnIndexer else []
+        self.cancelIndexing()
+
+        columns = [column for column in dict.fromkeys([*columns, *pending]) if column not in self._columnIndexes and column < self.columnCount()]
+        if not columns:
+            return
+
+        self._columnIndexer = DocumentColumnIndexer(self.store(), columns, self)
+        self._columnIndexer.columnIndexed.connect(self.onIndexerColumnIndexed)
+        self._columnIndexer.finished.connect(self.onIndexerFinished)
+        self._columnIndexer.start()
+
+
+    def setIndexingDeferred(self, deferred):
+        """
+        Defers the indexing of columns while rows are being loaded; the deferred columns are indexed when it ends.
+        """
+        if deferred:
+            if self._deferredColumns is None:
+                self._deferredColumns = set()
+            return
+
+        columns = self._deferredColumns
+        self._deferredColumns = None
+        if columns:
+            self.indexColumns(sorted(columns))
+
+
+    def isIndexingDeferred(self):
+
+        return self._deferredColumns is not None
+
+
+    def cancelIndexing(self):
+
+        self._staleColumns.clear()
+
+        if self._columnIndexer:
+            self._columnIndexer.cancel()
+            self.releaseIndexer()
+
+
+    def isIndexing(self):
+
+        return self._columnIndexer is not None
+
+
+    def unloadCells(self):
+        """
+        Moves the cells to disk and releases the indexes of the columns; the sort order and the filter are kept.
+        """
+        self.store().unload()
+
+        self._unloadedColumns = sorted(set(self._unloadedColumns) | set(self._columnIndexes))
+        self._columnIndexes.clear()
+
+
+    def restoreCells(self):
+        """
+        Reads the cells back into memory and builds the released indexes of the columns again.
+        """
+        self.store().restore()
+
+        columns = self._unloadedColumns
+        self._unloadedColumns = []
+        if columns:
+            self.indexColumns(columns)
+
+
+    def onIndexerColumnIndexed(self, column, index):
+
+        # Results of cancelled indexers may arrive later
+        if self.sender() is not self._columnIndexer:
+            return
+
+        # The column has been edited while it was indexed
+        if column in self._staleColumns:
+            return
+
+        self._columnIndexes[column] = index
+
+        if self._pendingFilter and self._pendingFilter[0] == column:
+            column, lookup, arguments = self._pendingFilter
+            self.filterRows(column, lookup, *arguments)
+
+
+    def releaseIndexer(self):
+
+        self._columnIndexer.deleteLater()
+        self._columnIndexer = None
+
+
+    def onIndexerFinished(self):
+
+        # Cancelled indexers have been released already; their signal may arrive while the next indexer runs
+        if self.sender() is not self._columnIndexer:
+            return
+
+        self.releaseIndexer()
+
+        # Columns edited while they were indexed are indexed again
+        staleColumns = self._staleColumns
+        self._staleColumns = set()
+        if staleColumns:
+            self.indexColumns(sorted(staleColumns))
+
+
+    def onModelDataChanged(self, topLeft, bottomRight):
+
+        store = self.store()
+        rowCount = bottomRight.row() - topLeft.row() + 1
+
+        for column in range(topLeft.column(), bottomRight.column() + 1):
+            if self._columnIndexer and column in self._columnIndexer.columns():
+                self._staleColumns.add(column)
+
+            index = self._columnIndexes.get(column)
+            if index is None:
+                continue
+
+            # Few edits are applied to the index; otherwise it is built again in the background
+            if index.isUpdatable(rowCount) and store.columnType(column) == index.type():
+                try:
+                    for row, text in enumerate(store.columnValues(column, topLeft.row(), rowCount), topLeft.row()):
+                        index.update(row, text)
+                    continue
+                except ValueError:
+                    pass
+
+            del self._columnIndexes[column]
+            self.indexColumns([column])
+
+
+    def onModelStructureChanged(self):
+
+        if not self._columnIndexes and not self._columnIndexer:
+            return
+
+        # Rows and columns have moved; the indexes built so far are built again, the pending filter is applied after them
+        columns = [*self._columnIndexes, *(self._columnIndexer.columns() if self._columnIndexer else [])]
+        if self._pendingFilter:
+            columns.insert(0, self._pendingFilter[0])
+
+        self._columnIndexes.clear()
+        self._unloadedColumns = []
+        self.cancelIndexing()
+        self.indexColumns(columns)
+
+
+    def onProxySortProgressChanged(self, progress):
+
+        # Sorts are measured from the request until the rows are shown in their order
+        if progress == 100 and self._sortStartTime is not None and not self._proxyModel.isSorting():
+            self._metrics.record('sortTime', time.perf_counter() - self._sortStartTime)
+            self._sortStartTime = None
+
+
+    def updateSortIndicator(self):
+
+        sortOrder = self._proxyModel.sortOrder()
 
-        item = self.verticalHeaderItem(row)
-        item.setText(self.headerItemText(number, type, parameter))
+        # The indicator shows the primary key
+        headerView = self.horizontalHeader()
+        headerView.setSortIndicatorShown(bool(sortOrder))
+        if sortOrder:
+            headerView.setSortIndicator(*sortOrder[0])
@@ -0,0 +1,303 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+
+class DocumentTableDelta:
+    """
+    A change of a document which can be undone; only the differences are kept.
+    """
+    Id = -1
+
+    # Cells are kept as references; their texts are mostly shared with the store
+    CellSize = 8
+
+
+    def __init__(self, model, text=''):
+
+        self._model = model
+        self._text = text
+
+
+    def text(self):
+
+        return self._text
+
+
+    def size(self):
+        """
+        Returns an estimate of the memory kept to undo and redo the change, in bytes.
+        """
+        return 0
+
+
+    def redo(self):
+
+        pass
+
+
+    def undo(self):
+
+        pass
+
+
+    def mergeWith(self, delta):
+        """
+        Takes over a following change of the same kind; returns False if they cannot be combined.
+        """
+        return False
+
+
+class DocumentTableGroupDelta(DocumentTableDelta):
+    """
+    Several changes which are undone and redone together.
+    """
+
+    def __init__(self, model, deltas, text=''):
+        super().__init__(model, text)
+
+        self._deltas = deltas
+
+
+    def size(self):
+
+        return sum(delta.size() for delta in self._deltas)
+
+
+    def redo(self):
+
+        for delta in self._deltas:
+            delta.redo()
+
+
+    def undo(self):
+
+        for delta in reversed(self._deltas):
+            delta.undo()
+
+
+class DocumentTableCellsDelta(DocumentTableDelta):
+    """
+    Changes the texts of a rectangular range of cells given column by column.
+
+    Columns of new texts may be the same list, which keeps fills compact.
+    """
+    Id = 1
+
+
+    def __init__(self, model, row, column, columns, text='Edit Cells'):
+        super().__init__(model, text)
+
+        self._row = row
+        self._column = column
+        self._columns = columns
+        self._previousColumns = model.cellValues(row, column, len(columns[0]) if columns else 0, len(columns))
+
+
+    def shape(self):
+        """
+        Returns the first row, first column, row count and column count of the range.
+        """
+        return self._row, self._column, len(self._columns[0]) if self._columns else 0, len(self._columns)
+
+
+    def size(self):
+
+        # Shared columns of new texts are counted once
+        columns = {id(column): column for column in self._columns}
+
+        return (sum(map(len, columns.values())) + sum(map(len, self._previousColumns))) * self.CellSize
+
+
+    def redo(self):
+
+        self._model.setCellValues(self._row, self._column, self._columns)
+
+
+    def undo(self):
+
+        self._model.setCellValues(self._row, self._column, self._previousColumns)
+
+
+    def mergeWith(self, delta):
+
+        # Consecutive edits of the same kind are undone at once
+        if delta.text() != self.text():
+            return False
+
+        row, column, rowCount, columnCount = self.shape()
+        otherRow, otherColumn, otherRowCount, otherColumnCount = delta.shape()
+        if not rowCount or not otherRowCount:
+            return False
+
+        if delta.shape() == self.shape():
+            self._columns = delta._columns
+
+        elif row <= otherRow and otherRow + otherRowCount <= row + rowCount and column <= otherColumn and otherColumn + otherColumnCount <= column + columnCount:
+            # Edits within the range replace some of its texts; shared columns are copied first
+            self._columns = [list(values) for values in self._columns]
+            for values, otherValues in zip(self._columns[otherColumn - column:], delta._columns):
+                values[otherRow - row:otherRow - row + otherRowCount] = otherValues
+
+        elif column == otherColumn and columnCount == otherColumnCount and otherRow in (row - otherRowCount, row + rowCount):
+            # Edits of the rows above or below extend the range
+            if otherRow < row:
+                self._row = otherRow
+                self._columns = [[*otherValues, *values] for values, otherValues in zip(self._columns, delta._columns)]
+                self._previousColumns = [[*otherValues, *values] for values, otherValues in zip(self._previousColumns, delta._previousColumns)]
+            else:
+                self._columns = [[*values, *otherValues] for values, otherValues in zip(self._columns, delta._columns)]
+                self._previousColumns = [[*values, *otherValues] for values, otherValues in zip(self._previousColumns, delta._previousColumns)]
+
+        elif row == otherRow and rowCount == otherRowCount and otherColumn in (column - otherColumnCount, column + columnCount):
+            # Edits of the columns to the left or right extend the range
+            if otherColumn < column:
+                self._column = otherColumn
+                self._columns = [*delta._columns, *self._columns]
+                self._previousColumns = [*delta._previousColumns, *self._previousColumns]
+            else:
+                self._columns = [*self._columns, *delta._columns]
+                self._previousColumns = [*self._previousColumns, *delta._previousColumns]
+
+        else:
+            return False
+
+        return True
+
+
+class DocumentTableInsertColumnsDelta(DocumentTableDelta):
+    """
+    Inserts empty columns.
+    """
+
+    def __init__(self, model, position, count, text='Insert Columns'):
+        super().__init__(model, text)
+
+        self._position = position
+        self._count = count
+
+
+    def redo(self):
+
+        rowCount = self._model.rowCount()
+
+        self._model.insertColumnValues(self._position, [[''] * rowCount for _ in range(self._count)])
+
+
+    def undo(self):
+
+        self._model.removeColumnValues(self._position, self._count)
+
+
+class DocumentTableRemoveColumnsDelta(DocumentTableDelta):
+    """
+    Removes columns; their cells and header labels are kept to be restored.
+    """
+
+    def __init__(self, model, position, count, text='Remove Columns'):
+        super().__init__(model, text)
+
+        self._position = position
+        self._count = count
+
+        self._columns = []
+        self._labels = {}
+
+
+    def size(self):
+
+        return sum(map(len, self._columns)) * self.CellSize
+
+
+    def redo(self):
+
+        self._columns, self._labels = self._model.removeColumnValues(self._position, self._count)
+
+
+    def undo(self):
+
+        self._model.insertColumnValues(self._position, self._columns, self._labels)
+
+        self._columns = []
+        self._labels = {}
+
+
+class DocumentTableHeaderLabelDelta(DocumentTableDelta):
+    """
+    Changes the label of a single header section.
+    """
+
+    def __init__(self, model, orientation, section, label, text='Change Label'):
+        super().__init__(model, text)
+
+        self._orientation = orientation
+        self._section = section
+        self._label = label
+        self._previousLabel = model.sectionHeaderLabel(orientation, section)
+
+
+    def redo(self):
+
+        self._model.setSectionHeaderLabel(self._orientation, self._section, self._label)
+
+
+    def undo(self):
+
+        self._model.setSectionHeaderLabel(self._orientation, self._section, self._previousLabel)
+
+
+class DocumentTableHeaderLabelsDelta(DocumentTableDelta):
+    """
+    Changes the labels of all sections of a header; only the previous labels of single sections are kept.
+    """
+    Id = 2
+
+
+    def __init__(self, model, orientation, label, text='Change Labels'):
+        super().__init__(model, text)
+
+        self._orientation = orientation
+        self._label = label
+        self._previousLabel, self._previousSectionLabels = model.headerLabels(orientation)
+
+
+    def size(self):
+
+        return len(self._previousSectionLabels) * self.CellSize
+
+
+    def redo(self):
+
+        self._model.setHeaderLabel(self._orientation, *self._label)
+
+
+    def undo(self):
+
+        self._model.setHeaderLabels(self._orientation, self._previousLabel, self._previousSectionLabels)
+
+
+    def mergeWith(self, delta):
+
+        # Relabeling a header several times in a row is undone at once
+        if delta._orientation != self._orientation:
+            return False
+
+        self._label = delta._label
+
+        return True
@@ -0,0 +1,157 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import string
+from collections import OrderedDict
+from itertools import islice
+
+from preferences import Preferences
+
+
+def customTexts(first, count, parameter):
+    """
+    Returns the user-defined texts of a range of numbers; # is replaced with the number counted from 1.
+    """
+    if '#' not in parameter:
+        return [parameter] * count
+
+    template = parameter.replace('{', '{{').replace('}', '}}').replace('#', '{0}')
+
+    return list(map(template.format, range(first + 1, first + count + 1)))
+
+
+def binaryTexts(first, count, parameter):
+    """
+    Returns the base 2 texts of a range of numbers.
+    """
+    return list(map(f'{parameter}{{:b}}'.format, range(first, first + count)))
+
+
+def octalTexts(first, count, parameter):
+    """
+    Returns the base 8 texts of a range of numbers.
+    """
+    return list(map(f'{parameter}{{:o}}'.format, range(first, first + count)))
+
+
+def decimalTexts(first, count, parameter):
+    """
+    Returns the base 10 texts of a range of numbers, starting the enumeration with the parameter.
+    """
+    offset = int(parameter)
+
+    return list(map(str, range(first + offset, first + count + offset)))
+
+
+def hexadecimalTexts(first, count, parameter):
+    """
+    Returns the base 16 texts of a range of numbers.
+    """
+    return list(map(f'{parameter}{{:X}}'.format, range(first, first + count)))
+
+
+def letterTexts(first, count, parameter):
+    """
+    Returns the base 26 texts of a range of numbers.
+    """
+    return lettersOfRange(first, count, string.ascii_uppercase if parameter == 'upper' else string.ascii_lowercase)
+
+
+def lettersOfRange(first, count, alphabet):
+    """
+    Returns the bijective base 26 texts of a range of numbers.
+
+    The letters of the preceding places are generated once for every 26 numbers and combined with
+    all letters of the last place.
+    """
+    if count <= 0:
+        return []
+
+    last = first + count - 1
+
+    # Numbers below 26 have no preceding places; number n has the preceding places of number n // 26 - 1
+    firstQuotient = first // 26
+    lastQuotient = last // 26
+
+    prefixes = [''] if firstQuotient == 0 else []
+    firstPrefix = max(firstQuotient, 1) - 1
+    prefixes += lettersOfRange(firstPrefix, lastQuotient - firstPrefix, alphabet)
+
+    texts = (prefix + letter for prefix in prefixes for letter in alphabet)
+    start = first - firstQuotient * 26
+
+    return list(islice(texts, start, start + count))
+
+
+class DocumentTableHeaderLabels:
+
+    BlockSize = 1024
+    MaximumBlockCount = 2048
+
+    Generators = {
+        Preferences.HeaderLabel.Custom: customTexts,
+        Preferences.HeaderLabel.Binary: binaryTexts,
+        Preferences.HeaderLabel.Octal: octalTexts,
+        Preferences.HeaderLabel.Decimal: decimalTexts,
+        Preferences.HeaderLabel.Hexadecimal: hexadecimalTexts,
+        Preferences.HeaderLabel.Letter: letterTexts,
+    }
+
+    # Blocks of generated labels shared by all documents, least recently used first
+    _blocks = OrderedDict()
+
+
+    @classmethod
+    def texts(cls, first, count, type, parameter):
+        """
+        Returns the labels of a range of numbers, generated in one pass.
+        """
+        generator = cls.Generators.get(type)
+
+        return generator(first, count, parameter) if generator else [''] * count
+
+
+    @classmethod
+    def text(cls, number, type, parameter):
+        """
+        Returns the label of a number, generating and caching the labels of its block.
+        """
+        block, offset = divmod(number, cls.BlockSize)
+        key = (type, parameter, block)
+
+        texts = cls._blocks.get(key)
+        if texts is None:
+            texts = cls.texts(block * cls.BlockSize, cls.BlockSize, type, parameter)
+
+            cls._blocks[key] = texts
+            if len(cls._blocks) > cls.MaximumBlockCount:
+                cls._blocks.popitem(last=False)
+        else:
+            cls._blocks.move_to_end(key)
+
+        return texts[offset]
+
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes all cached labels.
+        """
+        cls._blocks.clear()
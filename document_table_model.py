@@ -0,0 +1,350 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from document_column_store import DocumentColumnStore
+from document_table_deltas import DocumentTableCellsDelta
+
+
+class DocumentTableModel(QAbstractTableModel):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._store = DocumentColumnStore()
+        self._undoStack = None
+
+        # Header labels are generated from a type and a parameter when they are displayed;
+        # only sections labeled differently are stored
+        self._headerLabelText = None
+        self._horizontalHeaderLabel = None
+        self._verticalHeaderLabel = None
+        self._horizontalHeaderLabelOverrides = {}
+        self._verticalHeaderLabelOverrides = {}
+
+
+    def setStore(self, store):
+
+        self.beginResetModel()
+
+        self._store = store
+
+        self._horizontalHeaderLabelOverrides.clear()
+        self._verticalHeaderLabelOverrides.clear()
+
+        self.endResetModel()
+
+
+    def store(self):
+
+        return self._store
+
+
+    def setUndoStack(self, undoStack):
+        """
+        Sets the stack which records the edits of cells; without one edits cannot be undone.
+        """
+        self._undoStack = undoStack
+
+
+    def undoStack(self):
+
+        return self._undoStack
+
+
+    def rowCount(self, parent=QModelIndex()):
+
+        return self._store.rowCount() if not parent.isValid() else 0
+
+
+    def columnCount(self, parent=QModelIndex()):
+
+        return self._store.columnCount() if not parent.isValid() else 0
+
+
+    def data(self, index, role=Qt.DisplayRole):
+
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self._store.value(index.row(), index.column())
+
+        return None
+
+
+    def setData(self, index, value, role=Qt.EditRole):
+
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+
+        if self._undoStack is not None:
+            self._undoStack.apply(DocumentTableCellsDelta(self, index.row(), index.column(), [[str(value)]], 'Edit Cell'))
+        else:
+            self.setCellValues(index.row(), index.column(), [[str(value)]])
+
+        return True
+
+
+    def cellValues(self, row, column, rowCount, columnCount):
+        """
+        Returns the texts of a range of cells column by column.
+        """
+        return [self._store.columnValues(section, row, rowCount) for section in range(column, column + columnCount)]
+
+
+    def setCellValues(self, row, column, columns):
+        """
+        Sets the texts of a range of cells given column by column.
+        """
+        if not columns or not columns[0]:
+            return
+
+        for section, values in enumerate(columns, column):
+            self._store.setColumnValues(section, row, values)
+
+        self.dataChanged.emit(self.index(row, column), self.index(row + len(columns[0]) - 1, column + len(columns) - 1), [Qt.DisplayRole, Qt.EditRole])
+
+
+    def flags(self, index):
+
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        return super().flags(index) | Qt.ItemIsEditable
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+
+        if role == Qt.DisplayRole and self._headerLabelText:
+            label = self.headerLabel(orientation, section)
+            if label:
+                return self._headerLabelText(section, *label)
+
+        return super().headerData(section, orientation, role)
+
+
+    def setHeaderLabelText(self, function):
+        """
+        Sets the function which returns the text of a header label from its number, type and parameter.
+        """
+        self._headerLabelText = function
+
+
+    def headerLabel(self, orientation, section):
+        """
+        Returns the type and parameter of the label of a header section.
+        """
+        if orientation == Qt.Horizontal:
+            return self._horizontalHeaderLabelOverrides.get(section, self._horizontalHeaderLabel)
+        else:
+            return self._verticalHeaderLabelOverrides.get(section, self._verticalHeaderLabel)
+
+
+    def setHeaderLabel(self, orientation, type, parameter):
+        """
+        Sets the label of all header sections, discarding labels of single sections.
+        """
+        if orientation == Qt.Horizontal:
+            self._horizontalHeaderLabel = (type, parameter)
+            self._horizontalHeaderLabelOverrides.clear()
+            count = self.columnCount()
+        else:
+            self._verticalHeaderLabel = (type, parameter)
+            self._verticalHeaderLabelOverrides.clear()
+            count = self.rowCount()
+
+        if count > 0:
+            self.headerDataChanged.emit(orientation, 0, count-1)
+
+
+    def headerLabels(self, orientation):
+        """
+        Returns the type and parameter of the label of all header sections and a copy of the labels of single sections.
+        """
+        if orientation == Qt.Horizontal:
+            return self._horizontalHeaderLabel, dict(self._horizontalHeaderLabelOverrides)
+        else:
+            return self._verticalHeaderLabel, dict(self._verticalHeaderLabelOverrides)
+
+
+    def setHeaderLabels(self, orientation, label, overrides):
+        """
+        Restores the label of all header sections and the labels of single sections.
+        """
+        if orientation == Qt.Horizontal:
+            self._horizontalHeaderLabel = label
+            self._horizontalHeaderLabelOverrides = dict(overrides)
+            count = self.columnCount()
+        else:
+            self._verticalHeaderLabel = label
+            self._verticalHeaderLabelOverrides = dict(overrides)
+            count = self.rowCount()
+
+        if count > 0:
+            self.headerDataChanged.emit(orientation, 0, count-1)
+
+
+    def sectionHeaderLabel(self, orientation, section):
+        """
+        Returns the type and parameter of the label of a single header section, or None if it has the label of all sections.
+        """
+        if orientation == Qt.Horizontal:
+            return self._horizontalHeaderLabelOverrides.get(section)
+        else:
+            return self._verticalHeaderLabelOverrides.get(section)
+
+
+    def setSectionHeaderLabel(self, orientation, section, label):
+        """
+        Sets the type and parameter of the label of a single header section; None restores the label of all sections.
+        """
+        overrides = self._horizontalHeaderLabelOverrides if orientation == Qt.Horizontal else self._verticalHeaderLabelOverrides
+
+        if label is not None:
+            overrides[section] = label
+        else:
+            overrides.pop(section, None)
+
+        self.headerDataChanged.emit(orientation, section, section)
+
+
+    def setRowCount(self, count):
+        """
+        Sets the number of rows.
+        """
+        rowCount = self.rowCount()
+
+        if count > rowCount:
+            self.beginInsertRows(QModelIndex(), rowCount, count-1)
+            self._store.setRowCount(count)
+            self.endInsertRows()
+        elif count < rowCount:
+            self.beginRemoveRows(QModelIndex(), count, rowCount-1)
+            self._store.setRowCount(count)
+            self.removeHeaderLabelOverrides(self._verticalHeaderLabelOverrides, count)
+            self.endRemoveRows()
+
+
+    def setColumnCount(self, count):
+        """
+        Sets the number of columns.
+        """
+        columnCount = self.columnCount()
+
+        if count > columnCount:
+            self.beginInsertColumns(QModelIndex(), columnCount, count-1)
+            self._store.setColumnCount(count)
+            self.endInsertColumns()
+        elif count < columnCount:
+            self.beginRemoveColumns(QModelIndex(), count, columnCount-1)
+            self._store.setColumnCount(count)
+            self.removeHeaderLabelOverrides(self._horizontalHeaderLabelOverrides, count)
+            self.endRemoveColumns()
+
+
+    def insertColumnValues(self, position, columns, labels=None):
+        """
+        Inserts columns given as lists of texts of all rows, with the labels of single sections among them.
+        """
+        if not columns:
+            return
+
+        count = len(columns)
+
+        self.beginInsertColumns(QModelIndex(), position, position + count - 1)
+
+        self._store.insertColumns(position, columns)
+
+        overrides = self._horizontalHeaderLabelOverrides
+        self._horizontalHeaderLabelOverrides = {section + count if section >= position else section: label for section, label in overrides.items()}
+        self._horizontalHeaderLabelOverrides.update(labels or {})
+
+        self.endInsertColumns()
+
+
+    def removeColumnValues(self, position, count):
+        """
+        Removes columns; returns their texts and the labels of single sections among them.
+        """
+        if count <= 0:
+            return [], {}
+
+        self.beginRemoveColumns(QModelIndex(), position, position + count - 1)
+
+        columns = self._store.removeColumns(position, count)
+
+        labels = {}
+        overrides = {}
+        for section, label in self._horizontalHeaderLabelOverrides.items():
+            if section < position:
+                overrides[section] = label
+            elif section < position + count:
+                labels[section] = label
+            else:
+                overrides[section - count] = label
+        self._horizontalHeaderLabelOverrides = overrides
+
+        self.endRemoveColumns()
+
+        return columns, labels
+
+
+    @staticmethod
+    def removeHeaderLabelOverrides(overrides, first):
+
+        for section in [section for section in overrides if section >= first]:
+            del overrides[section]
+
+
+    def appendRows(self, rows):
+        """
+        Appends rows given as sequences of texts.
+        """
+        if not rows:
+            return
+
+        self.setColumnCount(max(self.columnCount(), max(map(len, rows))))
+
+        rowCount = self.rowCount()
+
+        self.beginInsertRows(QModelIndex(), rowCount, rowCount + len(rows) - 1)
+        self._store.appendRows(rows)
+        self.endInsertRows()
+
+
+    def appendRowsFromColumns(self, columns):
+        """
+        Appends rows given column by column.
+        """
+        if not columns or not columns[0]:
+            return
+
+        self.setColumnCount(max(self.columnCount(), len(columns)))
+
+        rowCount = self.rowCount()
+
+        self.beginInsertRows(QModelIndex(), rowCount, rowCount + len(columns[0]) - 1)
+        self._store.appendRowsFromColumns(columns)
+        self.endInsertRows()
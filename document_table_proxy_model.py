@@ -0,0 +1,440 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from array import array
+
+from PySide2.QtCore import QAbstractItemModel, QAbstractProxyModel, QModelIndex, Qt, Signal
+
+from document_sorter import DocumentSorter
+
+
+class DocumentTableProxyModel(QAbstractProxyModel):
+    """
+    Shows the rows of a table model in a sorted order, optionally only some of them; the cells of the table model are not moved.
+    """
+    sortProgressChanged = Signal(int)
+    sortOrderChanged = Signal()
+
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Sorted order of all source rows and its inverse; None keeps the order of the rows
+        self._permutation = None
+        self._inverse = None
+
+        # Source rows which are shown; None shows all rows
+        self._filterRows = None
+
+        # Source rows of the proxy rows and the proxy rows of the shown source rows
+        self._rows = None
+        self._rowInverse = None
+
+        self._sortOrder = []
+        self._sortKeys = {}
+        self._sorter = None
+
+        # Columns changed while the sorter runs and whether its result is outdated by other changes
+        self._changedSortColumns = set()
+        self._isSortOutdated = False
+
+
+    def setSourceModel(self, model):
+
+        self.beginResetModel()
+
+        super().setSourceModel(model)
+
+        model.dataChanged.connect(self.onSourceDataChanged)
+        model.headerDataChanged.connect(self.onSourceHeaderDataChanged)
+        model.rowsAboutToBeInserted.connect(self.onSourceRowsAboutToBeInserted)
+        model.rowsInserted.connect(self.onSourceRowsInserted)
+        model.rowsAboutToBeRemoved.connect(self.onSourceRowsAboutToBeRemoved)
+        model.rowsRemoved.connect(self.onSourceRowsRemoved)
+        model.columnsAboutToBeInserted.connect(self.onSourceColumnsAboutToBeInserted)
+        model.columnsInserted.connect(self.onSourceColumnsInserted)
+        model.columnsAboutToBeRemoved.connect(self.onSourceColumnsAboutToBeRemoved)
+        model.columnsRemoved.connect(self.onSourceColumnsRemoved)
+        model.modelAboutToBeReset.connect(self.onSourceModelAboutToBeReset)
+        model.modelReset.connect(self.onSourceModelReset)
+
+        self.endResetModel()
+
+
+    def isSorted(self):
+
+        return self._permutation is not None
+
+
+    def isSorting(self):
+
+        return self._sorter is not None
+
+
+    def isFiltered(self):
+
+        return self._filterRows is not None
+
+
+    def setFilterRows(self, rows):
+        """
+        Shows only the given source rows in the sorted order; None shows all rows.
+        """
+        self.beginResetModel()
+
+        self._filterRows = rows
+        self.updateRows()
+
+        self.endResetModel()
+
+
+    def updateRows(self):
+
+        if self._filterRows is None:
+            self._rows = self._permutation
+            self._rowInverse = self._inverse
+        else:
+            rows = sorted(self._filterRows, key=self._inverse.__getitem__ if self._inverse is not None else None)
+
+            self._rows = array('q', rows)
+            self._rowInverse = {row: proxyRow for proxyRow, row in enumerate(rows)}
+
+
+    def proxyRow(self, row):
+        """
+        Returns the proxy row of a source row, or -1 if the row is not shown.
+        """
+        if self._rowInverse is None:
+            return row
+        elif isinstance(self._rowInverse, dict):
+            return self._rowInverse.get(row, -1)
+        else:
+            return self._rowInverse[row]
+
+
+    def sortOrder(self):
+        """
+        Returns the sort keys as pairs of column and order, starting with the primary key.
+        """
+        return self._sortOrder
+
+
+    def sort(self, column, order=Qt.AscendingOrder):
+
+        self.setSortOrder([(column, order)] if column >= 0 else [])
+
+
+    def setSortOrder(self, sortOrder):
+        """
+        Sorts the rows by several columns on a worker thread; an empty list restores the order of the rows.
+        """
+        self.cancelSort()
+
+        self._sortOrder = list(sortOrder)
+        self.sortOrderChanged.emit()
+
+        if not self._sortOrder:
+            self.setPermutation(None, None)
+            return
+
+        source = self.sourceModel()
+
+        self._changedSortColumns.clear()
+        self._sorter = DocumentSorter(source.store(), source.rowCount(), self._sortOrder, self._sortKeys, self)
+        self._sorter.progressChanged.connect(self.sortProgressChanged)
+        self._sorter.rowsSorted.connect(self.onSorterRowsSorted)
+        self._sorter.finished.connect(self.onSorterFinished)
+        self._sorter.start()
+
+
+    def cancelSort(self):
+
+        self._isSortOutdated = False
+
+        if self._sorter:
+            self._sorter.cancel()
+            self.releaseSorter()
+            self.sortProgressChanged.emit(100)
+
+
+    def releaseSorter(self):
+
+        self._sorter.deleteLater()
+        self._sorter = None
+
+
+    def onSorterRowsSorted(self, permutation, inverse, sortKeys):
+
+        # Results of cancelled sorters may arrive later
+        if self.sender() is not self._sorter:
+            return
+
+        # Rows, columns or sorted cells have changed meanwhile; the rows are sorted again once the sorter has finished
+        if self._isSortOutdated or len(permutation) != self.sourceModel().rowCount() or any(column in self._changedSortColumns for column, order in self._sortOrder):
+            self._isSortOutdated = True
+            return
+
+        # Keys of columns changed meanwhile are computed again when they are needed
+        self._sortKeys.update((column, keys) for column, keys in sortKeys.items() if column not in self._changedSortColumns)
+
+        self.setPermutation(permutation, inverse)
+
+
+    def onSorterFinished(self):
+
+        # Cancelled sorters have been released already; their signal may arrive while the next sorter runs
+        if self.sender() is not self._sorter:
+            return
+
+        self.releaseSorter()
+
+        if self._isSortOutdated:
+            self.setSortOrder(self._sortOrder)
+            return
+
+        self.sortProgressChanged.emit(100)
+
+
+    def setPermutation(self, permutation, inverse):
+
+        if self._filterRows is not None:
+            self.beginResetModel()
+
+            self._permutation = permutation
+            self._inverse = inverse
+            self.updateRows()
+
+            self.endResetModel()
+            return
+
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.VerticalSortHint)
+
+        # Selected and current cells stay with their source cells
+        indexes = self.persistentIndexList()
+        sourceIndexes = [self.mapToSource(index) for index in indexes]
+
+        self._permutation = permutation
+        self._inverse = inverse
+        self.updateRows()
+
+        self.changePersistentIndexList(indexes, [self.mapFromSource(index) for index in sourceIndexes])
+
+        self.layoutChanged.emit([], QAbstractItemModel.VerticalSortHint)
+
+
+    def mapToSource(self, proxyIndex):
+
+        if not proxyIndex.isValid():
+            return QModelIndex()
+
+        row = self._rows[proxyIndex.row()] if self._rows is not None else proxyIndex.row()
+
+        return self.sourceModel().index(row, proxyIndex.column())
+
+
+    def mapFromSource(self, sourceIndex):
+
+        if not sourceIndex.isValid():
+            return QModelIndex()
+
+        return self.index(self.proxyRow(sourceIndex.row()), sourceIndex.column())
+
+
+    def mapRowsToSource(self, first, count):
+        """
+        Returns the source rows of a range of rows as ranges of first row and row count.
+        """
+        if self._rows is None:
+            return [(first, count)] if count > 0 else []
+
+        ranges = []
+        for row in sorted(self._rows[first:first + count]):
+            if ranges and ranges[-1][0] + ranges[-1][1] == row:
+                ranges[-1][1] += 1
+            else:
+                ranges.append([row, 1])
+
+        return [(row, count) for row, count in ranges]
+
+
+    def index(self, row, column, parent=QModelIndex()):
+
+        if parent.isValid() or not 0 <= row < self.rowCount() or not 0 <= column < self.columnCount():
+            return QModelIndex()
+
+        return self.createIndex(row, column)
+
+
+    def parent(self, index=QModelIndex()):
+
+        return QModelIndex()
+
+
+    def rowCount(self, parent=QModelIndex()):
+
+        if parent.isValid() or not self.sourceModel():
+            return 0
+
+        return len(self._rows) if self._rows is not None else self.sourceModel().rowCount()
+
+
+    def columnCount(self, parent=QModelIndex()):
+
+        return self.sourceModel().columnCount() if self.sourceModel() and not parent.isValid() else 0
+
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+
+        if orientation == Qt.Vertical and self._rows is not None and 0 <= section < len(self._rows):
+            section = self._rows[section]
+
+        return self.sourceModel().headerData(section, orientation, role)
+
+
+    def onSourceDataChanged(self, topLeft, bottomRight, roles=None):
+
+        # Sort keys of changed columns are computed again when they are needed
+        for column in range(topLeft.column(), bottomRight.column() + 1):
+            self._sortKeys.pop(column, None)
+
+        if self._sorter:
+            self._changedSortColumns.update(range(topLeft.column(), bottomRight.column() + 1))
+
+        if self._rows is None:
+            self.dataChanged.emit(self.mapFromSource(topLeft), self.mapFromSource(bottomRight), roles or [])
+        elif topLeft.row() == bottomRight.row():
+            if self.proxyRow(topLeft.row()) >= 0:
+                self.dataChanged.emit(self.mapFromSource(topLeft), self.mapFromSource(bottomRight), roles or [])
+        elif self.rowCount() > 0:
+            self.dataChanged.emit(self.index(0, topLeft.column()), self.index(self.rowCount() - 1, bottomRight.column()), roles or [])
+
+
+    def onSourceHeaderDataChanged(self, orientation, first, last):
+
+        if orientation == Qt.Vertical and self._rows is not None:
+            if first == last:
+                first = last = self.proxyRow(first)
+                if first < 0:
+                    return
+            else:
+                first, last = 0, self.rowCount() - 1
+
+        self.headerDataChanged.emit(orientation, first, last)
+
+
+    def onSourceRowsAboutToBeInserted(self, parent, first, last):
+
+        # Rows are appended to the document; they follow the sorted rows unless rows are filtered
+        if self._filterRows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+
+    def onSourceRowsInserted(self, parent, first, last):
+
+        self._sortKeys.clear()
+        self._isSortOutdated = self._isSortOutdated or self._sorter is not None
+
+        if self._permutation is not None:
+            self._permutation.extend(range(first, last + 1))
+            self._inverse.extend(range(first, last + 1))
+
+        if self._filterRows is None:
+            self.endInsertRows()
+
+
+    def onSourceRowsAboutToBeRemoved(self, parent, first, last):
+
+        # Rows are removed from the end of the document; the remaining rows keep their order
+        self.beginResetModel()
+
+
+    def onSourceRowsRemoved(self, parent, first, last):
+
+        self.resetRows()
+        self.endResetModel()
+
+
+    def onSourceColumnsAboutToBeInserted(self, parent, first, last):
+
+        self.beginInsertColumns(QModelIndex(), first, last)
+
+
+    def onSourceColumnsInserted(self, parent, first, last):
+
+        self.shiftSortColumns(first, last - first + 1)
+        self.endInsertColumns()
+
+
+    def onSourceColumnsAboutToBeRemoved(self, parent, first, last):
+
+        self.beginRemoveColumns(QModelIndex(), first, last)
+
+
+    def onSourceColumnsRemoved(self, parent, first, last):
+
+        self.shiftSortColumns(first, -(last - first + 1))
+        self.endRemoveColumns()
+
+
+    def onSourceModelAboutToBeReset(self):
+
+        self.beginResetModel()
+
+
+    def onSourceModelReset(self):
+
+        self.resetRows()
+        self.endResetModel()
+
+
+    def resetRows(self):
+        """
+        Shows all rows in their order.
+        """
+        self.cancelSort()
+
+        self._permutation = None
+        self._inverse = None
+        self._filterRows = None
+        self.updateRows()
+
+        self._sortOrder = []
+        self._sortKeys.clear()
+
+        self.sortOrderChanged.emit()
+
+
+    def shiftSortColumns(self, first, count):
+        """
+        Moves the sort keys behind inserted or removed columns; the rows keep their order.
+        """
+        self._sortKeys.clear()
+        self._isSortOutdated = self._isSortOutdated or self._sorter is not None
+
+        sortOrder = []
+        for column, order in self._sortOrder:
+            if column < first:
+                sortOrder.append((column, order))
+            elif column >= first - min(count, 0):
+                sortOrder.append((column + count, order))
+
+        if sortOrder != self._sortOrder:
+            self._sortOrder = sortOrder
+            self.sortOrderChanged.emit()
@@ -0,0 +1,159 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+from PySide2.QtWidgets import QUndoCommand, QUndoStack
+
+
+class DocumentUndoCommand(QUndoCommand):
+
+    def __init__(self, delta):
+        super().__init__(delta.text())
+
+        self._delta = delta
+        self._skipped = False
+
+
+    def delta(self):
+
+        return self._delta
+
+
+    def id(self):
+
+        return self._delta.Id
+
+
+    def setSkipped(self, skipped):
+        """
+        Skips redoing, undoing and merging while the stack is rebuilt from changes which have been applied or undone already.
+        """
+        self._skipped = skipped
+
+
+    def mergeWith(self, command):
+
+        if self._skipped or command._skipped:
+            return False
+
+        return self._delta.mergeWith(command.delta())
+
+
+    def redo(self):
+
+        if not self._skipped:
+            self._delta.redo()
+
+
+    def undo(self):
+
+        if not self._skipped:
+            self._delta.undo()
+
+
+class DocumentUndoStack(QUndoStack):
+
+    MemoryLimit = 256 * 1024 * 1024
+
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._memoryLimit = self.MemoryLimit
+        self._memoryUsage = 0
+
+
+    def setMemoryLimit(self, limit):
+
+        self._memoryLimit = limit
+
+
+    def memoryLimit(self):
+
+        return self._memoryLimit
+
+
+    def memoryUsage(self):
+        """
+        Returns an estimate of the memory kept by the commands, in bytes.
+        """
+        return self._memoryUsage
+
+
+    def apply(self, delta):
+        """
+        Applies a change and records it; the oldest changes cannot be undone anymore if the memory limit is exceeded.
+        """
+        index = self.index()
+
+        # Commands which could be redone are dropped by the push
+        for command in map(self.command, range(index, self.count())):
+            self._memoryUsage -= command.delta().size()
+
+        top = self.command(index - 1) if index > 0 else None
+        topSize = top.delta().size() if top else 0
+
+        self.push(DocumentUndoCommand(delta))
+
+        # The change has either been merged into the previous command or added as a new one
+        if self.count() == index:
+            self._memoryUsage += top.delta().size() - topSize
+        else:
+            self._memoryUsage += delta.size()
+
+        if self._memoryUsage > self._memoryLimit:
+            self.compact()
+
+
+    def compact(self):
+        """
+        Drops the oldest commands until the others fit into the memory limit; commands which can be redone are kept.
+        """
+        deltas = [self.command(index).delta() for index in range(self.count())]
+        currentIndex = self.index()
+        cleanIndex = self.cleanIndex()
+
+        first = 0
+        size = sum(delta.size() for delta in deltas)
+        while first < currentIndex and size > self._memoryLimit:
+            size -= deltas[first].size()
+            first += 1
+
+        # Commands cannot be removed individually; the stack is rebuilt from the kept changes without applying them again
+        commands = [DocumentUndoCommand(delta) for delta in deltas[first:]]
+        for command in commands:
+            command.setSkipped(True)
+
+        self.clear()
+        self.resetClean()
+
+        for index, command in enumerate(commands, first):
+            if index == cleanIndex:
+                self.setClean()
+            self.push(command)
+
+        if cleanIndex == len(deltas):
+            self.setClean()
+
+        self.setIndex(currentIndex - first)
+
+        for command in commands:
+            command.setSkipped(False)
+
+        self._memoryUsage = size
@@ -0,0 +1,230 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import csv
+import errno
+import io
+import os
+import secrets
+from itertools import islice
+
+from PySide2.QtCore import QThread, Signal
+
+
+def transferFileRange(source, destination, offset, count):
+    """
+    Copies up to count bytes from an offset of the source file to the position of the destination file;
+    returns the number of bytes copied.
+
+    The bytes are copied within the kernel where the system supports it.
+    """
+    if hasattr(os, 'copy_file_range'):
+        try:
+            return os.copy_file_range(source, destination, count, offset)
+        except OSError as error:
+            if error.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM):
+                raise
+
+    if hasattr(os, 'sendfile'):
+        try:
+            return os.sendfile(destination, source, offset, count)
+        except OSError as error:
+            if error.errno not in (errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                raise
+
+    os.lseek(source, offset, os.SEEK_SET)
+    data = os.read(source, min(count, DocumentWriter.BufferSize))
+
+    return writeFile(destination, data)
+
+
+def copyFileRange(source, destination, offset, count):
+    """
+    Copies count bytes from an offset of the source file to the position of the destination file.
+    """
+    end = offset + count
+
+    while offset < end:
+        copied = transferFileRange(source, destination, offset, end - offset)
+        if not copied:
+            raise OSError(errno.EIO, 'File has been truncated while saving')
+
+        offset += copied
+
+
+def writeFile(fd, data):
+    """
+    Writes all data to the position of a file; returns the number of bytes written.
+    """
+    view = memoryview(data)
+
+    while view:
+        view = view[os.write(fd, view):]
+
+    return len(data)
+
+
+class DocumentWriter(QThread):
+
+    progressChanged = Signal(int)
+    saveFailed = Signal(str)
+
+    BlockRowCount = 10000
+    BufferSize = 1024 * 1024
+    CopySize = 64 * 1024 * 1024
+
+
+    def __init__(self, store, fileName, encoding='utf-8', dialect=csv.excel, parent=None):
+        super().__init__(parent)
+
+        self._store = store
+        self._fileName = fileName
+        self._encoding = encoding
+        self._dialect = dialect
+
+        self._patched = False
+        self._saved = False
+
+
+    def setPatched(self, patched):
+        """
+        Sets whether only the edited rows are written and the unchanged bytes are copied from the mapped file.
+        """
+        self._patched = patched
+
+
+    def isPatched(self):
+
+        return self._patched
+
+
+    def fileName(self):
+
+        return self._fileName
+
+
+    def isSaved(self):
+        """
+        Returns whether the file has been replaced completely.
+        """
+        return self._saved
+
+
+    def cancel(self):
+        """
+        Stops the saving, leaving the file untouched, and waits until the thread has finished.
+        """
+        self.requestInterruption()
+        self.wait()
+
+
+    def run(self):
+
+        directory, name = os.path.split(os.path.abspath(self._fileName))
+        temporaryName = os.path.join(directory, f'.{name}.{secrets.token_hex(4)}.tmp')
+
+        try:
+            # The file is replaced in one step after the rows have been written next to it
+            fd = os.open(temporaryName, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+
+            try:
+                if self._patched:
+                    file = open(fd, 'wb', buffering=0)
+                else:
+                    file = open(fd, 'w', encoding=self._encoding, newline='', buffering=self.BufferSize)
+
+                with file:
+                    completed = self.writePatch(file.fileno()) if self._patched else self.writeRows(file)
+                    if completed:
+                        file.flush()
+                        os.fsync(file.fileno())
+
+                if not completed:
+                    os.unlink(temporaryName)
+                    return
+
+                if os.path.exists(self._fileName):
+                    os.chmod(temporaryName, os.stat(self._fileName).st_mode & 0o7777)
+
+                os.replace(temporaryName, self._fileName)
+
+            except BaseException:
+                os.unlink(temporaryName)
+                raise
+
+        except (OSError, UnicodeError, csv.Error) as error:
+            self.saveFailed.emit(str(error))
+            return
+
+        self._saved = True
+
+
+    def writeRows(self, file):
+        """
+        Writes the rows block by block; returns False if the saving has been cancelled.
+        """
+        writer = csv.writer(file, self._dialect)
+
+        rowCount = self._store.rowCount()
+        rows = self._store.rows()
+
+        for first in range(0, rowCount, self.BlockRowCount):
+            if self.isInterruptionRequested():
+                return False
+
+            writer.writerows(islice(rows, self.BlockRowCount))
+            self.progressChanged.emit(min(first + self.BlockRowCount, rowCount) * 100 // rowCount)
+
+        return True
+
+
+    def writePatch(self, fd):
+        """
+        Copies the unchanged bytes of the mapped file and writes the edited rows in between;
+        returns False if the saving has been cancelled.
+        """
+        source = self._store.fileDescriptor()
+
+        # The byte order mark is copied with the first bytes of the file
+        encoding = 'utf-8' if self._encoding == 'utf-8-sig' else self._encoding
+
+        segments = list(self._store.patchSegments())
+        size = segments[-1][1] if segments else 0
+
+        for start, end, rows in segments:
+            if rows is None:
+                for offset in range(start, end, self.CopySize):
+                    if self.isInterruptionRequested():
+                        return False
+
+                    copyFileRange(source, fd, offset, min(self.CopySize, end - offset))
+                    self.progressChanged.emit(min(offset + self.CopySize, end) * 100 // size)
+            else:
+                for first in range(0, len(rows), self.BlockRowCount):
+                    if self.isInterruptionRequested():
+                        return False
+
+                    text = io.StringIO()
+                    csv.writer(text, self._dialect).writerows(rows[first:first + self.BlockRowCount])
+                    writeFile(fd, text.getvalue().encode(encoding))
+
+                self.progressChanged.emit(end * 100 // size)
+
+        return True
@@ -19,16 +19,24 @@
 #
 
 import sys
+import time
 
-from PySide2.QtCore import QCommandLineParser, QCoreApplication
+# Phases of the startup are measured from here
+startTime = time.perf_counter()
+
+from PySide2.QtCore import QCommandLineOption, QCommandLineParser, QCoreApplication
 from PySide2.QtWidgets import QApplication
 
 from main_window import MainWindow
+from startup_profiler import StartupProfiler
+
+importTime = time.perf_counter()
 
 
 if __name__ == "__main__":
 
     app = QApplication(sys.argv)
+    applicationTime = time.perf_counter()
     app.setOrganizationName('NotNypical')
     app.setOrganizationDomain('https://notnypical.github.io')
     app.setApplicationName('Tabulator-QtPy')
@@ -40,12 +48,29 @@ if __name__ == "__main__":
     parser.addHelpOption()
     parser.addVersionOption()
     parser.addPositionalArgument('files', 'Documents to open.', '[files...]')
+    parser.addOption(QCommandLineOption('profile-startup', QCoreApplication.translate('main', 'Print the time of each phase of the startup.')))
+    parser.addOption(QCommandLineOption('profile-trace', QCoreApplication.translate('main', 'Write the time of each phase of the startup as Chrome trace events to <file>.'), 'file'))
     parser.process(app)
 
+    profiler = StartupProfiler(startTime, app)
+    profiler.addSpan('imports', startTime, importTime)
+    profiler.addSpan('QApplication', importTime, applicationTime)
+
+    isProfiling = parser.isSet('profile-startup') or parser.isSet('profile-trace')
+    if isProfiling:
+        profiler.instrument(MainWindow, ['__init__', 'loadSettings', 'createActions', 'createMenus', 'createToolBars', 'createStatusBar', 'openDocument', 'openDocuments'])
+
     window = MainWindow()
-    fileNames = parser.positionalArguments()
-    for fileName in fileNames:
-        window.openDocument(fileName)
-    window.show()
+
+    # The window is shown before the documents are loaded; each one appears once it has been loaded
+    with profiler.phase('show'):
+        window.show()
+
+    # Only starting the loads is measured; they finish after the first paint
+    with profiler.phase('queue files'):
+        window.openDocuments(parser.positionalArguments())
+
+    if isProfiling:
+        profiler.reportAfterFirstPaint(app, parser.value('profile-trace'))
 
     sys.exit(app.exec_())
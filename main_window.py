@@ -18,16 +18,18 @@
 # along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
 #
 
-from PySide2.QtCore import QByteArray, QFileInfo, QSettings, QStandardPaths, Qt
+from collections import OrderedDict
+
+from PySide2.QtCore import QByteArray, QDir, QFileInfo, QSettings, QStandardPaths, Qt, QThread, QTimer
 from PySide2.QtGui import QIcon, QKeySequence
-from PySide2.QtWidgets import QAction, QApplication, QFileDialog, QMainWindow, QMdiArea, QMenu
+from PySide2.QtWidgets import QAction, QApplication, QFileDialog, QLabel, QMainWindow, QMdiArea, QMenu, QProgressBar, QUndoGroup
 
-from about_dialog import AboutDialog
-from colophon_dialog import ColophonDialog
 from document import Document
-from keyboard_shortcuts_dialog import KeyboardShortcutsDialog
+from document_index_cache import DocumentIndexCache
+from document_prefetcher import DocumentPrefetcher, isOnBattery
+from document_registry import DocumentRegistry
+from performance_metrics import PerformanceMetrics
 from preferences import Preferences
-from preferences_dialog import PreferencesDialog
 
 import icons
 
@@ -36,6 +38,9 @@ class MainWindow(QMainWindow):
 
     _preferences = Preferences()
 
+    # Milliseconds after the start until recently opened documents are read ahead
+    PrefetchDelay = 2000
+
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -48,9 +53,42 @@ class MainWindow(QMainWindow):
 
         self.loadSettings()
 
+        # Row indexes of large documents
+        self._indexCache = DocumentIndexCache(QDir(QStandardPaths.writableLocation(QStandardPaths.CacheLocation)).filePath('Indexes'))
+        self.updateIndexCache()
+
+        # Edits of the active document are undone
+        self._undoGroup = QUndoGroup(self)
+
+        # Timings and sizes of the documents
+        self._metrics = PerformanceMetrics()
+
+        # Open documents by their names
+        self._documentRegistry = DocumentRegistry()
+
+        # Documents in the order of their activation, least recent first; their cells are unloaded in this order
+        self._activatedDocuments = OrderedDict()
+
+        self._memoryTimer = QTimer(self)
+        self._memoryTimer.setInterval(5000)
+        self._memoryTimer.timeout.connect(self.unloadInactiveDocuments)
+        self._memoryTimer.start()
+
+        # Central widget; the actions are updated from its active document
+        self._documentArea = QMdiArea()
+        self._documentArea.setViewMode(QMdiArea.TabbedView)
+        self._documentArea.setTabsMovable(True)
+        self._documentArea.setTabsClosable(True)
+        self.setCentralWidget(self._documentArea)
+        self._documentArea.subWindowActivated.connect(self.onDocumentWindowActivated)
+
         self.createActions()
         self.createMenus()
         self.createToolBars()
+        self.createStatusBar()
+
+        # Dialogs and panels are imported and created when they are used first
+        self._findPanel = None
 
         # Application properties
         self.setApplicationState(self._applicationState)
@@ -60,13 +98,16 @@ class MainWindow(QMainWindow):
         self.updateActionFullScreen()
         self.updateMenuOpenRecent()
 
-        # Central widget
-        self._documentArea = QMdiArea()
-        self._documentArea.setViewMode(QMdiArea.TabbedView)
-        self._documentArea.setTabsMovable(True)
-        self._documentArea.setTabsClosable(True)
-        self.setCentralWidget(self._documentArea)
-        self._documentArea.subWindowActivated.connect(self.onDocumentWindowActivated)
+        # Documents opened together are loaded a few at a time and shown once their first rows have arrived
+        self._queuedDocuments = {}
+        self._openingDocuments = {}
+        self._openCount = 0
+        self._openedCount = 0
+
+        # Recently opened documents are read ahead once the application is idle
+        self._prefetcher = None
+        self._prefetches = {}
+        QTimer.singleShot(self.PrefetchDelay, self.prefetchRecentDocuments)
 
 
     def setApplicationState(self, state=QByteArray()):
@@ -104,7 +145,16 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
 
-        if True:
+        self.cancelOpen()
+
+        # Documents wait for their pending saves when they are closed
+        self._documentArea.closeAllSubWindows()
+
+        if not self._documentArea.subWindowList():
+            if self._findPanel:
+                self._findPanel.cancelSearch()
+            self.cancelPrefetch()
+
             # Recent documents
             if not self._preferences.restoreRecentDocuments():
                 self.recentDocuments.clear()
@@ -219,6 +269,21 @@ class MainWindow(QMainWindow):
         self.actionOpenRecentClear.setToolTip(self.tr('Clear document list'))
         self.actionOpenRecentClear.triggered.connect(self.onActionOpenRecentClearTriggered)
 
+        self.actionSave = QAction(self.tr('Save'), self)
+        self.actionSave.setObjectName('actionSave')
+        self.actionSave.setIcon(QIcon.fromTheme('document-save'))
+        self.actionSave.setIconText(self.tr('Save'))
+        self.actionSave.setShortcut(QKeySequence.Save)
+        self.actionSave.setToolTip(self.tr(f'Save document [{self.actionSave.shortcut().toString(QKeySequence.NativeText)}]'))
+        self.actionSave.triggered.connect(self.onActionSaveTriggered)
+
+        self.actionSaveAs = QAction(self.tr('Save As…'), self)
+        self.actionSaveAs.setObjectName('actionSaveAs')
+        self.actionSaveAs.setIcon(QIcon.fromTheme('document-save-as'))
+        self.actionSaveAs.setShortcut(QKeySequence.SaveAs)
+        self.actionSaveAs.setToolTip(self.tr(f'Save document under a new name [{self.actionSaveAs.shortcut().toString(QKeySequence.NativeText)}]'))
+        self.actionSaveAs.triggered.connect(self.onActionSaveAsTriggered)
+
         self.actionClose = QAction(self.tr('Close'), self)
         self.actionClose.setObjectName('actionClose')
         self.actionClose.setIcon(QIcon.fromTheme('document-close', QIcon(':/icons/actions/16/document-close.svg')))
@@ -237,6 +302,35 @@ class MainWindow(QMainWindow):
         self.actionCloseAll.setToolTip(f'Close all documents [{self.actionCloseAll.shortcut().toString(QKeySequence.NativeText)}]')
         self.actionCloseAll.triggered.connect(self.onActionCloseAllTriggered)
 
+        # Actions: Edit
+        self.actionUndo = self._undoGroup.createUndoAction(self)
+        self.actionUndo.setObjectName('actionUndo')
+        self.actionUndo.setIcon(QIcon.fromTheme('edit-undo'))
+        self.actionUndo.setIconText(self.tr('Undo'))
+        self.actionUndo.setShortcut(QKeySequence.Undo)
+        self.actionUndo.setToolTip(self.tr(f'Undo the last edit [{self.actionUndo.shortcut().toString(QKeySequence.NativeText)}]'))
+
+        self.actionRedo = self._undoGroup.createRedoAction(self)
+        self.actionRedo.setObjectName('actionRedo')
+        self.actionRedo.setIcon(QIcon.fromTheme('edit-redo'))
+        self.actionRedo.setIconText(self.tr('Redo'))
+        self.actionRedo.setShortcut(QKeySequence.Redo)
+        self.actionRedo.setToolTip(self.tr(f'Redo the last undone edit [{self.actionRedo.shortcut().toString(QKeySequence.NativeText)}]'))
+
+        self.actionFindInDocuments = QAction(self.tr('Find in Documents…'), self)
+        self.actionFindInDocuments.setObjectName('actionFindInDocuments')
+        self.actionFindInDocuments.setIcon(QIcon.fromTheme('edit-find'))
+        self.actionFindInDocuments.setIconText(self.tr('Find'))
+        self.actionFindInDocuments.setShortcut(QKeySequence(Qt.CTRL + Qt.SHIFT + Qt.Key_F))
+        self.actionFindInDocuments.setToolTip(self.tr(f'Find and replace text in all open documents [{self.actionFindInDocuments.shortcut().toString(QKeySequence.NativeText)}]'))
+        self.actionFindInDocuments.triggered.connect(self.onActionFindInDocumentsTriggered)
+
+        # Actions: Tools
+        self.actionSaveMetrics = QAction(self.tr('Save Performance Metrics…'), self)
+        self.actionSaveMetrics.setObjectName('actionSaveMetrics')
+        self.actionSaveMetrics.setToolTip(self.tr('Save the timings and sizes of the application and of all open documents as JSON'))
+        self.actionSaveMetrics.triggered.connect(self.onActionSaveMetricsTriggered)
+
         # Actions: View
         self.actionFullScreen = QAction(self)
         self.actionFullScreen.setObjectName('actionFullScreen')
@@ -288,6 +382,12 @@ class MainWindow(QMainWindow):
         self.actionToolbarHelp.setToolTip(self.tr('Display the Help toolbar'))
         self.actionToolbarHelp.toggled.connect(lambda checked: self.toolbarHelp.setVisible(checked))
 
+        self.actionStatusbarMetrics = QAction(self.tr('Show Performance Metrics'), self)
+        self.actionStatusbarMetrics.setObjectName('actionStatusbarMetrics')
+        self.actionStatusbarMetrics.setCheckable(True)
+        self.actionStatusbarMetrics.setToolTip(self.tr('Display the timings and sizes of the active document in the statusbar'))
+        self.actionStatusbarMetrics.toggled.connect(self.onActionStatusbarMetricsToggled)
+
         # Actions: Help
         self.actionKeyboardShortcuts = QAction(self.tr('Keyboard Shortcuts'), self)
         self.actionKeyboardShortcuts.setObjectName('actionKeyboardShortcuts')
@@ -322,6 +422,9 @@ class MainWindow(QMainWindow):
         menuDocument.addAction(self.actionOpen)
         menuDocument.addMenu(self.menuOpenRecent)
         menuDocument.addSeparator()
+        menuDocument.addAction(self.actionSave)
+        menuDocument.addAction(self.actionSaveAs)
+        menuDocument.addSeparator()
         menuDocument.addAction(self.actionClose)
         menuDocument.addAction(self.actionCloseOther)
         menuDocument.addAction(self.actionCloseAll)
@@ -329,10 +432,15 @@ class MainWindow(QMainWindow):
         # Menu: Edit
         menuEdit = self.menuBar().addMenu(self.tr('Edit'))
         menuEdit.setObjectName('menuEdit')
+        menuEdit.addAction(self.actionUndo)
+        menuEdit.addAction(self.actionRedo)
+        menuEdit.addSeparator()
+        menuEdit.addAction(self.actionFindInDocuments)
 
         # Menu: Tools
         menuTools = self.menuBar().addMenu(self.tr('Tools'))
         menuTools.setObjectName('menuTools')
+        menuTools.addAction(self.actionSaveMetrics)
 
         # Menu: View
         menuView = self.menuBar().addMenu(self.tr('View'))
@@ -340,6 +448,7 @@ class MainWindow(QMainWindow):
         menuView.addAction(self.actionFullScreen)
         menuView.addSeparator()
         menuView.addAction(self.actionTitlebarFullPath)
+        menuView.addAction(self.actionStatusbarMetrics)
         menuView.addSeparator()
         menuView.addAction(self.actionToolbarApplication)
         menuView.addAction(self.actionToolbarDocument)
@@ -370,12 +479,15 @@ class MainWindow(QMainWindow):
         self.toolbarDocument.setObjectName('toolbarDocument')
         self.toolbarDocument.addAction(self.actionNew)
         self.toolbarDocument.addAction(self.actionOpen)
+        self.toolbarDocument.addAction(self.actionSave)
         self.toolbarDocument.addSeparator()
         self.toolbarDocument.addAction(self.actionClose)
         self.toolbarDocument.visibilityChanged.connect(lambda visible: self.actionToolbarDocument.setChecked(visible))
 
         # Toolbar: Edit
         self.toolbarEdit = self.addToolBar(self.tr('Edit Toolbar'))
+        self.toolbarEdit.addAction(self.actionUndo)
+        self.toolbarEdit.addAction(self.actionRedo)
         self.toolbarEdit.setObjectName('toolbarEdit')
         self.toolbarEdit.visibilityChanged.connect(lambda visible: self.actionToolbarEdit.setChecked(visible))
 
@@ -397,16 +509,60 @@ class MainWindow(QMainWindow):
         self.toolbarHelp.visibilityChanged.connect(lambda visible: self.actionToolbarHelp.setChecked(visible))
 
 
+    def createStatusBar(self):
+
+        self._progressBar = QProgressBar()
+        self._progressBar.setRange(0, 100)
+        self._progressBar.setMaximumWidth(200)
+        self._progressBar.setVisible(False)
+        self.statusBar().addPermanentWidget(self._progressBar)
+
+        # Metrics are refreshed while they are shown
+        self._metricsLabel = QLabel()
+        self._metricsLabel.setVisible(False)
+        self.statusBar().addPermanentWidget(self._metricsLabel)
+
+        self._metricsTimer = QTimer(self)
+        self._metricsTimer.setInterval(1000)
+        self._metricsTimer.timeout.connect(self.updateMetricsLabel)
+
+
+    def findPanel(self):
+
+        if not self._findPanel:
+            from document_find_panel import DocumentFindPanel
+
+            self._findPanel = DocumentFindPanel(self)
+            self._findPanel.findAllRequested.connect(lambda: self._findPanel.findInDocuments(self.documents()))
+            self._findPanel.replaceAllRequested.connect(lambda: self._findPanel.findInDocuments(self.documents(), replace=True))
+            self._findPanel.cellActivated.connect(self.onFindPanelCellActivated)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self._findPanel)
+
+            # The panel takes the place it had when the application state was saved
+            self.restoreDockWidget(self._findPanel)
+
+        return self._findPanel
+
+
     def updateActions(self, windowCount=0):
 
         hasDocument = windowCount >= 1
         hasDocuments = windowCount >= 2
 
+        # Documents are saved one at a time and only when loaded completely
+        document = self.activeDocument()
+        isIdle = document is not None and not document.isLoading() and not document.isSaving()
+
         # Actions: Document
+        self.actionSave.setEnabled(hasDocument and isIdle)
+        self.actionSaveAs.setEnabled(hasDocument and isIdle)
         self.actionClose.setEnabled(hasDocument)
         self.actionCloseOther.setEnabled(hasDocuments)
         self.actionCloseAll.setEnabled(hasDocument)
 
+        # Actions: Edit
+        self.actionFindInDocuments.setEnabled(hasDocument)
+
 
     def updateActionFullScreen(self):
 
@@ -429,7 +585,7 @@ class MainWindow(QMainWindow):
 
             actionRecentDocument = QAction(self)
             actionRecentDocument.setObjectName(f'actionRecentDocument_{idx}')
-            actionRecentDocument.triggered.connect(lambda data=actionRecentDocument.data(): self.onActionOpenRecentDocumentTriggered(data))
+            actionRecentDocument.triggered.connect(lambda checked=False, action=actionRecentDocument: self.onActionOpenRecentDocumentTriggered(action.data()))
 
             self.actionRecentDocuments.append(actionRecentDocument)
 
@@ -476,21 +632,108 @@ class MainWindow(QMainWindow):
             self.menuOpenRecent.menuAction().setVisible(False)
 
 
+    def updateIndexCache(self):
+
+        self._indexCache.setMaximumSize(self._preferences.maximumIndexCacheSize() * 1024 * 1024)
+        self._indexCache.evict()
+
+
     def updateTitleBar(self):
 
         title = None
+        modified = False
 
         document = self.activeDocument()
         if document:
-            title = document.canonicalName() if self.actionTitlebarFullPath.isChecked() and document.canonicalName() else document.documentTitle()
+            title = (document.canonicalName() if self.actionTitlebarFullPath.isChecked() and document.canonicalName() else document.documentTitle()) + '[*]'
+            modified = document.isModified()
 
         self.setWindowTitle(title)
+        self.setWindowModified(modified)
+
+
+    def updateStatusBar(self):
+
+        if self._openCount:
+            # Combined progress of the documents opened together
+            progress = (self._openedCount * 100 + sum(document.progress() for document in self._openingDocuments)) // self._openCount
+            self._progressBar.setFormat(self.tr(f'{self._openedCount} of {self._openCount} documents'))
+            self._progressBar.setValue(progress)
+            self._progressBar.setVisible(True)
+            return
+
+        self._progressBar.setFormat('%p%')
+
+        document = self.activeDocument()
+        if document and (document.isLoading() or document.isSaving() or document.isSorting()):
+            self._progressBar.setValue(document.progress())
+            self._progressBar.setVisible(True)
+        else:
+            self._progressBar.setVisible(False)
+
+
+    def updateMetricsLabel(self):
+
+        document = self.activeDocument()
+        if not document:
+            self._metricsLabel.clear()
+            return
+
+        metrics = document.metrics()
+        metrics.record('memory', document.memorySize(), 'bytes')
+
+        texts = []
+        for name, label in [('loadThroughput', self.tr('Load')), ('parseTime', self.tr('Parse')), ('sortTime', self.tr('Sort')), ('filterTime', self.tr('Filter')),
+                            ('relabelTime', self.tr('Relabel')), ('memory', self.tr('Memory')), ('paintTime', self.tr('Paint'))]:
+            metric = metrics.metric(name)
+            if metric:
+                texts.append(f'{label} {metric.text()}')
+
+        self._metricsLabel.setText(' · '.join(texts))
+
+
+    def metrics(self):
+
+        return self._metrics
+
+
+    def recordApplicationMetrics(self, document, names):
+
+        # The application collects the last values of the documents
+        for name in names:
+            metric = document.metrics().metric(name)
+            if metric:
+                self._metrics.application().record(name, metric.last(), metric.unit())
+
+
+    def unloadInactiveDocuments(self):
+
+        budget = self._preferences.maximumDocumentMemory() * 1024 * 1024
+        if not budget:
+            return
+
+        sizes = {document: document.memorySize() for document in self._activatedDocuments}
+        total = sum(sizes.values())
+
+        # Least recently activated documents are unloaded first; the active document stays in memory
+        activeDocument = self.activeDocument()
+        for document in list(self._activatedDocuments):
+            if total <= budget:
+                break
+
+            if document is activeDocument or document.isUnloaded() or not sizes[document]:
+                continue
+
+            if document.unload():
+                total -= sizes[document] - document.memorySize()
 
 
     def onActionAboutTriggered(self):
 
         geometry = self._aboutDialogGeometry if self._preferences.restoreDialogGeometry() else QByteArray()
 
+        from about_dialog import AboutDialog
+
         dialog = AboutDialog(self)
         dialog.setDialogGeometry(geometry)
         dialog.exec_()
@@ -502,6 +745,8 @@ class MainWindow(QMainWindow):
 
         geometry = self._colophonDialogGeometry if self._preferences.restoreDialogGeometry() else QByteArray()
 
+        from colophon_dialog import ColophonDialog
+
         dialog = ColophonDialog(self)
         dialog.setDialogGeometry(geometry)
         dialog.exec_()
@@ -513,6 +758,8 @@ class MainWindow(QMainWindow):
 
         geometry = self._preferencesDialogGeometry if self._preferences.restoreDialogGeometry() else QByteArray()
 
+        from preferences_dialog import PreferencesDialog
+
         dialog = PreferencesDialog(self)
         dialog.setDialogGeometry(geometry)
         dialog.setPreferences(self._preferences)
@@ -523,6 +770,7 @@ class MainWindow(QMainWindow):
 
         self.updateRecentDocuments(None)
         self.updateMenuOpenRecent()
+        self.updateIndexCache()
 
 
     def onActionNewTriggered(self):
@@ -536,14 +784,12 @@ class MainWindow(QMainWindow):
                         QStandardPaths.writableLocation(QStandardPaths.HomeLocation),
                         self.tr('CSV Files (*.csv);;All Files (*.*)'))[0]
 
-        for fileName in fileNames:
-            self.openDocument(fileName)
+        self.openDocuments(fileNames)
 
 
     def onActionOpenRecentDocumentTriggered(self, canonicalName):
-        pass
 
-#        self.openDocument(canonicalName)
+        self.openDocument(canonicalName)
 
 
     def onActionOpenRecentClearTriggered(self):
@@ -554,6 +800,38 @@ class MainWindow(QMainWindow):
         self.updateMenuOpenRecent()
 
 
+    def onActionSaveTriggered(self):
+
+        document = self.activeDocument()
+        if not document:
+            return
+
+        if document.canonicalName():
+            document.save(document.canonicalName())
+        else:
+            self.onActionSaveAsTriggered()
+
+        self.updateActions(len(self._documentRegistry))
+        self.updateStatusBar()
+
+
+    def onActionSaveAsTriggered(self):
+
+        document = self.activeDocument()
+        if not document:
+            return
+
+        fileName = QFileDialog.getSaveFileName(self, self.tr('Save Document'),
+                        document.canonicalName() or QStandardPaths.writableLocation(QStandardPaths.HomeLocation),
+                        self.tr('CSV Files (*.csv);;All Files (*.*)'))[0]
+
+        if fileName:
+            document.save(fileName)
+
+        self.updateActions(len(self._documentRegistry))
+        self.updateStatusBar()
+
+
     def onActionCloseTriggered(self):
 
         self._documentArea.closeActiveSubWindow()
@@ -571,6 +849,28 @@ class MainWindow(QMainWindow):
         self._documentArea.closeAllSubWindows()
 
 
+    def onActionFindInDocumentsTriggered(self):
+
+        self.findPanel().setVisible(True)
+
+        # The text of the current cell of the active document is a likely text to find
+        document = self.activeDocument()
+        self._findPanel.setFindText(document.table().currentIndex().data() if document else None)
+
+
+    def removeFindResults(self, document):
+
+        if self._findPanel:
+            self._findPanel.removeDocument(document)
+
+
+    def onFindPanelCellActivated(self, document, row, column):
+
+        if document in self._documentRegistry:
+            self._documentArea.setActiveSubWindow(document.parentWidget())
+            document.table().showCell(row, column)
+
+
     def onActionFullScreenTriggered(self):
 
         if not self.isFullScreen():
@@ -581,6 +881,36 @@ class MainWindow(QMainWindow):
         self.updateActionFullScreen()
 
 
+    def onActionSaveMetricsTriggered(self):
+
+        fileName = QFileDialog.getSaveFileName(self, self.tr('Save Performance Metrics'),
+                        QDir(QStandardPaths.writableLocation(QStandardPaths.HomeLocation)).filePath('metrics.json'),
+                        self.tr('JSON Files (*.json);;All Files (*.*)'))[0]
+        if not fileName:
+            return
+
+        # Memory is measured when it is saved
+        for document in self.documents():
+            document.metrics().record('memory', document.memorySize(), 'bytes')
+
+        try:
+            self._metrics.dump(fileName)
+            self.statusBar().showMessage(self.tr(f'Performance metrics saved to {fileName}'), 3000)
+        except OSError as error:
+            self.statusBar().showMessage(self.tr(f'Saving of the performance metrics failed: {error}'))
+
+
+    def onActionStatusbarMetricsToggled(self, checked):
+
+        self._metricsLabel.setVisible(checked)
+
+        if checked:
+            self.updateMetricsLabel()
+            self._metricsTimer.start()
+        else:
+            self._metricsTimer.stop()
+
+
     def onActionTitlebarFullPathTriggered(self):
 
         self.updateTitleBar()
@@ -589,6 +919,8 @@ class MainWindow(QMainWindow):
     def onActionKeyboardShortcutsTriggered(self):
 
         if not self.keyboardShortcutsDialog:
+            from keyboard_shortcuts_dialog import KeyboardShortcutsDialog
+
             geometry = self._keyboardShortcutsDialogGeometry if self._preferences.restoreDialogGeometry() else QByteArray()
 
             self.keyboardShortcutsDialog = KeyboardShortcutsDialog(self)
@@ -607,52 +939,179 @@ class MainWindow(QMainWindow):
 
     def onDocumentWindowActivated(self, window):
 
-        self.updateActions(len(self._documentArea.subWindowList()))
+        self.updateActions(len(self._documentRegistry))
         self.updateTitleBar()
+        self.updateStatusBar()
 
-        if not window:
-            return
+        self._undoGroup.setActiveStack(window.widget().undoStack() if window else None)
+
+        if window:
+            document = window.widget()
+            document.restore()
+
+            if document in self._activatedDocuments:
+                self._activatedDocuments.move_to_end(document)
+
+            self.unloadInactiveDocuments()
+
+        if self._metricsLabel.isVisible():
+            self.updateMetricsLabel()
 
 
     def onDocumentAboutToClose(self, canonicalName):
 
-        # Update menu items; delete the emitter from the list
-        self.updateActions(len(self._documentArea.subWindowList())-1)
+        # Update menu items; the emitter has been removed from the registry
+        self.updateActions(len(self._documentRegistry))
+
+
+    def onDocumentProgressChanged(self, document):
+
+        if document == self.activeDocument():
+            self.updateActions(len(self._documentRegistry))
+            self.updateStatusBar()
+        elif document in self._openingDocuments:
+            self.updateStatusBar()
+
+
+    def onDocumentLoaded(self, document):
+
+        self.recordApplicationMetrics(document, ['loadTime', 'loadThroughput'])
+
+        canonicalName = self._openingDocuments.pop(document, None)
+        if canonicalName is None:
+            return
+
+        self._openedCount += 1
+        if document not in self._documentRegistry:
+            self.addDocumentWindow(document)
+
+        self.loadQueuedDocuments()
+
+
+    def onDocumentFirstRowsLoaded(self, document):
+
+        # The first screen of a queued document is shown while the rest is being loaded
+        if document in self._openingDocuments and document not in self._documentRegistry:
+            self.addDocumentWindow(document)
+
+
+    def onOpeningDocumentClosed(self, document):
+
+        if self._openingDocuments.pop(document, None) is None:
+            return
+
+        # The document has failed to load or has been closed while loading; the next one is loaded once it has been closed
+        self._openedCount += 1
+        QTimer.singleShot(0, self.loadQueuedDocuments)
+
+
+    def onDocumentModificationChanged(self, document):
+
+        if document == self.activeDocument():
+            self.updateTitleBar()
+
+
+    def onDocumentSaved(self, document, canonicalName):
+
+        self.recordApplicationMetrics(document, ['saveTime'])
+
+        if canonicalName != document.canonicalName():
+            # Document has been saved under a new name
+            self._documentRegistry.removeDocument(document)
+            document.setCanonicalName(canonicalName)
+            document.setCanonicalIndex(self._documentRegistry.nextCanonicalIndex(canonicalName))
+            document.updateDocumentTitle()
+            self._documentRegistry.addDocument(document)
+
+            self.updateTitleBar()
+
+        self.statusBar().showMessage(self.tr(f'Document {document.documentTitle()} saved'), 3000)
+
+        # Update list of recent documents
+        self.updateRecentDocuments(canonicalName)
+        self.updateMenuOpenRecent()
+
+
+    def onDocumentSaveFailed(self, document, message):
+
+        self.statusBar().showMessage(self.tr(f'Saving of {document.documentTitle()} failed: {message}'))
+
+
+    def onDocumentFilterFailed(self, document, message):
+
+        self.statusBar().showMessage(self.tr(f'Filtering of {document.documentTitle()} failed: {message}'))
+
+
+    def onDocumentLoadFailed(self, document, message):
+
+        self.statusBar().showMessage(self.tr(f'Loading of {document.documentTitle()} failed: {message}'))
+
+        document.close()
 
 
     def createDocument(self):
 
         document = Document(self)
         document.setPreferences(self._preferences)
+        document.setIndexCache(self._indexCache)
+        document.setMetrics(self._metrics.scope(document))
+        self._undoGroup.addStack(document.undoStack())
+        self._activatedDocuments[document] = None
+        document.aboutToClose.connect(lambda: self._documentRegistry.removeDocument(document))
         document.aboutToClose.connect(self.onDocumentAboutToClose)
+        document.aboutToClose.connect(lambda: self._activatedDocuments.pop(document, None))
+        document.aboutToClose.connect(lambda: self.removeFindResults(document))
+        document.aboutToClose.connect(lambda: self._metrics.removeScope(document))
+        document.aboutToClose.connect(lambda: self.onOpeningDocumentClosed(document))
+        document.progressChanged.connect(lambda: self.onDocumentProgressChanged(document))
+        document.loaded.connect(lambda: self.onDocumentLoaded(document))
+        document.firstRowsLoaded.connect(lambda: self.onDocumentFirstRowsLoaded(document))
+        document.loadFailed.connect(lambda message: self.onDocumentLoadFailed(document, message))
+        document.modificationChanged.connect(lambda: self.onDocumentModificationChanged(document))
+        document.saved.connect(lambda canonicalName: self.onDocumentSaved(document, canonicalName))
+        document.saveFailed.connect(lambda message: self.onDocumentSaveFailed(document, message))
+        document.filterFailed.connect(lambda message: self.onDocumentFilterFailed(document, message))
+
+        # Documents are shown once they are added to a window
+        document.hide()
+
+        return document
+
+
+    def addDocumentWindow(self, document):
+
+        canonicalName = document.canonicalName()
+
+        document.setCanonicalIndex(self._documentRegistry.nextCanonicalIndex(canonicalName))
+        document.updateDocumentTitle()
+        self._documentRegistry.addDocument(document)
 
         window = self._documentArea.addSubWindow(document)
         window.setWindowIcon(QIcon())
         window.showMaximized()
+        document.show()
 
-        return document
+        # Update list of recent documents
+        self.updateRecentDocuments(canonicalName)
+        self.updateMenuOpenRecent()
 
+        # Update application
+        self.updateActions(len(self._documentRegistry))
+        self.updateTitleBar()
+        self.updateStatusBar()
 
-    def createDocumentIndex(self, canonicalName):
 
-        fileName = QFileInfo(canonicalName).fileName()
-        canonicalIndex = 0
+    def findDocumentWindow(self, canonicalName):
 
-        for window in self._documentArea.subWindowList():
-            if QFileInfo(window.widget().canonicalName()).fileName() == fileName:
-                if window.widget().canonicalIndex() > canonicalIndex:
-                    canonicalIndex = window.widget().canonicalIndex()
+        document = self._documentRegistry.findDocument(canonicalName)
 
-        return canonicalIndex+1
+        # Documents are the widgets of their subwindows
+        return document.parentWidget() if document else None
 
 
-    def findDocumentWindow(self, canonicalName):
+    def documents(self):
 
-        for window in self._documentArea.subWindowList():
-            if window.widget().canonicalName() == canonicalName:
-                return window
-
-        return None
+        return [window.widget() for window in self._documentArea.subWindowList()]
 
 
     def activeDocument(self):
@@ -666,6 +1125,12 @@ class MainWindow(QMainWindow):
 
         canonicalName = QFileInfo(fileName).canonicalFilePath()
 
+        # Given document is waiting to be loaded or being loaded; it appears once it has been loaded
+        if self.isOpeningDocument(canonicalName):
+            self.updateRecentDocuments(canonicalName)
+            self.updateMenuOpenRecent()
+            return True
+
         window = self.findDocumentWindow(canonicalName)
         if window:
             # Given document is already open; activate the window
@@ -679,29 +1144,151 @@ class MainWindow(QMainWindow):
         return self.loadDocument(canonicalName);
 
 
+    def prefetchRecentDocuments(self):
+
+        count = self._preferences.prefetchRecentDocuments()
+        if not count or self._prefetcher or isOnBattery():
+            return
+
+        # Documents being loaded mean the user has started working
+        if self._openingDocuments or any(document.isLoading() for document in self.documents()):
+            return
+
+        canonicalNames = [canonicalName for canonicalName in self.recentDocuments[:count] if not self._documentRegistry.findDocument(canonicalName)]
+        if not canonicalNames:
+            return
+
+        self._prefetches.clear()
+
+        self._prefetcher = DocumentPrefetcher(canonicalNames, self._indexCache, self._preferences.minimumMappedDocumentSize() * 1024 * 1024, self)
+        self._prefetcher.documentPrefetched.connect(self.onPrefetcherDocumentPrefetched)
+        self._prefetcher.finished.connect(self.onPrefetcherFinished)
+        self._prefetcher.start(QThread.IdlePriority)
+
+
+    def cancelPrefetch(self):
+
+        if self._prefetcher:
+            self._prefetcher.cancel()
+            self.releasePrefetcher()
+
+
+    def releasePrefetcher(self):
+
+        self._prefetcher.deleteLater()
+        self._prefetcher = None
+
+
+    def onPrefetcherDocumentPrefetched(self, canonicalName, prefetch):
+
+        # Results of cancelled prefetchers may arrive later
+        if self.sender() is not self._prefetcher:
+            return
+
+        self._prefetches[canonicalName] = prefetch
+
+
+    def onPrefetcherFinished(self):
+
+        # Cancelled prefetchers have been released already; their signal may arrive while the next prefetcher runs
+        if self.sender() is not self._prefetcher:
+            return
+
+        self.releasePrefetcher()
+
+
     def loadDocument(self, canonicalName):
 
+        # Opening a document stops reading ahead; what has been read ahead so far is kept
+        self.cancelPrefetch()
+
         document = self.createDocument()
+        document.setPrefetch(self._prefetches.pop(canonicalName, None))
 
         succeeded = document.load(canonicalName)
         if succeeded:
-            document.setCanonicalIndex(self.createDocumentIndex(canonicalName))
-            document.updateDocumentTitle()
-            document.show()
-
-            # Update list of recent documents
-            self.updateRecentDocuments(canonicalName)
-            self.updateMenuOpenRecent()
-
-            # Update application
-            self.updateActions(len(self._documentArea.subWindowList()))
-            self.updateTitleBar()
+            self.addDocumentWindow(document)
         else:
             document.close()
 
         return succeeded
 
 
+    def openDocuments(self, fileNames):
+
+        if len(fileNames) == 1:
+            self.openDocument(fileNames[0])
+            return
+
+        for fileName in fileNames:
+            canonicalName = QFileInfo(fileName).canonicalFilePath()
+
+            # Files which do not exist are skipped, as are documents already being opened
+            if not canonicalName or self.isOpeningDocument(canonicalName):
+                continue
+
+            if self.findDocumentWindow(canonicalName):
+                self.updateRecentDocuments(canonicalName)
+                continue
+
+            self._queuedDocuments[canonicalName] = None
+            self._openCount += 1
+
+        self.updateMenuOpenRecent()
+        self.loadQueuedDocuments()
+
+
+    def isOpeningDocument(self, canonicalName):
+
+        return canonicalName in self._queuedDocuments or canonicalName in self._openingDocuments.values()
+
+
+    def loadQueuedDocuments(self):
+
+        # Loads overlap with each other's reading of the disk even on a single core
+        maximumCount = max(QThread.idealThreadCount(), 2)
+
+        while self._queuedDocuments and len(self._openingDocuments) < maximumCount:
+            canonicalName = next(iter(self._queuedDocuments))
+            del self._queuedDocuments[canonicalName]
+
+            self.cancelPrefetch()
+
+            document = self.createDocument()
+            document.setPrefetch(self._prefetches.pop(canonicalName, None))
+
+            if not document.load(canonicalName):
+                self._openedCount += 1
+                document.close()
+            elif document.isLoading():
+                document.updateDocumentTitle()
+                self._openingDocuments[document] = canonicalName
+
+                # Rows read ahead or restored from the index cache are shown at once
+                if document.table().rowCount():
+                    self.addDocumentWindow(document)
+            else:
+                self._openedCount += 1
+                self.addDocumentWindow(document)
+
+        if not self._queuedDocuments and not self._openingDocuments:
+            self._openCount = 0
+            self._openedCount = 0
+
+        self.updateStatusBar()
+
+
+    def cancelOpen(self):
+
+        self._queuedDocuments.clear()
+
+        for document in list(self._openingDocuments):
+            document.close()
+
+        self._openCount = 0
+        self._openedCount = 0
+
+
     def updateRecentDocuments(self, canonicalName):
 
         if canonicalName:
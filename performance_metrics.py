@@ -0,0 +1,204 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+import json
+import time
+from contextlib import contextmanager
+
+
+class PerformanceMetric:
+    """
+    Statistics of the recorded values of a timing or a size.
+    """
+
+    def __init__(self, unit):
+
+        self._unit = unit
+        self._count = 0
+        self._last = 0
+        self._total = 0
+        self._minimum = None
+        self._maximum = None
+
+
+    def record(self, value):
+
+        self._count += 1
+        self._last = value
+        self._total += value
+        self._minimum = value if self._minimum is None else min(self._minimum, value)
+        self._maximum = value if self._maximum is None else max(self._maximum, value)
+
+
+    def unit(self):
+
+        return self._unit
+
+
+    def count(self):
+
+        return self._count
+
+
+    def last(self):
+
+        return self._last
+
+
+    def mean(self):
+
+        return self._total / self._count if self._count else 0
+
+
+    def text(self, value=None):
+        """
+        Returns the last or the given value with its unit, in a magnitude fit for reading.
+        """
+        value = self._last if value is None else value
+
+        if self._unit == 's':
+            return f'{value * 1000:.1f} ms' if value < 1 else f'{value:.2f} s'
+        elif self._unit == 'bytes':
+            return f'{value / (1024 * 1024):.1f} MiB'
+        else:
+            return f'{value:.1f} {self._unit}'
+
+
+    def toDict(self):
+
+        return {
+            'unit': self._unit,
+            'count': self._count,
+            'last': self._last,
+            'mean': self.mean(),
+            'minimum': self._minimum,
+            'maximum': self._maximum,
+        }
+
+
+class PerformanceMetricsScope:
+    """
+    The metrics of the application or of a document, by name.
+    """
+
+    def __init__(self, name=''):
+
+        self._name = name
+        self._metrics = {}
+
+
+    def setName(self, name):
+
+        self._name = name
+
+
+    def name(self):
+
+        return self._name
+
+
+    def record(self, name, value, unit='s'):
+
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = PerformanceMetric(unit)
+
+        metric.record(value)
+
+
+    @contextmanager
+    def measure(self, name):
+        """
+        Records the seconds the enclosed code takes.
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+
+    def metric(self, name):
+
+        return self._metrics.get(name)
+
+
+    def metrics(self):
+
+        return dict(self._metrics)
+
+
+    def toDict(self):
+
+        return {'name': self._name, 'metrics': {name: metric.toDict() for name, metric in self._metrics.items()}}
+
+
+class PerformanceMetrics:
+    """
+    Registry of the metrics of the application and of each open document.
+    """
+
+    def __init__(self):
+
+        self._application = PerformanceMetricsScope('Application')
+        self._scopes = {}
+
+
+    def application(self):
+
+        return self._application
+
+
+    def scope(self, key):
+        """
+        Returns the metrics of a document, created on first use.
+        """
+        scope = self._scopes.get(key)
+        if scope is None:
+            scope = self._scopes[key] = PerformanceMetricsScope()
+
+        return scope
+
+
+    def removeScope(self, key):
+
+        self._scopes.pop(key, None)
+
+
+    def scopes(self):
+
+        return list(self._scopes.values())
+
+
+    def toDict(self):
+
+        return {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'application': self._application.toDict(),
+            'documents': [scope.toDict() for scope in self._scopes.values()],
+        }
+
+
+    def dump(self, fileName):
+        """
+        Writes all metrics as JSON.
+        """
+        with open(fileName, 'w', encoding='utf-8') as file:
+            json.dump(self.toDict(), file, indent=2)
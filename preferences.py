@@ -42,6 +42,14 @@ class Preferences:
         # Documents: Recently Opened Documents
         self._maximumRecentDocuments = 10
         self._restoreRecentDocuments = True
+        self._prefetchRecentDocuments = 3
+
+        # Documents: Large Documents
+        self._minimumMappedDocumentSize = 256
+        self._maximumIndexCacheSize = 1024
+        self._parserProcessCount = 0
+        self._indexColumnsAfterLoading = True
+        self._maximumDocumentMemory = 0
 
         # Document Presets: Header Labels
         self._defaultHeaderLabelHorizontal = self.HeaderLabel.Letter
@@ -64,6 +72,14 @@ class Preferences:
         # Documents: Recently Opened Documents
         self.setMaximumRecentDocuments(int(settings.value('MaximumRecentDocuments', 10)))
         self.setRestoreRecentDocuments(self.valueToBool(settings.value('RestoreRecentDocuments', True)))
+        self.setPrefetchRecentDocuments(int(settings.value('PrefetchRecentDocuments', 3)))
+
+        # Documents: Large Documents
+        self.setMinimumMappedDocumentSize(int(settings.value('MinimumMappedDocumentSize', 256)))
+        self.setMaximumIndexCacheSize(int(settings.value('MaximumIndexCacheSize', 1024)))
+        self.setParserProcessCount(int(settings.value('ParserProcessCount', 0)))
+        self.setIndexColumnsAfterLoading(self.valueToBool(settings.value('IndexColumnsAfterLoading', True)))
+        self.setMaximumDocumentMemory(int(settings.value('MaximumDocumentMemory', 0)))
 
         # Document Presets: Header Labels
         self.setDefaultHeaderLabelHorizontal(Preferences.HeaderLabel(int(settings.value('DefaultHeaderLabelHorizontal', self.HeaderLabel.Letter.value))))
@@ -89,6 +105,14 @@ class Preferences:
         # Documents: Recently Opened Documents
         settings.setValue('MaximumRecentDocuments', self._maximumRecentDocuments)
         settings.setValue('RestoreRecentDocuments', self._restoreRecentDocuments)
+        settings.setValue('PrefetchRecentDocuments', self._prefetchRecentDocuments)
+
+        # Documents: Large Documents
+        settings.setValue('MinimumMappedDocumentSize', self._minimumMappedDocumentSize)
+        settings.setValue('MaximumIndexCacheSize', self._maximumIndexCacheSize)
+        settings.setValue('ParserProcessCount', self._parserProcessCount)
+        settings.setValue('IndexColumnsAfterLoading', self._indexColumnsAfterLoading)
+        settings.setValue('MaximumDocumentMemory', self._maximumDocumentMemory)
 
         # Document Presets: Header Labels
         settings.setValue('DefaultHeaderLabelHorizontal', self._defaultHeaderLabelHorizontal.value)
@@ -157,6 +181,66 @@ class Preferences:
         return self._restoreRecentDocuments if not isDefault else True
 
 
+    def setPrefetchRecentDocuments(self, value):
+
+        self._prefetchRecentDocuments = value if value >= 0 and value <= 25 else 3
+
+
+    def prefetchRecentDocuments(self, isDefault=False):
+
+        return self._prefetchRecentDocuments if not isDefault else 3
+
+
+    def setMinimumMappedDocumentSize(self, value):
+
+        self._minimumMappedDocumentSize = value if value >= 1 and value <= 1048576 else 256
+
+
+    def minimumMappedDocumentSize(self, isDefault=False):
+
+        return self._minimumMappedDocumentSize if not isDefault else 256
+
+
+    def setMaximumIndexCacheSize(self, value):
+
+        self._maximumIndexCacheSize = value if value >= 0 and value <= 1048576 else 1024
+
+
+    def maximumIndexCacheSize(self, isDefault=False):
+
+        return self._maximumIndexCacheSize if not isDefault else 1024
+
+
+    def setParserProcessCount(self, value):
+
+        self._parserProcessCount = value if value >= 0 and value <= 256 else 0
+
+
+    def parserProcessCount(self, isDefault=False):
+
+        return self._parserProcessCount if not isDefault else 0
+
+
+    def setIndexColumnsAfterLoading(self, value):
+
+        self._indexColumnsAfterLoading = value
+
+
+    def indexColumnsAfterLoading(self, isDefault=False):
+
+        return self._indexColumnsAfterLoading if not isDefault else True
+
+
+    def setMaximumDocumentMemory(self, value):
+
+        self._maximumDocumentMemory = value if value >= 0 and value <= 1048576 else 0
+
+
+    def maximumDocumentMemory(self, isDefault=False):
+
+        return self._maximumDocumentMemory if not isDefault else 0
+
+
     def setDefaultHeaderLabelHorizontal(self, value):
 
         self._defaultHeaderLabelHorizontal = value
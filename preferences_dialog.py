@@ -142,6 +142,14 @@ class PreferencesDialog(QDialog):
         # Documents: Recently Opened Documents
         self.documentsPage.setMaximumRecentDocuments(self._preferences.maximumRecentDocuments(isDefault))
         self.documentsPage.setRestoreRecentDocuments(self._preferences.restoreRecentDocuments(isDefault))
+        self.documentsPage.setPrefetchRecentDocuments(self._preferences.prefetchRecentDocuments(isDefault))
+
+        # Documents: Large Documents
+        self.documentsPage.setMinimumMappedDocumentSize(self._preferences.minimumMappedDocumentSize(isDefault))
+        self.documentsPage.setMaximumIndexCacheSize(self._preferences.maximumIndexCacheSize(isDefault))
+        self.documentsPage.setParserProcessCount(self._preferences.parserProcessCount(isDefault))
+        self.documentsPage.setIndexColumnsAfterLoading(self._preferences.indexColumnsAfterLoading(isDefault))
+        self.documentsPage.setMaximumDocumentMemory(self._preferences.maximumDocumentMemory(isDefault))
 
         # Document Presets: Header Labels
         self.documentPresetsPage.setDefaultHeaderLabelHorizontal(self._preferences.defaultHeaderLabelHorizontal(isDefault))
@@ -162,6 +170,14 @@ class PreferencesDialog(QDialog):
         # Documents: Recently Opened Documents
         self._preferences.setMaximumRecentDocuments(self.documentsPage.maximumRecentDocuments())
         self._preferences.setRestoreRecentDocuments(self.documentsPage.restoreRecentDocuments())
+        self._preferences.setPrefetchRecentDocuments(self.documentsPage.prefetchRecentDocuments())
+
+        # Documents: Large Documents
+        self._preferences.setMinimumMappedDocumentSize(self.documentsPage.minimumMappedDocumentSize())
+        self._preferences.setMaximumIndexCacheSize(self.documentsPage.maximumIndexCacheSize())
+        self._preferences.setParserProcessCount(self.documentsPage.parserProcessCount())
+        self._preferences.setIndexColumnsAfterLoading(self.documentsPage.indexColumnsAfterLoading())
+        self._preferences.setMaximumDocumentMemory(self.documentsPage.maximumDocumentMemory())
 
         # Document Presets: Header Labels
         self._preferences.setDefaultHeaderLabelHorizontal(self.documentPresetsPage.defaultHeaderLabelHorizontal())
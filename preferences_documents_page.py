@@ -43,8 +43,15 @@ class PreferencesDocumentsPage(QWidget):
         self.chkRestoreRecentDocuments = QCheckBox(self.tr('Save and restore documents'))
         self.chkRestoreRecentDocuments.stateChanged.connect(self.onPreferencesChanged)
 
+        self.spbPrefetchRecentDocuments = QSpinBox()
+        self.spbPrefetchRecentDocuments.setRange(0, 25)
+        self.spbPrefetchRecentDocuments.setSpecialValueText(self.tr('Disabled'))
+        self.spbPrefetchRecentDocuments.setToolTip(self.tr('Number of recently opened documents which are read ahead in the background after the start, unless on battery power'))
+        self.spbPrefetchRecentDocuments.valueChanged.connect(self.onPreferencesChanged)
+
         recentDocumentsFormLayout = QFormLayout()
         recentDocumentsFormLayout.addRow(self.tr('Number of documents'), self.spbMaximumRecentDocuments)
+        recentDocumentsFormLayout.addRow(self.tr('Documents read ahead'), self.spbPrefetchRecentDocuments)
 
         recentDocumentsLayout = QVBoxLayout()
         recentDocumentsLayout.addLayout(recentDocumentsFormLayout)
@@ -53,10 +60,52 @@ class PreferencesDocumentsPage(QWidget):
         recentDocumentsGroup = QGroupBox(self.tr('Recently Opened Documents'))
         recentDocumentsGroup.setLayout(recentDocumentsLayout)
 
+        # Large Documents
+        self.spbMinimumMappedDocumentSize = QSpinBox()
+        self.spbMinimumMappedDocumentSize.setRange(1, 1048576)
+        self.spbMinimumMappedDocumentSize.setSuffix(self.tr(' MiB'))
+        self.spbMinimumMappedDocumentSize.setToolTip(self.tr('Minimum size of documents whose rows are read when they are displayed instead of at once'))
+        self.spbMinimumMappedDocumentSize.valueChanged.connect(self.onPreferencesChanged)
+
+        self.spbMaximumIndexCacheSize = QSpinBox()
+        self.spbMaximumIndexCacheSize.setRange(0, 1048576)
+        self.spbMaximumIndexCacheSize.setSuffix(self.tr(' MiB'))
+        self.spbMaximumIndexCacheSize.setSpecialValueText(self.tr('Disabled'))
+        self.spbMaximumIndexCacheSize.setToolTip(self.tr('Maximum size of the cache of row indexes; least recently used indexes are removed first'))
+        self.spbMaximumIndexCacheSize.valueChanged.connect(self.onPreferencesChanged)
+
+        self.spbParserProcessCount = QSpinBox()
+        self.spbParserProcessCount.setRange(0, 256)
+        self.spbParserProcessCount.setSpecialValueText(self.tr('One per processor core'))
+        self.spbParserProcessCount.setToolTip(self.tr('Number of processes parsing a large document in parallel; 1 parses it in a single thread'))
+        self.spbParserProcessCount.valueChanged.connect(self.onPreferencesChanged)
+
+        self.chkIndexColumnsAfterLoading = QCheckBox(self.tr('Index columns after loading'))
+        self.chkIndexColumnsAfterLoading.setToolTip(self.tr('Index the columns of loaded documents in the background to filter their rows at once'))
+        self.chkIndexColumnsAfterLoading.stateChanged.connect(self.onPreferencesChanged)
+
+        self.spbMaximumDocumentMemory = QSpinBox()
+        self.spbMaximumDocumentMemory.setRange(0, 1048576)
+        self.spbMaximumDocumentMemory.setSuffix(self.tr(' MiB'))
+        self.spbMaximumDocumentMemory.setSpecialValueText(self.tr('Unlimited'))
+        self.spbMaximumDocumentMemory.setToolTip(self.tr('Maximum memory of all open documents; the cells of least recently activated documents are moved to disk first'))
+        self.spbMaximumDocumentMemory.valueChanged.connect(self.onPreferencesChanged)
+
+        largeDocumentsLayout = QFormLayout()
+        largeDocumentsLayout.addRow(self.tr('Read rows on demand from'), self.spbMinimumMappedDocumentSize)
+        largeDocumentsLayout.addRow(self.tr('Size of the index cache'), self.spbMaximumIndexCacheSize)
+        largeDocumentsLayout.addRow(self.tr('Number of parser processes'), self.spbParserProcessCount)
+        largeDocumentsLayout.addRow(self.tr('Memory of open documents'), self.spbMaximumDocumentMemory)
+        largeDocumentsLayout.addRow(self.chkIndexColumnsAfterLoading)
+
+        largeDocumentsGroup = QGroupBox(self.tr('Large Documents'))
+        largeDocumentsGroup.setLayout(largeDocumentsLayout)
+
         # Main layout
         self.layout = QVBoxLayout(self)
         self.layout.addWidget(title)
         self.layout.addWidget(recentDocumentsGroup)
+        self.layout.addWidget(largeDocumentsGroup)
         self.layout.addStretch()
 
 
@@ -78,6 +127,7 @@ class PreferencesDocumentsPage(QWidget):
     def onMaximumRecentDocumentsChanged(self, val):
 
         self.chkRestoreRecentDocuments.setEnabled(val>0)
+        self.spbPrefetchRecentDocuments.setEnabled(val>0)
 
 
     def setMaximumRecentDocuments(self, val):
@@ -98,3 +148,63 @@ class PreferencesDocumentsPage(QWidget):
     def restoreRecentDocuments(self):
 
         return self.chkRestoreRecentDocuments.isChecked()
+
+
+    def setPrefetchRecentDocuments(self, val):
+
+        self.spbPrefetchRecentDocuments.setValue(val)
+
+
+    def prefetchRecentDocuments(self):
+
+        return self.spbPrefetchRecentDocuments.value()
+
+
+    def setMinimumMappedDocumentSize(self, val):
+
+        self.spbMinimumMappedDocumentSize.setValue(val)
+
+
+    def minimumMappedDocumentSize(self):
+
+        return self.spbMinimumMappedDocumentSize.value()
+
+
+    def setMaximumIndexCacheSize(self, val):
+
+        self.spbMaximumIndexCacheSize.setValue(val)
+
+
+    def maximumIndexCacheSize(self):
+
+        return self.spbMaximumIndexCacheSize.value()
+
+
+    def setParserProcessCount(self, val):
+
+        self.spbParserProcessCount.setValue(val)
+
+
+    def parserProcessCount(self):
+
+        return self.spbParserProcessCount.value()
+
+
+    def setIndexColumnsAfterLoading(self, checked):
+
+        self.chkIndexColumnsAfterLoading.setChecked(checked)
+
+
+    def indexColumnsAfterLoading(self):
+
+        return self.chkIndexColumnsAfterLoading.isChecked()
+
+
+    def setMaximumDocumentMemory(self, val):
+
+        self.spbMaximumDocumentMemory.setValue(val)
+
+
+    def maximumDocumentMemory(self):
+
+        return self.spbMaximumDocumentMemory.value()
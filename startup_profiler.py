@@ -0,0 +1,156 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from PySide2.QtCore import QEvent, QObject, QTimer
+
+
+class StartupProfiler(QObject):
+    """
+    Records the phases of the startup as nested spans and reports them once the first window has been painted.
+    """
+
+    def __init__(self, startTime, parent=None):
+        super().__init__(parent)
+
+        self._startTime = startTime
+        self._depth = 0
+
+        # Name, start, end and depth of each phase
+        self._spans = []
+
+        self._application = None
+        self._traceFileName = None
+        self._paintStartTime = None
+
+
+    def addSpan(self, name, start, end, depth=0):
+
+        self._spans.append((name, start, end, depth))
+
+
+    @contextmanager
+    def phase(self, name):
+
+        start = time.perf_counter()
+        depth = self._depth
+        self._depth += 1
+
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.addSpan(name, start, time.perf_counter(), depth)
+
+
+    def instrument(self, cls, names):
+        """
+        Measures each call of the given methods of a class as a phase.
+        """
+        for name in names:
+            setattr(cls, name, self.measured(getattr(cls, name), f'{cls.__name__}.{name}'))
+
+
+    def measured(self, function, name):
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+
+    def reportAfterFirstPaint(self, app, traceFileName=None):
+        """
+        Waits for the first paint event of the application, then prints the phases or writes them as Chrome trace events.
+        """
+        self._application = app
+        self._traceFileName = traceFileName
+        self._paintStartTime = time.perf_counter()
+
+        app.installEventFilter(self)
+
+
+    def eventFilter(self, watched, event):
+
+        if event.type() == QEvent.Paint and self._application:
+            self._application.removeEventFilter(self)
+            self._application = None
+
+            # The paint event is handled before the timer fires
+            QTimer.singleShot(0, self.onFirstPaintFinished)
+
+        return False
+
+
+    def onFirstPaintFinished(self):
+
+        if self._paintStartTime is None:
+            return
+
+        self.addSpan('first paint', self._paintStartTime, time.perf_counter())
+        self._paintStartTime = None
+
+        if self._traceFileName:
+            self.writeTrace(self._traceFileName)
+        else:
+            self.printBreakdown()
+
+
+    def spans(self):
+        """
+        Returns the spans ordered by their start; enclosing spans come first.
+        """
+        return sorted(self._spans, key=lambda span: (span[1], span[3]))
+
+
+    def printBreakdown(self, file=sys.stderr):
+
+        print(f'{"start":>9} {"duration":>9}  phase', file=file)
+
+        for name, start, end, depth in self.spans():
+            print(f'{(start - self._startTime) * 1000:>7.1f}ms {(end - start) * 1000:>7.1f}ms  {"  " * depth}{name}', file=file)
+
+        end = max(span[2] for span in self._spans) if self._spans else self._startTime
+        print(f'{(end - self._startTime) * 1000:>7.1f}ms in total', file=file)
+
+
+    def writeTrace(self, fileName):
+        """
+        Writes the spans as complete events of the Chrome trace event format.
+        """
+        events = [{
+            'name': name,
+            'cat': 'startup',
+            'ph': 'X',
+            'ts': (start - self._startTime) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': 0,
+        } for name, start, end, depth in self.spans()]
+
+        with open(fileName, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, indent=1)
@@ -0,0 +1,68 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_columns import DocumentIntegerColumn, createColumn
+
+
+class CreateColumnTest(unittest.TestCase):
+
+    def testHeaderRow(self):
+
+        texts = ['id', *map(str, range(1200, 0, -1))]
+        column = createColumn(texts)
+
+        self.assertEqual(column.Type, 'int')
+        self.assertEqual(list(column.texts()), texts)
+        self.assertEqual(column.findRows('id'), [0])
+
+        # The header sorts before the numbers, which sort numerically
+        order = sorted(range(len(column)), key=column.sortKeys().__getitem__)
+        self.assertEqual([texts[row] for row in order[:3]], ['id', '1', '2'])
+
+
+    def testHeaderRowOfFloats(self):
+
+        texts = ['price', *['1.50', '2.25', '10.00'] * 400]
+        column = createColumn(texts)
+
+        self.assertEqual(column.Type, 'float')
+        self.assertEqual(column.values(0, 4), texts[:4])
+        self.assertEqual(column.valueCounts()['1.50'], 400)
+
+
+    def testTextColumn(self):
+
+        self.assertEqual(createColumn(['a', 'b', '1'] * 10).Type, 'text')
+
+
+    def testKeptTextsAreLimited(self):
+
+        with self.assertRaises(ValueError):
+            DocumentIntegerColumn(['a'] * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
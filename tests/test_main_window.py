@@ -0,0 +1,55 @@
+# This Python file uses the following encoding: utf-8
+#
+# Copyright 2020-2021 NotNypical, <https://notnypical.github.io>.
+#
+# This file is part of Tabulator-QtPy, <https://github.com/notnypical/tabulator-qtpy>.
+#
+# Tabulator-QtPy is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tabulator-QtPy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tabulator-QtPy.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide2.QtWidgets import QApplication
+
+from main_window import MainWindow
+
+
+class MainWindowTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.app = QApplication.instance() or QApplication(sys.argv[:1])
+        cls.app.setOrganizationName('NotNypical')
+        cls.app.setApplicationName('Tabulator-QtPy-Test')
+
+
+    def testConstruction(self):
+
+        window = MainWindow()
+
+        self.assertIsNone(window.activeDocument())
+        self.assertFalse(window.actionSave.isEnabled())
+
+        window.close()
+        window.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()